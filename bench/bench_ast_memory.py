@@ -0,0 +1,73 @@
+"""
+    @file: bench_ast_memory.py
+    @brief: Pamet AST - bajty na uzel (__slots__ vs. __dict__) a spickove RSS
+    @details: Spusteni: python3 -m bench.bench_ast_memory [pocet_trid ...]
+              Kazda velikost bezi v samostatnem procesu, aby RSS nebylo ovlivneno.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import resource
+import subprocess
+import sys
+import time
+
+from bench.generator import generate_program
+from src import ast_nodes
+from src.grammar import get_parser
+
+
+def node_count(node):
+    '''Pocet uzlu AST (iterativne)'''
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for name in node.__slots__:
+            value = getattr(node, name)
+            if isinstance(value, ast_nodes.Node):
+                stack.append(value)
+            elif isinstance(value, tuple):
+                stack.extend(v for v in value if isinstance(v, ast_nodes.Node))
+    return count
+
+def dict_node_size():
+    '''Velikost uzlu SendNode s per-instance __dict__ (puvodni podoba)'''
+    class DictSendNode:
+        def __init__(self, receiver, selector, arguments):
+            self.receiver = receiver
+            self.selector = selector
+            self.arguments = arguments
+    node = DictSendNode(None, "plus:", [])
+    return sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.arguments)
+
+def slot_node_size():
+    node = ast_nodes.SendNode(None, "plus:", [])
+    return sys.getsizeof(node) + sys.getsizeof(node.arguments)
+
+def run_size(classes):
+    '''Mereni jedne velikosti (spousti se v podprocesu)'''
+    source = generate_program(classes=classes, methods=10, statements=20)
+    parser = get_parser()
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    ast = parser.parse(source)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    count = node_count(ast)
+    print(f"{count:>9} uzlu  parse {elapsed:6.2f} s  "
+          f"spickove RSS {peak_rss / 1024:7.1f} MB (+{(peak_rss - base_rss) / 1024:.1f} MB)")
+
+def main():
+    if sys.argv[1:2] == ["--size"]:
+        run_size(int(sys.argv[2]))
+        return
+
+    print(f"SendNode s __dict__:  {dict_node_size()} B")
+    print(f"SendNode se __slots__: {slot_node_size()} B")
+    for classes in [int(a) for a in sys.argv[1:]] or [100, 1000]:
+        subprocess.run([sys.executable, "-m", "bench.bench_ast_memory", "--size", str(classes)], check=True)
+
+
+if __name__ == "__main__":
+    main()
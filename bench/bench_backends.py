@@ -0,0 +1,56 @@
+"""
+    @file: bench_backends.py
+    @brief: Propustnost backendu parseru (src/backends.py) na generovanych programech
+    @details: Spusteni: python3 -m bench.bench_backends [--repeat N] [--backends lark rd ...] [pocet_trid ...]
+              Pro kazdou velikost programu a backend se meri parse (lexer + parser
+              + stavba AST, minimum z N behu) a vypise se cas, propustnost v KiB/s
+              a zrychleni proti Larku. Pred merenim se overi, ze backendy daji
+              stejne AST.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import sys
+import time
+
+from bench.generator import generate_program
+from src.backends import BACKENDS, get_backend
+
+
+def best_of(fn, repeat):
+    '''Minimum z `repeat` behu (v s)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.bench_backends")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 100, 500])
+    opts = parser.parse_args(args)
+
+    backends = {name: get_backend(name) for name in opts.backends}
+    print(f"{'trid':>5} {'KiB':>8}  {'backend':8} {'parse ms':>10} {'KiB/s':>10} {'vs lark':>8}")
+    for classes in opts.sizes:
+        source = generate_program(classes=classes, methods=5, statements=10,
+                                  keyword_parts=3, nesting=3, comments=1)
+        size = len(source.encode("utf-8")) / 1024
+        trees = {name: b.parse(source) for name, b in backends.items()}
+        first = next(iter(trees.values()))
+        assert all(tree == first for tree in trees.values()), "backendy daji ruzne AST"
+
+        times = {name: best_of(lambda: b.parse(source), opts.repeat) for name, b in backends.items()}
+        for name, elapsed in times.items():
+            ratio = f"{times['lark'] / elapsed:7.2f}x" if "lark" in times else ""
+            print(f"{classes:5} {size:8.1f}  {name:8} {elapsed * 1000:10.2f} {size / elapsed:10.0f} {ratio:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru bench_backends.py (EOF)
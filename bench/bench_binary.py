@@ -0,0 +1,59 @@
+"""
+    @file: bench_binary.py
+    @brief: Binarni AST (--format=bin) vs. XML - velikost, cas zapisu a nacteni
+    @details: Spusteni: python3 -m bench.bench_binary [pocet_trid ...]
+              Pred merenim se overi round-trip: load(dump(ast)) == ast a XML
+              z nacteneho AST je shodne s XML z puvodniho AST.
+              Nacteni XML = xml.etree.ElementTree.fromstring (co dela interpret).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from bench.generator import generate_program
+from src.ast_binary import dump, load
+from src.grammar import get_parser
+from src.xml_writer import write_xml
+
+
+def best_of(fn, repeat=5):
+    '''Minimum z `repeat` behu (v ms)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def to_xml(ast, desc):
+    out = io.StringIO()
+    write_xml(ast, out, desc)
+    return out.getvalue()
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 500]
+    for classes in sizes:
+        source = generate_program(classes=classes, methods=5, statements=10, nesting=3)
+        ast = get_parser().parse(source)
+        xml_str = to_xml(ast, "desc")
+        data = dump(ast, "desc")
+
+        # Round-trip
+        loaded, desc = load(data)
+        assert loaded == ast and desc == "desc"
+        assert to_xml(loaded, desc) == xml_str
+
+        xml_bytes = xml_str.encode("utf-8")
+        print(f"{classes:5} trid: XML {len(xml_bytes) / 1024:8.1f} KiB, bin {len(data) / 1024:7.1f} KiB "
+              f"({len(xml_bytes) / len(data):4.1f}x mensi)")
+        print(f"        zapis:   XML {best_of(lambda: to_xml(ast, 'desc')):8.2f} ms, "
+              f"bin {best_of(lambda: dump(ast, 'desc')):8.2f} ms")
+        print(f"        nacteni: ET.fromstring {best_of(lambda: ET.fromstring(xml_bytes)):8.2f} ms, "
+              f"load {best_of(lambda: load(data)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+    @file: bench_cache.py
+    @brief: Porovnani prekladu bez cache, s prazdnou cache (miss) a s naplnenou cache (hit)
+    @details: Spusteni: python3 -m bench.bench_cache [pocet_souboru]
+              Meri se davkovy rezim (--jobs 1) i jednotlive spusteni parse.py.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.generator import generate_program
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(args, stdin=None):
+    '''Doba behu parse.py s argumenty `args` (v ms)'''
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "parse.py", *args], cwd=ROOT, stdin=stdin,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    work = tempfile.mkdtemp()
+    src_dir = os.path.join(work, "src")
+    os.makedirs(src_dir)
+    for i in range(count):
+        with open(os.path.join(src_dir, f"p{i}.sol"), "w") as f:
+            f.write(generate_program(classes=5, methods=5, statements=10, seed=i))
+
+    out_dir = os.path.join(work, "out")
+    cache_dir = os.path.join(work, "cache")
+    batch = ["--batch", src_dir, "--out", out_dir, "--jobs", "1"]
+    try:
+        plain = run(batch)
+        miss = run(batch + ["--cache-dir", cache_dir])
+        hit = run(batch + ["--cache-dir", cache_dir])
+        print(f"davka {count} souboru: bez cache {plain:8.1f} ms, "
+              f"miss {miss:8.1f} ms, hit {hit:8.1f} ms")
+
+        path = os.path.join(src_dir, "p0.sol")
+        with open(path) as f:
+            plain = run([], f)
+        with open(path) as f:
+            hit = run(["--cache-dir", cache_dir], f)
+        print(f"jeden soubor (novy proces): bez cache {plain:8.1f} ms, hit {hit:8.1f} ms")
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+    @file: bench_comments.py
+    @brief: Zachyceni komentaru lexerem vs. puvodni regex + parse na vstupech s mnoha komentari
+    @details: Spusteni: python3 -m bench.bench_comments [komentaru_na_metodu ...]
+              "regex + parse" = puvodni re.search pres cely zdrojovy kod a parser bez
+              callbacku, "lexer" = parser s callbackem pro COMMENT (jeden pruchod).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import re
+import sys
+import time
+
+from lark import Lark
+
+from bench.generator import generate_program
+from src.grammar import sol25_grammar, get_parser, collect_comments
+from src.parse_to_ast import Sol25Transformer
+
+
+def best_of(fn, repeat=5):
+    '''Minimum z `repeat` behu (v ms)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [0, 10, 50]
+    plain_parser = Lark(sol25_grammar, start="start", parser="lalr", transformer=Sol25Transformer())
+    parser = get_parser()
+
+    for comments in sizes:
+        source = generate_program(classes=20, methods=5, statements=10, comments=comments)
+        regex = best_of(lambda: re.search(r'"([^"]*)"', source, re.DOTALL))
+        old = best_of(lambda: (re.search(r'"([^"]*)"', source, re.DOTALL), plain_parser.parse(source)))
+        new = best_of(lambda: collect_comments(parser.parse, source))
+        print(f"{comments:4} komentaru/metodu ({len(source) / 1024:7.1f} KiB): "
+              f"regex + parse {old:8.2f} ms (z toho regex {regex:6.3f} ms), lexer {new:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+    @file: bench_daemon.py
+    @brief: Porovnani latence serveroveho rezimu (--serve) se studenym spustenim parse.py
+    @details: Spusteni: python3 -m bench.bench_daemon [pocet_opakovani]
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.client import request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAM = "class Main : Object { run [| x := 1. y := x plus: 2. ] }"
+
+
+def measure(fn, repeat):
+    '''Median z `repeat` opakovani (v ms)'''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000
+
+def run_process(args):
+    subprocess.run([sys.executable, *args], input=PROGRAM, cwd=ROOT,
+                   capture_output=True, text=True, check=True)
+
+def wait_for_socket(path, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError("Server did not start")
+        time.sleep(0.01)
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    path = os.path.join(tempfile.mkdtemp(), "sol25.sock")
+    server = subprocess.Popen([sys.executable, "parse.py", "--serve", path], cwd=ROOT,
+                              stderr=subprocess.DEVNULL)
+    try:
+        wait_for_socket(path)
+        cold = measure(lambda: run_process(["parse.py"]), repeat)
+        client = measure(lambda: run_process(["-m", "src.client", "--socket", path]), repeat)
+        in_process = measure(lambda: request(PROGRAM, path), repeat)
+
+        # Soubezni klienti
+        count = repeat * 10
+        with ThreadPoolExecutor(8) as pool:
+            start = time.perf_counter()
+            codes = list(pool.map(lambda _: request(PROGRAM, path)[0], range(count)))
+            elapsed = time.perf_counter() - start
+        assert not any(codes)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"python parse.py (studeny start): {cold:8.2f} ms")
+    print(f"python -m src.client:            {client:8.2f} ms")
+    print(f"request() v procesu:             {in_process:8.2f} ms")
+    print(f"8 soubeznych klientu:            {count / elapsed:8.0f} pozadavku/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+    @file: bench_deep_nesting.py
+    @brief: Zatezovy test hluboce vnorenych programu (parse, kontrola, XML bez rekurze)
+    @details: Spusteni: python3 -m bench.bench_deep_nesting [hloubka]
+              XML se zapisuje kompaktne - odsazeny vystup by mel velikost O(hloubka^2).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import sys
+import time
+
+from src.compiler import Sol25Compiler
+
+
+def nested_args(depth):
+    '''x := 1 plus: (1 plus: (1 plus: ...))'''
+    return "x := " + "1 plus: (" * depth + "1" + ")" * depth + "."
+
+def nested_receivers(depth):
+    '''x := ((1 plus: 1) plus: 1) plus: 1 ...'''
+    return "x := " + "(" * depth + "1" + " plus: 1)" * depth + "."
+
+def nested_blocks(depth):
+    '''x := [| y := [| y := ... ]. ].'''
+    return "x := " + "[| y := " * depth + "1" + ". ]" * depth + "."
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    compiler = Sol25Compiler()
+    for name, body in (
+        ("vnorene argumenty", nested_args(depth)),
+        ("vnoreni prijemci", nested_receivers(depth)),
+        ("vnorene bloky", nested_blocks(depth)),
+    ):
+        source = "class Main : Object { run [| " + body + " ] }"
+        start = time.perf_counter()
+        ast = compiler.parse(source)
+        parsed = time.perf_counter()
+        compiler.check(ast)
+        checked = time.perf_counter()
+        out = io.StringIO()
+        compiler.write_xml(ast, out, indent=None)
+        written = time.perf_counter()
+        print(f"{name:18} hloubka {depth}: parse {parsed - start:5.2f} s, "
+              f"kontrola {checked - parsed:5.2f} s, XML {written - checked:5.2f} s "
+              f"({len(out.getvalue()) / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+    @file: bench_flat_ast.py
+    @brief: Ploche AST v polich (src/flat_ast.py) vs. objektovy strom - pamet a rychlost
+    @details: Spusteni: python3 -m bench.bench_flat_ast [pocet_trid ...]
+              Pamet = kolik zustane alokovano po parsovani (tracemalloc), tedy
+              velikost drzeneho AST vcetne retezcu. Cas = parse, SemChecker
+              a zapis XML (minimum z 5 behu). Pred merenim se overi, ze obe
+              reprezentace daji stejne AST i XML.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import gc
+import io
+import sys
+import time
+import tracemalloc
+
+from bench.generator import generate_program
+from src.compiler import Sol25Compiler
+from src.flat_ast import get_flat_parser
+
+
+def best_of(fn, repeat=5):
+    '''Minimum z `repeat` behu (v ms)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def retained(parse, source):
+    '''Pamet drzena AST po parsovani (KiB)'''
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    ast = parse(source)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del ast
+    return size / 1024
+
+def to_xml(compiler, ast):
+    out = io.StringIO()
+    compiler.write_xml(ast, out)
+    return out.getvalue()
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 500]
+    compilers = {"objekty": Sol25Compiler(), "pole": Sol25Compiler(get_flat_parser())}
+    for classes in sizes:
+        source = generate_program(classes=classes, methods=5, statements=10, nesting=3, keyword_parts=3)
+        trees = {name: c.parse(source) for name, c in compilers.items()}
+        assert trees["objekty"] == trees["pole"]
+        assert to_xml(compilers["objekty"], trees["objekty"]) == to_xml(compilers["pole"], trees["pole"])
+
+        print(f"{classes:5} trid ({len(source) / 1024:.1f} KiB zdroje, "
+              f"{len(trees['pole'].flat)} uzlu, pole {trees['pole'].flat.nbytes() / 1024:.1f} KiB):")
+        for name, c in compilers.items():
+            ast = trees[name]
+            print(f"    {name:8} pamet {retained(c.parse, source):9.1f} KiB  "
+                  f"parse {best_of(lambda: c.parse(source)):8.2f} ms  "
+                  f"check {best_of(lambda: c.check(ast)):8.2f} ms  "
+                  f"xml {best_of(lambda: to_xml(c, ast)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
+
+# Konec souboru bench_flat_ast.py (EOF)
@@ -0,0 +1,159 @@
+"""
+    @file: bench_fold.py
+    @brief: Skladani konstant (--fold) - shoda chovani a pocet odstranenych uzlu
+    @details: Spusteni: python3 -m bench.bench_fold [--programs N] [--seed S] [pocet_trid ...]
+              1) Nahodne metody run s vyrazy nad literaly (aritmetika vcetne
+                 preteceni 64 bitu a deleni zapornym cislem / nulou, porovnani,
+                 asString, Integer from:, bloky s value, promenne) se vyhodnoti
+                 referencnim vyhodnocovacem pred a po skladani. Hodnoty vsech
+                 promennych musi byt stejne. Zpravy mimo tuto podmnozinu se
+                 vyhodnoti symbolicky (prijemce, selektor, argumenty), chyba
+                 za behu (deleni nulou) je take hodnota.
+              2) Pro programy z bench/generator.py vypise pocet slozenych zprav,
+                 odstranenych uzlu a zmenu velikosti XML.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import random
+import sys
+
+from bench.generator import generate_program
+from src.ast_nodes import BlockNode, LiteralNode, VarNode
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.optimizer import count_nodes, fold_constants
+
+# Operace vestavene tridy Integer v interpretu (divBy: celociselne s oriznutim k nule)
+def _div(a, b):
+    if b == 0:
+        return ("error", "division by zero")
+    q = abs(a) // abs(b)
+    return ("Integer", q if (a < 0) == (b < 0) else -q)
+
+INTEGER_METHODS = {
+    "plus:": lambda a, b: ("Integer", a + b),
+    "minus:": lambda a, b: ("Integer", a - b),
+    "multiplyBy:": lambda a, b: ("Integer", a * b),
+    "divBy:": _div,
+    "equalTo:": lambda a, b: ("True", True) if a == b else ("False", False),
+    "greaterThan:": lambda a, b: ("True", True) if a > b else ("False", False),
+}
+LITERALS = {"Nil": ("Nil", None), "True": ("True", True), "False": ("False", False)}
+
+
+def evaluate(node, env):
+    '''Hodnota vyrazu (referencni vyhodnoceni, rekurzivni - vstupy jsou male)'''
+    kind = node.kind
+    if kind is LiteralNode:
+        if node.type == "Integer":
+            return ("Integer", int(node.value))
+        if node.type in LITERALS:
+            return LITERALS[node.type]
+        return (node.type, node.value)
+    if kind is VarNode:
+        return env[node.var]
+    if kind is BlockNode:
+        return ("Block", id(node))
+    receiver = node.receiver
+    args = [evaluate(a, env) for a in node.arguments]
+    if node.selector == "value" and receiver.kind is BlockNode and not receiver.params:
+        return run_block(receiver, dict(env))
+    value = evaluate(receiver, env)
+    if value[0] == "Integer":
+        if node.selector == "asString":
+            return ("String", str(value[1]))
+        method = INTEGER_METHODS.get(node.selector)
+        if method and args and args[0][0] == "Integer":
+            return method(value[1], args[0][1])
+    if value == ("class", "Integer") and node.selector == "from:" and args[0][0] == "Integer":
+        return args[0]
+    return ("send", value, node.selector, tuple(args))
+
+def run_block(block, env):
+    '''Provedeni prikazu bloku, vraci hodnotu posledniho (nil pro prazdny blok)'''
+    result = ("Nil", None)
+    for statement in block.statements:
+        result = env[statement.var] = evaluate(statement.expr, env)
+    return result
+
+def run_main(ast):
+    env = {"self": ("self",)}
+    run_block(ast.classes[0].methods[0].block, env)
+    return env
+
+
+def random_expr(rnd, names, depth):
+    '''Nahodny vyraz SOL25 nad literaly a promennymi `names`'''
+    choice = rnd.randrange(10 if depth else 3)
+    if choice == 0:
+        return str(rnd.choice((0, 1, -1, 7, -13, 2 ** 62, -2 ** 63, 2 ** 63 - 1, rnd.randrange(-50, 50))))
+    if choice == 1:
+        return rnd.choice(names) if names else "nil"
+    if choice == 2:
+        return rnd.choice(("nil", "true", "false", "'s'"))
+    sub = lambda: random_expr(rnd, names, depth - 1)
+    if choice <= 5:
+        selector = rnd.choice(tuple(INTEGER_METHODS))
+        return f"({sub()} {selector} {sub()})"
+    if choice == 6:
+        return f"({sub()} asString)"
+    if choice == 7:
+        return f"(Integer from: {sub()})"
+    if choice == 8:
+        var = rnd.choice(("t", "u") + tuple(names))
+        return f"([| {var} := {sub()}. ] value)"
+    return f"([|] value)"
+
+def random_program(rnd, statements=8):
+    names = []
+    lines = []
+    for i in range(statements):
+        lines.append(f"    v{i} := {random_expr(rnd, names, 3)}.")
+        names.append(f"v{i}")
+    body = "\n".join(lines)
+    return f"class Main : Object {{\n  run [|\n{body}\n  ]\n}}\n"
+
+def verify(programs, seed):
+    '''Shoda hodnot promennych pred a po skladani, vraci (programu, slozenych zprav)'''
+    compiler = get_compiler()
+    rnd = random.Random(seed)
+    checked = folded = 0
+    for _ in range(programs):
+        source = random_program(rnd)
+        try:
+            ast, _ = compiler.analyze(source)
+        except Sol25Error: # napr. promenna bloku koliduje s parametrem
+            continue
+        optimized, report = fold_constants(ast)
+        assert run_main(ast) == run_main(optimized), source
+        checked += 1
+        folded += report.folded
+    return checked, folded
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.bench_fold")
+    parser.add_argument("--programs", type=int, default=500, metavar="N")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("sizes", nargs="*", type=int, default=[50, 500])
+    opts = parser.parse_args(args)
+
+    checked, folded = verify(opts.programs, opts.seed)
+    print(f"overeno {checked} programu, {folded} slozenych zprav, chovani shodne")
+
+    compiler = get_compiler()
+    print(f"{'trid':>5} {'uzlu':>9} {'slozeno':>8} {'odstraneno':>11} {'XML KiB':>14}")
+    for classes in opts.sizes:
+        ast, _ = compiler.analyze(generate_program(classes=classes, methods=5, statements=20, nesting=2))
+        optimized, report = fold_constants(ast)
+        before = len(compiler.to_xml(ast)) / 1024
+        after = len(compiler.to_xml(optimized)) / 1024
+        print(f"{classes:5} {count_nodes(ast):9} {report.folded:8} {report.removed:11}"
+              f" {before:7.0f} -> {after:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru bench_fold.py (EOF)
@@ -0,0 +1,47 @@
+"""
+    @file: bench_inline_transform.py
+    @brief: Porovnani parse() + Transformer.transform() s transformaci behem LALR parsovani
+    @details: Spusteni: python3 -m bench.bench_inline_transform [pocet_trid]
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import sys
+import time
+import tracemalloc
+
+from bench.generator import generate_program
+from src.grammar import create_parser
+from src.parse_to_ast import Sol25Transformer
+
+
+def measure(fn):
+    '''Vraci (cas v s, spickova pamet v MB); pamet se meri v samostatnem behu'''
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def main():
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = generate_program(classes=classes, methods=5, statements=20)
+    two_pass = create_parser()
+    inline = create_parser(transformer=Sol25Transformer())
+
+    # Ohrati cache a importy
+    Sol25Transformer().transform(two_pass.parse(source))
+    inline.parse(source)
+
+    t_two, m_two = measure(lambda: Sol25Transformer().transform(two_pass.parse(source)))
+    t_inline, m_inline = measure(lambda: inline.parse(source))
+    print(f"vstup: {len(source) / 1024:.0f} KiB")
+    print(f"parse + transform:   {t_two:6.2f} s  spicka {m_two:7.1f} MB")
+    print(f"transformer v LALR:  {t_inline:6.2f} s  spicka {m_inline:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+    @file: bench_lexer.py
+    @brief: Rucne psany lexer (src/lexer.py) vs. puvodni regexove terminaly s lookaheadem
+    @details: Spusteni: python3 -m bench.bench_lexer [--repeat N] [pocet_trid ...]
+              "regex" = Lark s kontextovym lexerem a puvodnimi terminaly ID
+              a BLOCK_PARAM_ID (negativni lookahead na klicova slova), "dfa" =
+              Sol25Lexer. Meri se samotny lexer (vsechny tokeny) a cely parse
+              se stavbou AST na vstupu s dlouhymi jmeny. Jmena nezacinaji klicovym
+              slovem, jinak by je puvodni lexer rozdelil a vysledky by se lisily.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import sys
+import time
+
+from lark import Lark
+from lark.lexer import LexerState
+
+from src.grammar import create_parser, sol25_grammar
+from src.lexer import Sol25Lexer
+from src.parse_to_ast import Sol25Transformer
+
+# Puvodni terminaly z grammar.py
+OLD_TERMINALS = {
+    "BLOCK_PARAM_ID: /:[a-z_][a-zA-Z0-9_]*/":
+        "BLOCK_PARAM_ID: /:(?!self|super|true|false|nil|class)[a-z_][a-zA-Z0-9_]*/",
+    "ID: /[a-z_][a-zA-Z0-9_]*/":
+        "ID: /(?!class|nil|true|false|self|super)[a-z_][a-zA-Z0-9_]*/",
+}
+
+NAMES = ("accumulatedTotal", "numberOfElements", "currentIndexValue", "temporaryResult",
+         "lastSeenElement", "receiverObject", "argumentCount", "partialSumValue")
+
+
+def identifier_program(classes):
+    '''Program s dlouhymi jmeny promennych a selektoru (hustota ID)'''
+    out = ["class Main : Object {\n  run [|\n    x := 1.\n  ]\n}\n"]
+    for c in range(classes):
+        out.append(f"class Counter{c} : Object {{\n")
+        for m in range(5):
+            out.append(f"  updateValue{m}: [:a |\n")
+            for s, name in enumerate(NAMES):
+                other = NAMES[(s + m) % len(NAMES)]
+                out.append(f"    {name} := a computeWith: {other} andWith: {name} using: receiverObject.\n")
+            out.append("    result := [:p :q | inner := p combineWith: q. ] value: a value: a.\n  ]\n")
+        out.append("}\n")
+    return "".join(out)
+
+def old_grammar():
+    grammar = sol25_grammar
+    for new, old in OLD_TERMINALS.items():
+        assert new in grammar, new
+        grammar = grammar.replace(new, old)
+    return grammar
+
+def best_of(fn, repeat):
+    '''Minimum z `repeat` behu (v s)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.bench_lexer")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 100])
+    opts = parser.parse_args(args)
+
+    old_parser = Lark(old_grammar(), start="start", parser="lalr", transformer=Sol25Transformer())
+    new_parser = create_parser(cache=False, transformer=Sol25Transformer())
+    # Zakladni lexer pod kontextovym (vsechny terminaly, bez stavu parseru)
+    old_lexer = old_parser.parser.lexer.root_lexer
+    new_lexer = Sol25Lexer(new_parser.lexer_conf)
+
+    print(f"{'trid':>5} {'KiB':>7} {'tokenu':>8}  {'lexer regex':>12} {'lexer dfa':>10} {'':>6}"
+          f"  {'parse regex':>12} {'parse dfa':>10} {'':>6}")
+    for classes in opts.sizes:
+        source = identifier_program(classes)
+        size = len(source) / 1024
+        old_tokens = [(t.type, t.value) for t in old_lexer.lex(LexerState(source), None)]
+        new_tokens = [(t.type, t.value) for t in new_lexer.lex(LexerState(source), None)]
+        assert old_tokens == new_tokens, "lexery daji ruzne tokeny"
+        assert old_parser.parse(source) == new_parser.parse(source), "parsery daji ruzne AST"
+
+        lex_old = best_of(lambda: sum(1 for _ in old_lexer.lex(LexerState(source), None)), opts.repeat)
+        lex_new = best_of(lambda: sum(1 for _ in new_lexer.lex(LexerState(source), None)), opts.repeat)
+        parse_old = best_of(lambda: old_parser.parse(source), opts.repeat)
+        parse_new = best_of(lambda: new_parser.parse(source), opts.repeat)
+        print(f"{classes:5} {size:7.1f} {len(new_tokens):8}  {lex_old * 1000:9.2f} ms {lex_new * 1000:7.2f} ms"
+              f" {lex_old / lex_new:5.2f}x  {parse_old * 1000:9.2f} ms {parse_new * 1000:7.2f} ms"
+              f" {parse_old / parse_new:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru bench_lexer.py (EOF)
@@ -0,0 +1,88 @@
+"""
+    @file: bench_parallel_check.py
+    @brief: Skalovani paralelni semanticke kontroly (SemChecker(jobs=N)) s poctem jader
+    @details: Spusteni: python3 -m bench.bench_parallel_check [--repeat N] [--jobs N ...] [pocet_trid ...]
+              Meri se cela kontrola (sber trid a tabulek metod v hlavnim procesu,
+              kontrola tel v procesech vcetne startu poolu) proti kontrole v jednom
+              procesu. Vychozi pocty procesu jsou mocniny dvou az po pocet jader.
+              Pred merenim se overi, ze pri chybach v nekolika tridach vraci
+              oba postupy stejne chyby ve stejnem poradi.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bench.generator import generate_program
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.sem_checker import SemChecker
+
+
+def default_jobs():
+    cores = os.cpu_count() or 1
+    jobs = [2]
+    while jobs[-1] * 2 <= cores:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cores and cores > 2:
+        jobs.append(cores)
+    return jobs
+
+def with_errors(source):
+    '''Zdrojovy kod s nedefinovanou promennou v kazde ctvrte tride'''
+    out = []
+    for i, line in enumerate(source.split("\n")):
+        out.append(line)
+        if line.startswith("class C") and int(line.split()[1][1:]) % 4 == 3:
+            out.append("  broken [| a := undefinedVariable. ]")
+    return "\n".join(out)
+
+def diagnostics(ast, jobs, collect):
+    try:
+        errors = SemChecker(ast, collect=collect, jobs=jobs).check()
+    except Sol25Error as e:
+        errors = [e]
+    return [(e.code, e.location(), str(e)) for e in errors]
+
+def best_of(fn, repeat):
+    '''Minimum z `repeat` behu (v s)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.bench_parallel_check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, nargs="+", default=default_jobs())
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 5000])
+    opts = parser.parse_args(args)
+
+    compiler = get_compiler()
+    bad = compiler.parse(with_errors(generate_program(classes=40, methods=3, statements=5)))
+    for collect in (False, True):
+        expected = diagnostics(bad, None, collect)
+        assert expected, "ocekavany chyby"
+        for jobs in opts.jobs:
+            assert diagnostics(bad, jobs, collect) == expected, f"jobs={jobs} collect={collect}"
+
+    print(f"jader: {os.cpu_count()}")
+    print(f"{'trid':>5} {'procesu':>8} {'cas':>10} {'zrychleni':>10}")
+    for classes in opts.sizes:
+        ast = compiler.parse(generate_program(classes=classes, methods=5, statements=20, nesting=2))
+        serial = best_of(lambda: SemChecker(ast).check(), opts.repeat)
+        print(f"{classes:5} {1:8} {serial * 1000:7.1f} ms {1:9.2f}x")
+        for jobs in opts.jobs:
+            elapsed = best_of(lambda: SemChecker(ast, jobs=jobs).check(), opts.repeat)
+            print(f"{classes:5} {jobs:8} {elapsed * 1000:7.1f} ms {serial / elapsed:9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru bench_parallel_check.py (EOF)
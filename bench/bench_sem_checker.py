@@ -0,0 +1,34 @@
+"""
+    @file: bench_sem_checker.py
+    @brief: Skalovani semanticke kontroly s poctem trid (hluboka hierarchie, zpravy tridam)
+    @details: Spusteni: python3 -m bench.bench_sem_checker [pocet_trid ...]
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import sys
+import time
+
+from bench.generator import generate_program
+from src.grammar import get_parser
+from src.sem_checker import SemChecker
+
+
+def run(classes, chain):
+    source = generate_program(classes=classes, methods=3, statements=2, chain=chain, class_sends=5)
+    ast = get_parser().parse(source)
+    start = time.perf_counter()
+    SemChecker(ast).check()
+    elapsed = time.perf_counter() - start
+    kind = "retez dedicnosti" if chain else "ploska hierarchie"
+    print(f"{classes:6} trid ({kind:17})  kontrola {elapsed * 1000:9.1f} ms")
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [250, 500, 900]
+    for classes in sizes:
+        run(classes, chain=True)
+    for classes in sizes:
+        run(classes * 5, chain=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+    @file: bench_startup.py
+    @brief: Mereni casu vytvoreni parseru (bez cache vs. s cache LALR tabulek)
+    @details: Spusteni: python3 -m bench.bench_startup [pocet_opakovani]
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+from src.grammar import create_parser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAM = "class Main : Object { run [| x := 1. ] }"
+
+
+def measure(fn, repeat):
+    '''Nejlepsi cas z `repeat` opakovani (v ms)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run_cold_process():
+    '''Jeden beh parse.py jako samostatny proces'''
+    subprocess.run([sys.executable, os.path.join(ROOT, "parse.py")], input=PROGRAM,
+                   capture_output=True, text=True, check=True)
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    create_parser() # naplneni cache
+
+    print(f"create_parser (bez cache): {measure(lambda: create_parser(cache=False), repeat):8.2f} ms")
+    print(f"create_parser (s cache):   {measure(lambda: create_parser(cache=True), repeat):8.2f} ms")
+    print(f"python parse.py (cely beh): {measure(run_cold_process, repeat):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+    @file: bench_symbols.py
+    @brief: Internovana jmena a selektory (src/symbols.py) vs. samostatne kopie retezcu
+    @details: Spusteni: python3 -m bench.bench_symbols [--repeat N] [pocet_trid ...]
+              "kopie" = Sol25Transformer bez tabulky symbolu (kazde jmeno je
+              novy retezec, selektory se skladaji spojovanim), "symboly" =
+              vychozi transformer. Meri se pamet AST (tracemalloc, jen alokace
+              behem parsovani), cas parsovani, semanticke kontroly a zapisu XML
+              na platnem programu s dlouhymi jmeny. Obe AST jsou shodna.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+
+from bench.bench_lexer import NAMES
+from src.grammar import create_parser
+from src.parse_to_ast import Sol25Transformer
+from src.sem_checker import SemChecker
+from src.symbols import symbol_scope
+from src.xml_writer import write_xml
+
+
+class CopySymbols:
+    '''Puvodni chovani: zadne internovani, casti selektoru se spojuji'''
+
+    def intern(self, name):
+        return str(name)
+
+    def keyword(self, name):
+        return name + ":"
+
+    def join(self, parts):
+        return "".join(parts)
+
+class CopyTransformer(Sol25Transformer):
+    _symbols = CopySymbols()
+
+
+def symbol_program(classes):
+    '''Semanticky platny program s dlouhymi jmeny promennych a selektoru'''
+    out = ["class Main : Object {\n  run [|\n    x := 1.\n  ]\n}\n"]
+    for c in range(classes):
+        out.append(f"class Counter{c} : Object {{\n")
+        for m in range(5):
+            out.append(f"  updateValue{m}: [:a |\n")
+            for name in NAMES:
+                out.append(f"    {name} := a.\n")
+            for s, name in enumerate(NAMES):
+                other = NAMES[(s + m) % len(NAMES)]
+                out.append(f"    {name} := a computeWith: {other} andWith: {name} using: self.\n")
+            out.append("    result := [:p :q | inner := p combineWith: q. ] value: a value: a.\n  ]\n")
+        out.append("}\n")
+    return "".join(out)
+
+def best_of(fn, repeat):
+    '''Minimum z `repeat` behu (v s)'''
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def ast_memory(parser, source):
+    '''Bajty alokovane behem parsovani, ktere drzi hotove AST'''
+    tracemalloc.start()
+    ast = parser.parse(source)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ast, size
+
+def measure(parser, source, repeat):
+    ast, size = ast_memory(parser, source)
+    parse = best_of(lambda: parser.parse(source), repeat)
+    check = best_of(lambda: SemChecker(ast).check(), repeat)
+    xml = best_of(lambda: write_xml(ast, io.StringIO()), repeat)
+    return ast, size, parse, check, xml
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.bench_symbols")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 100])
+    opts = parser.parse_args(args)
+
+    parsers = {
+        "kopie": create_parser(cache=False, transformer=CopyTransformer()),
+        "symboly": create_parser(cache=False, transformer=Sol25Transformer()),
+    }
+
+    print(f"{'trid':>5} {'':>8} {'AST MiB':>8} {'parse':>10} {'kontrola':>10} {'XML':>10}")
+    for classes in opts.sizes:
+        source = symbol_program(classes)
+        results = {name: measure(p, source, opts.repeat) for name, p in parsers.items()}
+        assert results["kopie"][0] == results["symboly"][0], "AST se lisi"
+        for name, (_, size, parse, check, xml) in results.items():
+            print(f"{classes:5} {name:>8} {size / 2**20:8.2f} {parse * 1000:7.1f} ms"
+                  f" {check * 1000:7.1f} ms {xml * 1000:7.1f} ms")
+    # Tabulka patri jednomu parsovani, vnejsi symbol_scope ji zpristupni
+    with symbol_scope() as table:
+        parsers["symboly"].parse(source)
+    print(f"symbolu v tabulce posledniho parsovani: {len(table)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru bench_symbols.py (EOF)
@@ -0,0 +1,72 @@
+"""
+    @file: bench_xml.py
+    @brief: Porovnani ElementTree (ast_to_xml + ET.indent + ET.tostring) s proudovym zapisem
+    @details: Spusteni: python3 -m bench.bench_xml [pocet_trid]
+              Pred merenim se overi, ze oba vystupy jsou shodne.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from bench.generator import generate_program
+from src.ast_to_xml import ast_to_xml
+from src.grammar import get_parser
+from src.xml_writer import XML_HEADER, write_xml
+
+
+def etree_xml(ast):
+    root = ast_to_xml(ast, "desc")
+    ET.indent(root, space="    ")
+    return XML_HEADER + ET.tostring(root, encoding='unicode')
+
+def stream_xml(ast, indent="    "):
+    out = io.StringIO()
+    write_xml(ast, out, "desc", indent)
+    return out.getvalue()
+
+def stream_to_file(ast, path):
+    with open(path, "w", encoding="utf-8") as f:
+        write_xml(ast, f, "desc")
+
+def etree_to_file(ast, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(etree_xml(ast))
+
+def measure(fn):
+    '''Vraci (cas v s, spickova pamet v MB)'''
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+def main():
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    ast = get_parser().parse(generate_program(classes=classes, methods=5, statements=20))
+    assert etree_xml(ast) == stream_xml(ast), "vystupy se lisi"
+    path = os.path.join(tempfile.mkdtemp(), "out.xml")
+
+    print(f"vystup: {len(stream_xml(ast)) / 2**20:.1f} MB")
+    for name, fn in (
+        ("ElementTree -> str", lambda: etree_xml(ast)),
+        ("proudovy zapis -> str", lambda: stream_xml(ast)),
+        ("proudovy zapis kompaktne", lambda: stream_xml(ast, None)),
+        ("ElementTree -> soubor", lambda: etree_to_file(ast, path)),
+        ("proudovy zapis -> soubor", lambda: stream_to_file(ast, path)),
+    ):
+        elapsed, peak = measure(fn)
+        print(f"{name:26} {elapsed:6.2f} s  spicka {peak:7.1f} MB")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
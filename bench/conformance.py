@@ -0,0 +1,168 @@
+"""
+    @file: conformance.py
+    @brief: Shoda backendu parseru (src/backends.py) - stejne XML a stejne chybove kody
+    @details: Spusteni: python3 -m bench.conformance [--mutations N] [--seed S] [--backends lark rd ...]
+              Kazdy vstup se prelozi vsemi backendy (cely preklad vcetne
+              semanticke kontroly) a porovna se vystupni XML, pripadne kod chyby.
+              Vstupy:
+                - programy z bench/generator.py (ruzne osy a seedy)
+                - rucne psane hranicni pripady (zvlastnosti lexeru a gramatiky)
+                - hluboke vnoreni (10^5 zavorek, 10^4 argumentu a bloku),
+                  ktere rekurzivni parser musi zvladnout stejne jako ostatni
+                - nahodne mutace predchozich (smazani, zdvojeni, zamena a vlozeni
+                  casti kodu), ktere miri hlavne na chyby 21 a 22
+              Pri neshode vypise vstup a vysledky a skonci kodem 1.
+              Zmensena verze bezi v pytest (tests/test_conformance.py).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import random
+import re
+import sys
+
+from bench.generator import generate_program
+from src.backends import BACKENDS
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.parsy_parser import RECURSION_LIMIT
+
+# Telo metody run tridy Main
+EDGE_CASES = (
+    "a := x foo: 1 bar: 2.",
+    "a := x foo bar.",                # zpravy se spoji do selektoru "foobar"
+    "a := x foo: 1 bar.",             # po argumentu musi ID pokracovat ":"
+    "a := x foo bar: 1 baz.",
+    "a := x foo:= 1.",                # parser ceka COLON => ":" + "=" => 21
+    "a := nilx.",                     # klicove slovo jen jako cele jmeno
+    "a := classify.",
+    "a := x selfish: trueValue nilCount: superb.",
+    "a := [:selfX :class | ].",
+    "a := x foo: y: 1.",
+    "a := [:xy :z | ].",              # z parametru zustava prvni znak
+    "a := [: x | ].",
+    "a := [:nilx | ].",
+    "a := [:= ].",
+    "a := 1 @.",
+    "a := 1 2 @.",
+    "a := 'a\\n'.",
+    "a := '\\n'.",
+    "a := -5 plus: +6.",
+    "a := (x foo) bar.",
+    "a := x foo: (y bar: 1) baz: [:q | b := q. ].",
+    "a:=1.",
+    "a := 1. b",
+    "a := 'abc",
+    'a := "abc',
+    '"c1" a := "c2" 1 "c3\nx". b := super foo: self bar: true baz: false.',
+    "a := ((((1)))).",
+    "a := x foo: 1 bar @",
+    "a := x foo: 1 bar:= 2.",
+)
+
+# Hluboke vnoreni (telo metody run), ne pro mutace - preklad trva sekundy.
+# Porovnava se kompaktni XML, odsazene by melo velikost O(hloubka^2).
+DEEP_CASES = (
+    "a := " + "(" * 100000 + "1" + ")" * 100000 + ".",
+    "a := " + "1 plus: (" * 10000 + "1" + ")" * 10000 + ".",
+    "a := " + "[| b := " * 10000 + "1" + ". ]" * 10000 + ".",
+)
+
+# Casti kodu pro mutace
+VOCABULARY = (
+    "class", "Main", "Object", ":", ":=", "[", "]", "|", ".", "(", ")", "{", "}",
+    "x", ":x", "nil", "nilx", ":nil", "self", "super", "true", "classy", "foo:", "bar",
+    "'s'", "'\\n'", '"c"', "@", "-1", "+", "'", '"', " ", "\n", "=",
+)
+
+_PIECE_RE = re.compile(r"""'[^']*'|"[^"]*"|:=|\w+|\s+|.""")
+
+
+def edge_programs(bodies=EDGE_CASES):
+    for body in bodies:
+        yield f"class Main : Object {{\n  run [|\n    {body}\n  ]\n}}\n"
+
+def generated_programs():
+    axes = (
+        {}, {"keyword_parts": 4}, {"nesting": 6}, {"comments": 2},
+        {"chain": True, "class_sends": 2},
+    )
+    for seed, extra in enumerate(axes):
+        yield generate_program(classes=3, methods=2, statements=4, seed=seed, **extra)
+
+def mutate(rnd, source, edits):
+    '''Nahodna uprava `edits` casti zdrojoveho kodu'''
+    pieces = _PIECE_RE.findall(source)
+    for _ in range(edits):
+        i = rnd.randrange(len(pieces))
+        op = rnd.randrange(4)
+        if op == 0:
+            del pieces[i]
+        elif op == 1:
+            pieces.insert(i, pieces[i])
+        elif op == 2:
+            pieces[i] = rnd.choice(VOCABULARY)
+        else:
+            pieces.insert(i, rnd.choice(VOCABULARY))
+        if not pieces:
+            break
+    return "".join(pieces)
+
+def outcome(compiler, source, indent="    "):
+    '''Vysledek prekladu porovnatelny mezi backendy: ("xml", text) nebo ("error", kod)'''
+    try:
+        return "xml", compiler.compile(source, indent).xml
+    except Sol25Error as e:
+        return "error", e.code
+
+def check(compilers, source, indent="    "):
+    '''Vraci None pri shode, jinak {backend: vysledek}'''
+    results = {name: outcome(c, source, indent) for name, c in compilers.items()}
+    first = next(iter(results.values()))
+    if all(r == first for r in results.values()):
+        return None
+    return results
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.conformance")
+    parser.add_argument("--mutations", type=int, default=2000, metavar="N")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    opts = parser.parse_args(args)
+
+    if "parsy" in opts.backends:
+        # Hluboke vnoreni v parsy potrebuje limit rekurze odpovidajici jeho vlaknu
+        sys.setrecursionlimit(RECURSION_LIMIT)
+    compilers = {name: get_compiler(name) for name in opts.backends}
+    base = list(generated_programs()) + list(edge_programs())
+    rnd = random.Random(opts.seed)
+    sources = base + [mutate(rnd, rnd.choice(base), rnd.randint(1, 3)) for _ in range(opts.mutations)]
+    deep = list(edge_programs(DEEP_CASES))
+    sources += deep
+
+    failures = 0
+    codes = {}
+    for source in sources:
+        indent = None if source in deep else "    "
+        results = check(compilers, source, indent)
+        if results is None:
+            kind, value = outcome(compilers[opts.backends[0]], source, indent)
+            key = "ok" if kind == "xml" else value
+            codes[key] = codes.get(key, 0) + 1
+            continue
+        failures += 1
+        shown_source = source if len(source) < 200 else f"{source[:200]}... ({len(source)} znaku)"
+        print(f"NESHODA pro vstup {shown_source!r}:", file=sys.stderr)
+        for name, (kind, value) in results.items():
+            shown = value if kind == "error" else f"XML {len(value)} znaku"
+            print(f"  {name:6} {kind} {shown}", file=sys.stderr)
+
+    summary = ", ".join(f"{k}: {v}" for k, v in sorted(codes.items(), key=str))
+    print(f"{len(sources)} vstupu, backendy {' '.join(opts.backends)}, neshod {failures} ({summary})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru conformance.py (EOF)
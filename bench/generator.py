@@ -0,0 +1,78 @@
+"""
+    @file: generator.py
+    @brief: Generator syntakticky i semanticky spravnych programu SOL25 pro benchmarky
+    @details: Velikost programu se skaluje po nezavislych osach (tridy, metody,
+              prikazy v bloku, delka klicovych zprav, hloubka vnoreni, objem
+              komentaru a retezcu). Pro stejne parametry a seed je vystup vzdy stejny.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import random
+
+
+FILLER_WORDS = ("alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta")
+
+
+def _text(rnd, words):
+    return " ".join(rnd.choice(FILLER_WORDS) for _ in range(words))
+
+def _nested_block(depth, names):
+    '''
+    Blok vnoreny `depth` urovni hluboko, ve vnitrnim bloku vyraz v zavorkach.
+    Parametr bloku je jednopismenny, parser z nazvu parametru bere jen prvni znak.
+    '''
+    inner = f"r := ((p plus: 1) plus: {names[-1]})."
+    for _ in range(depth - 1):
+        inner = f"b := [:p | {inner} ] value: p."
+    return f"[:p | {inner} ] value: {names[-1]}"
+
+def generate_program(classes=10, methods=5, statements=10, seed=0, chain=False, class_sends=0,
+                     keyword_parts=0, nesting=0, comments=0):
+    '''
+    Vygeneruje program se zadanym poctem trid, metod a prikazu v bloku.
+    chain=True => trida Ci dedi od C(i-1) (hluboka hierarchie),
+    class_sends => pocet zasilani zprav tride (napr. `C3 m0: 1`) v kazde metode,
+    keyword_parts => v kazde metode zprava s tolika casti selektoru (`a k0: 1 k1: 2 ...`),
+    nesting => v kazde metode vyraz s bloky vnorenymi do teto hloubky,
+    comments => v kazde metode tolik komentaru a dlouhych retezcu.
+    '''
+    rnd = random.Random(seed)
+    out = ['"Generated benchmark program"\n']
+    out.append("class Main : Object {\n  run [|\n")
+    out.append("    x := 1.\n  ]\n}\n")
+
+    for c in range(classes):
+        parent = f"C{c - 1}" if chain and c else "Object"
+        out.append(f"class C{c} : {parent} {{\n")
+        for m in range(methods):
+            out.append(f"  m{m}: [:a |\n")
+            names = ["a"]
+            for s in range(statements):
+                var = f"v{s}"
+                kind = rnd.randrange(4)
+                if kind == 0:
+                    expr = f"{rnd.randrange(1000)}"
+                elif kind == 1:
+                    expr = f"{rnd.choice(names)} plus: {rnd.randrange(100)}"
+                elif kind == 2:
+                    expr = f"'str{s}' concatenateWith: 'x'"
+                else:
+                    expr = f"[:p | q := p. ] value: {rnd.choice(names)}"
+                out.append(f"    {var} := {expr}.\n")
+                names.append(var)
+            for s in range(class_sends):
+                target = rnd.randrange(classes)
+                out.append(f"    k{s} := C{target} m{rnd.randrange(methods)}: {s}.\n")
+            if keyword_parts:
+                parts = " ".join(f"key{k}: {rnd.choice(names)}" for k in range(keyword_parts))
+                out.append(f"    kw := a {parts}.\n")
+            if nesting:
+                out.append(f"    n := {_nested_block(nesting, names)}.\n")
+            for s in range(comments):
+                out.append(f'    "{_text(rnd, 12)}"\n')
+                out.append(f"    t{s} := '{_text(rnd, 12)}'.\n")
+            out.append("  ]\n")
+        out.append("}\n")
+    return "".join(out)
+
+# Konec souboru generator.py (EOF)
@@ -0,0 +1,133 @@
+"""
+    @file: suite.py
+    @brief: Sada benchmarku s casy jednotlivych fazi prekladu a kontrolou regresi
+    @details: Spusteni: python3 -m bench.suite [--repeat N] [--only jmeno ...]
+                          [--save soubor.json] [--compare soubor.json [--threshold 0.25]]
+              Kazdy scenar zvetsuje jednu osu generatoru (bench/generator.py),
+              ostatni zustavaji na zakladni velikosti. Meri se faze parse (lexer +
+              LALR + transformer), kontrola (SemChecker) a zapis XML; bere se
+              minimum z N opakovani. S --compare skonci kodem 1, pokud je nektera
+              faze pomalejsi nez ulozeny zaklad o vice nez `threshold`.
+              Pouziti v Makefile: make bench, make bench-baseline
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+
+import lark
+
+from bench.generator import generate_program
+from src.compiler import Sol25Compiler
+
+PHASES = ("parse", "check", "xml")
+
+# Zakladni velikost programu, kazdy scenar meni jednu osu
+BASE = {"classes": 20, "methods": 5, "statements": 10}
+
+SCENARIOS = {
+    "base": {},
+    "classes": {"classes": 200},
+    "methods": {"methods": 50},
+    "statements": {"statements": 100},
+    "keyword_send": {"keyword_parts": 40},
+    "nesting": {"nesting": 40},
+    "comments": {"comments": 40},
+    "class_hierarchy": {"classes": 200, "chain": True, "class_sends": 5},
+}
+
+# Rozdily pod touto hranici se nepovazuji za regresi (sum mereni)
+NOISE_FLOOR_MS = 1.0
+
+
+def measure(compiler, source, repeat):
+    '''Minimum z `repeat` behu pro kazdou fazi, vraci {faze: ms}'''
+    best = dict.fromkeys(PHASES, float("inf"))
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ast_root = compiler.parse(source)
+        parsed = time.perf_counter()
+        compiler.check(ast_root)
+        checked = time.perf_counter()
+        compiler.write_xml(ast_root, io.StringIO())
+        written = time.perf_counter()
+        for phase, elapsed in zip(PHASES, (parsed - start, checked - parsed, written - checked)):
+            best[phase] = min(best[phase], elapsed * 1000)
+    return best
+
+def run_suite(names, repeat):
+    '''Spusteni vybranych scenaru, vraci {scenar: {faze: ms}}'''
+    compiler = Sol25Compiler()
+    results = {}
+    for name in names:
+        params = dict(BASE, **SCENARIOS[name])
+        source = generate_program(**params)
+        results[name] = times = measure(compiler, source, repeat)
+        total = sum(times.values())
+        print(f"{name:16} {len(source) / 1024:8.1f} KiB  "
+              + "  ".join(f"{phase} {times[phase]:8.2f} ms" for phase in PHASES)
+              + f"  celkem {total:8.2f} ms", flush=True)
+    return results
+
+def compare(results, baseline, threshold):
+    '''Porovnani se zakladem, vraci seznam regresi (popisu)'''
+    regressions = []
+    for name, times in results.items():
+        base_times = baseline.get(name)
+        if not base_times:
+            continue
+        for phase in PHASES:
+            old = base_times.get(phase)
+            new = times[phase]
+            if old is None:
+                continue
+            ratio = new / old if old else float("inf")
+            mark = ""
+            if ratio > 1 + threshold and new - old > NOISE_FLOOR_MS:
+                regressions.append(f"{name}/{phase}: {old:.2f} ms -> {new:.2f} ms ({ratio:.2f}x)")
+                mark = "  REGRESE"
+            print(f"  {name:16} {phase:6} {old:8.2f} -> {new:8.2f} ms  {ratio:5.2f}x{mark}")
+    return regressions
+
+def main(args):
+    parser = argparse.ArgumentParser(prog="python3 -m bench.suite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), metavar="NAME")
+    parser.add_argument("--save", metavar="FILE", help="ulozit vysledky jako zaklad")
+    parser.add_argument("--compare", metavar="FILE", help="porovnat s ulozenym zakladem")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="povolene zpomaleni (0.25 = o 25 %%)")
+    opts = parser.parse_args(args)
+
+    results = run_suite(opts.only or list(SCENARIOS), opts.repeat)
+
+    if opts.save:
+        with open(opts.save, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "lark": lark.__version__,
+                "repeat": opts.repeat,
+                "results": results,
+            }, f, indent=2)
+        print(f"Zaklad ulozen do {opts.save}")
+
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)
+        print(f"Porovnani se zakladem {opts.compare} (prah {opts.threshold:.0%}):")
+        regressions = compare(results, baseline["results"], opts.threshold)
+        if regressions:
+            print("Regrese:", *regressions, sep="\n  ", file=sys.stderr)
+            return 1
+        print("Bez regresi")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru suite.py (EOF)
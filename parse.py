@@ -6,72 +6,248 @@
 '''
 
 import sys
-from lark import UnexpectedToken, UnexpectedCharacters
-from src.parse_to_ast import Sol25Transformer
-from src.debug_print import print_ast
-from src.grammar import create_parser
-from src.sem_checker import SemChecker
-from src.ast_to_xml import ast_to_xml
-import xml.etree.ElementTree as ET
-import re
+import argparse
+from src.errors import Sol25Error
 
 
 def call_help():
     print("Nápověda k programu parse.py")
     print("Použití např.: python3.11 parse.py < [input_file] > [output_file]")
     print("  --help: Vypíše tuto nápovědu")
+    print("  --batch <dir|filelist> --out <dir> [--jobs N]: Přeloží více souborů najednou")
+    print("  --compact: XML bez odsazení a odřádkování")
+    print("  --format=xml|bin: Výstupní formát (bin = binární AST, viz src/ast_binary.py)")
+    print("  --serve [socket]: Spustí server s načteným parserem (klient: python3 -m src.client)")
+    print("  --cache-dir <dir> [--cache-size MB] [--cache-stats]: Cache výsledků překladu na disku")
+    print("  --watch <dir> [--interval s]: Sleduje adresář a překládá změněné soubory *.sol")
+    print("  --stats[=text|json] [--stats-file <file>] [--stats-memory]: Čas a CPU jednotlivých fází (na stderr nebo do souboru),")
+    print("      s --stats-memory i špička paměti (tracemalloc, ve druhém průchodu)")
+    print("  --all-errors: Vypíše všechny sémantické chyby najednou (návratový kód = kód první chyby)")
+    print("  --profile <file> [--profile-phase create_parser|parse|check|xml]: Profil (pstats + <file>.collapsed)")
+    print("  --parser lark|rd|parsy: Parser (viz src/backends.py), výstup je u všech stejný")
+    print("  --flat-ast: AST uložené v polích (méně paměti pro velmi velké programy, viz src/flat_ast.py)")
+    print("  --check-jobs N: Sémantická kontrola tříd v N procesech (velmi velké programy)")
+    print("  --fold: Složí konstantní zprávy vestavěným třídám do literálů (souhrn na stderr)")
+    print("  --vtables: Přidá do XML tabulky metod tříd a instancí a cíle zpráv třídám (<vtables>, atribut target)")
 
-def extract_comment(source_code):
-    '''Extrakce komentáře z kódu'''
-    match = re.search(r'"([^"]*)"', source_code, re.DOTALL)
-    if match:
-        return match.group(1)
-    return None
+class ArgParser(argparse.ArgumentParser):
+    '''Parser argumentu, ktery pri chybe konci kodem 10'''
+    def error(self, message):
+        print(f"Invalid arguments: {message}", file=sys.stderr)
+        sys.exit(10)
 
-def fix_coment_for_xml(comment):
-    '''Nahradi \n'''
-    return comment.replace('\\n', '&#10;')
+def parse_args(args):
+    '''Zpracovani argumentu prikazove radky'''
+    parser = ArgParser(prog="parse.py", add_help=False, allow_abbrev=False)
+    parser.add_argument("--batch", metavar="SOURCE")
+    parser.add_argument("--out", metavar="DIR")
+    parser.add_argument("--jobs", type=int, metavar="N")
+    parser.add_argument("--serve", nargs="?", const="", metavar="SOCKET")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--format", choices=("xml", "bin"), default="xml")
+    parser.add_argument("--cache-dir", metavar="DIR")
+    parser.add_argument("--cache-size", type=int, metavar="MB")
+    parser.add_argument("--cache-stats", action="store_true")
+    parser.add_argument("--watch", metavar="DIR")
+    parser.add_argument("--interval", type=float, metavar="SECONDS")
+    parser.add_argument("--stats", nargs="?", const="text", choices=("text", "json"))
+    parser.add_argument("--stats-file", metavar="FILE")
+    parser.add_argument("--stats-memory", action="store_true")
+    parser.add_argument("--all-errors", action="store_true")
+    parser.add_argument("--profile", metavar="FILE")
+    parser.add_argument("--profile-phase", choices=("create_parser", "parse", "check", "xml"))
+    parser.add_argument("--flat-ast", action="store_true")
+    parser.add_argument("--check-jobs", type=int, metavar="N")
+    parser.add_argument("--fold", action="store_true")
+    parser.add_argument("--vtables", action="store_true")
+    parser.add_argument("--parser", choices=("lark", "rd", "parsy"), default="lark")
+    opts = parser.parse_args(args)
 
-def main():
-    source_code = sys.stdin.read()
-    desc = extract_comment(source_code)
-    if desc:
-        desc = fix_coment_for_xml(desc)
+    if opts.batch and not opts.out:
+        parser.error("--batch requires --out")
+    if not opts.batch and (opts.out or opts.jobs is not None):
+        parser.error("--out and --jobs are only valid with --batch")
+    if opts.jobs is not None and opts.jobs < 1:
+        parser.error("--jobs must be positive")
+    if opts.serve is not None and opts.batch:
+        parser.error("--serve cannot be combined with --batch")
+    if opts.serve is not None and opts.compact:
+        parser.error("--compact is not supported with --serve")
+    if not opts.cache_dir and (opts.cache_size is not None or opts.cache_stats):
+        parser.error("--cache-size and --cache-stats are only valid with --cache-dir")
+    if opts.cache_size is not None and opts.cache_size < 1:
+        parser.error("--cache-size must be positive")
+    if opts.watch and (opts.batch or opts.serve is not None or opts.cache_dir):
+        parser.error("--watch cannot be combined with --batch, --serve or --cache-dir")
+    if not opts.watch and opts.interval is not None:
+        parser.error("--interval is only valid with --watch")
+    if opts.interval is not None and opts.interval <= 0:
+        parser.error("--interval must be positive")
+    if opts.stats and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir):
+        parser.error("--stats is only valid for a single compile from stdin")
+    if opts.stats_file and not opts.stats:
+        parser.error("--stats-file is only valid with --stats")
+    if opts.stats_memory and not opts.stats:
+        parser.error("--stats-memory is only valid with --stats")
+    if opts.profile and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir or opts.stats):
+        parser.error("--profile is only valid for a single compile from stdin")
+    if opts.all_errors and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir
+                            or opts.stats or opts.profile):
+        parser.error("--all-errors is only valid for a single compile from stdin")
+    if opts.format == "bin" and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir
+                                 or opts.stats or opts.profile or opts.all_errors or opts.compact):
+        parser.error("--format=bin is only valid for a single compile from stdin")
+    if opts.profile_phase and not opts.profile:
+        parser.error("--profile-phase is only valid with --profile")
+    if opts.flat_ast and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir
+                          or opts.stats or opts.profile or opts.all_errors):
+        parser.error("--flat-ast is only valid for a single compile from stdin")
+    if opts.parser != "lark" and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir):
+        parser.error("--parser is only valid for a single compile from stdin")
+    if opts.flat_ast and opts.parser != "lark":
+        parser.error("--flat-ast requires --parser=lark")
+    if opts.check_jobs is not None and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir
+                                        or opts.stats or opts.profile):
+        parser.error("--check-jobs is only valid for a single compile from stdin")
+    if opts.check_jobs is not None and opts.check_jobs < 1:
+        parser.error("--check-jobs must be positive")
+    if opts.fold and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir or opts.stats
+                      or opts.profile or opts.all_errors or opts.format == "bin"):
+        parser.error("--fold is only valid for a single compile from stdin")
+    if opts.vtables and (opts.batch or opts.serve is not None or opts.watch or opts.cache_dir or opts.stats
+                         or opts.profile or opts.all_errors or opts.format == "bin"):
+        parser.error("--vtables is only valid for a single compile from stdin")
+    return opts
+
+def cache_size(opts):
+    '''Limit velikosti cache v bajtech'''
+    from src.cache import DEFAULT_MAX_BYTES
+    if opts.cache_size is None:
+        return DEFAULT_MAX_BYTES
+    return opts.cache_size * 1024 * 1024
+
+def main_cached(opts, source_code, indent):
+    '''Preklad pres cache (--cache-dir), vraci navratovy kod'''
+    from src.cache import CompileCache, format_stats
+    try:
+        cache = CompileCache(opts.cache_dir, cache_size(opts))
+    except OSError as e:
+        print(f"Cannot create cache directory: {e}", file=sys.stderr)
+        return 12
+
+    code, xml_str, message, hit = cache.compile(source_code, indent)
+    if code:
+        print(message, file=sys.stderr)
     else:
-        desc = None
+        sys.stdout.write(xml_str)
+
+    total = cache.flush_stats()
+    if opts.cache_stats:
+        print(f"Cache: {'hit' if hit else 'miss'}", file=sys.stderr)
+        if total is not None:
+            print(f"Cache total: {format_stats(total)}", file=sys.stderr)
+    return code
+
+def main_stats(opts, source_code, indent):
+    '''Preklad s merenim fazi (--stats), vraci navratovy kod'''
+    from src.stats import compile_with_stats
+    stats = compile_with_stats(source_code, sys.stdout, indent, opts.parser, opts.stats_memory)
+    sys.stdout.flush()
+    if stats.error:
+        print(stats.error[1], file=sys.stderr)
+
+    if opts.stats_file:
+        try:
+            with open(opts.stats_file, "w", encoding="utf-8") as f:
+                stats.write(f, opts.stats)
+        except OSError as e:
+            print(f"Cannot write stats: {e}", file=sys.stderr)
+            return 12
+    else:
+        stats.write(sys.stderr, opts.stats)
+    return stats.error[0] if stats.error else 0
+
+def main_profile(opts, source_code, indent):
+    '''Preklad s profilovanim (--profile), vraci navratovy kod'''
+    from src.profiler import profile_compile
+    code, message, dump_error = profile_compile(source_code, sys.stdout, opts.profile, opts.profile_phase,
+                                                indent, opts.parser)
+    if dump_error is not None:
+        # XML uz je na stdout, navratovy kod zustava podle prekladu
+        print(f"Cannot write profile: {dump_error}", file=sys.stderr)
+    if code:
+        print(message, file=sys.stderr)
+    return code
 
+def main_all_errors(opts, source_code, indent):
+    '''Preklad se sberem vsech chyb (--all-errors), vraci kod prvni chyby'''
+    compiler = make_compiler(opts)
+    ast_root, desc, errors = compiler.diagnose(source_code)
+    if not errors:
+        compiler.write_xml(ast_root, sys.stdout, desc, indent)
+        return 0
+
+    for e in errors:
+        print(f"{e.code}\t{e.location() or '-'}\t{e}", file=sys.stderr)
+    print(f"{len(errors)} error(s)", file=sys.stderr)
+    return errors[0].code
+
+def main_binary(compiler, source_code):
+    '''Preklad do binarniho AST (--format=bin) na stdout'''
     try:
-        sol25_parser = create_parser()
-        tree = sol25_parser.parse(source_code)
-        #print(tree.pretty())
-    # Semanticka chyba
-    except UnexpectedToken as e:
-        print(f"Unexpected token: {e}", file=sys.stderr)
-        sys.exit(22)
-    # Lexikalni chyba
-    except UnexpectedCharacters as e:
-        print(f"Unexpected characters: {e}", file=sys.stderr)
-        sys.exit(21)
-    
-    # Převod na AST
-    transformer = Sol25Transformer()
-    ast_root = transformer.transform(tree)
-
-    # Debugovací výpis AST stromu
-    #print_ast(ast_root)
-
-    # Semanticka kontrola
+        ast_root, desc = compiler.analyze(source_code)
+    except Sol25Error as e:
+        print(e, file=sys.stderr)
+        return e.code
+    sys.stdout.buffer.write(compiler.to_binary(ast_root, desc))
+    return 0
+
+def main_fold(compiler, source_code, indent, vtables=False):
+    '''Preklad se skladanim konstant (--fold), souhrn jde na stderr'''
     try:
-        sem_checker = SemChecker(ast_root)
-        sem_checker.check()
-    except SystemExit as e:
-        sys.exit(e.code)
+        ast_root, desc, checker = compiler.analyze_with_checker(source_code)
+    except Sol25Error as e:
+        print(e, file=sys.stderr)
+        return e.code
+    ast_root, report = compiler.optimize(ast_root)
+    compiler.write_xml(ast_root, sys.stdout, desc, indent, checker.dispatch_tables() if vtables else None)
+    print(f"Fold: {report}", file=sys.stderr)
+    return 0
+
+def make_compiler(opts):
+    '''Prekladac podle --parser, --flat-ast a --check-jobs'''
+    from src.compiler import Sol25Compiler, get_compiler # az zde => zasah v cache nenacita lark
+    if opts.flat_ast:
+        from src.flat_ast import get_flat_parser
+        return Sol25Compiler(get_flat_parser(), opts.check_jobs)
+    compiler = get_compiler(opts.parser)
+    if opts.check_jobs is not None:
+        compiler = Sol25Compiler(compiler.parser, opts.check_jobs)
+    return compiler
 
-    # Prevod AST do XML
-    root = ast_to_xml(ast_root, desc)
-    ET.indent(root, space="    ")
-    xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding='unicode')
-    sys.stdout.write(xml_str)
+def main(opts):
+    source_code = sys.stdin.read()
+    indent = None if opts.compact else "    "
+    if opts.cache_dir:
+        sys.exit(main_cached(opts, source_code, indent))
+    if opts.stats:
+        sys.exit(main_stats(opts, source_code, indent))
+    if opts.profile:
+        sys.exit(main_profile(opts, source_code, indent))
+    if opts.all_errors:
+        sys.exit(main_all_errors(opts, source_code, indent))
+
+    compiler = make_compiler(opts)
+    if opts.format == "bin":
+        sys.exit(main_binary(compiler, source_code))
+    if opts.fold:
+        sys.exit(main_fold(compiler, source_code, indent, opts.vtables))
+    try:
+        # XML se zapisuje rovnou na stdout, az po uspesnych kontrolach
+        compiler.compile_to(source_code, sys.stdout, indent, opts.vtables)
+    except Sol25Error as e:
+        print(e, file=sys.stderr)
+        sys.exit(e.code)
 
     #Konec funkce main
 
@@ -88,11 +264,23 @@ if __name__ == "__main__":
             sys.exit(10)
         call_help()
         sys.exit(0)
-    if args:
-        print("Invalid arguments", file=sys.stderr)
-        sys.exit(10)
-    main()
+    opts = parse_args(args)
+    if opts.batch:
+        from src.batch import run_batch
+        sys.exit(run_batch(opts.batch, opts.out, opts.jobs, None if opts.compact else "    ",
+                           opts.cache_dir, cache_size(opts), opts.cache_stats))
+    if opts.serve is not None:
+        from src.server import serve
+        sys.exit(serve(opts.serve or None, opts.cache_dir, cache_size(opts), opts.cache_stats))
+    if opts.watch:
+        from src.watch import watch, DEFAULT_INTERVAL
+        sys.exit(watch(opts.watch, None if opts.compact else "    ", opts.interval or DEFAULT_INTERVAL))
+    if opts.parser == "parsy":
+        # Jeden preklad, ostatni pruchody nejsou rekurzivni => limit rekurze procesu
+        # muze odpovidat zasobniku vlakna parseru parsy (src/parsy_parser.py)
+        from src.parsy_parser import RECURSION_LIMIT
+        sys.setrecursionlimit(RECURSION_LIMIT)
+    main(opts)
+
 
-    
 #Konec souboru parse.py (EOF)
-    
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+    @file: ast_binary.py
+    @brief: Kompaktni binarni serializace AST (--format=bin) a jeji nacitani
+    @details: Format (verze 1), cisla jsou varint (LEB128 bez znamenka):
+                "SOL25AST" <verze: u8>
+                <pocet retezcu> { <delka UTF-8> <bajty> }   - tabulka retezcu
+                <popis: 0 = zadny, jinak index + 1>
+                <pocet zaznamu> { <zaznam> }
+              Zaznamy jsou v post-orderu (potomci pred rodicem), nacitani je tak
+              jednoduchy zasobnikovy automat bez rekurze:
+                VAR     <jmeno>                          -> VarNode
+                LITERAL <typ> <hodnota>                  -> LiteralNode
+                SEND    <selektor> <pocet argumentu>     -> SendNode(prijemce, argumenty)
+                ASSIGN  <promenna>                       -> AssignNode(vyraz)
+                BLOCK   <pocet param.> {<param>} <pocet prikazu>
+                METHOD  <selektor>                       -> MethodNode(blok)
+                CLASS   <jmeno> <rodic> <pocet metod>
+                PROGRAM <pocet trid>
+              Hodnota literalu: 0 = None, 1 = True, 2 = False, jinak index retezce + 3.
+              Pouziti: python3 -m src.ast_binary < vstup.bin > vystup.xml
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import sys
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.errors import Sol25Error
+
+MAGIC = b"SOL25AST"
+VERSION = 1
+
+# Typy zaznamu
+VAR, LITERAL, SEND, ASSIGN, BLOCK, METHOD, CLASS, PROGRAM = range(8)
+
+# Kodovani hodnot literalu, ktere nejsou retezce
+_CONST_VALUES = (None, True, False)
+_CONST_CODES = {None: 0, True: 1, False: 2}
+
+# Povolene typy potomku (jinak je zaznam poskozeny)
+_EXPR_TYPES = frozenset((VarNode, LiteralNode, SendNode, BlockNode))
+_STATEMENT_TYPES = frozenset((AssignNode,))
+_METHOD_TYPES = frozenset((MethodNode,))
+_CLASS_TYPES = frozenset((ClassNode,))
+
+
+class BinaryFormatError(Sol25Error):
+    '''Poskozena nebo nepodporovana binarni data'''
+
+
+def _varint(value, append):
+    '''Zapis nezaporneho cisla jako LEB128'''
+    while value > 0x7F:
+        append((value & 0x7F) | 0x80)
+        value >>= 7
+    append(value)
+
+
+class _StringTable:
+    '''Tabulka retezcu - kazdy retezec se ulozi jen jednou'''
+
+    def __init__(self):
+        self.index = {}
+
+    def __call__(self, text):
+        idx = self.index.get(text)
+        if idx is None:
+            idx = self.index[text] = len(self.index)
+        return idx
+
+
+def dump(program_node, description=None):
+    '''Serializace AST do bytes'''
+    strings = _StringTable()
+    body = bytearray()
+    put = body.append
+    records = 0
+
+    # Post-order bez rekurze: (uzel, True) => potomci uz jsou zapsani
+    stack = [(program_node, False)]
+    while stack:
+        node, done = stack.pop()
+        node_type = node.kind
+
+        if node_type is VarNode:
+            put(VAR)
+            _varint(strings(node.var), put)
+        elif node_type is LiteralNode:
+            put(LITERAL)
+            _varint(strings(node.type), put)
+            value = node.value
+            if type(value) is str:
+                _varint(strings(value) + 3, put)
+            else:
+                _varint(_CONST_CODES[value], put)
+        elif not done:
+            stack.append((node, True))
+            if node_type is SendNode:
+                children = (node.receiver,) + node.arguments
+            elif node_type is AssignNode:
+                children = (node.expr,)
+            elif node_type is BlockNode:
+                children = node.statements
+            elif node_type is MethodNode:
+                children = (node.block,)
+            elif node_type is ClassNode:
+                children = node.methods
+            elif node_type is ProgramNode:
+                children = node.classes
+            else:
+                raise Sol25Error(f"Cannot serialize {node_type.__name__}")
+            for child in reversed(children):
+                stack.append((child, False))
+            continue
+        elif node_type is SendNode:
+            put(SEND)
+            _varint(strings(node.selector), put)
+            _varint(len(node.arguments), put)
+        elif node_type is AssignNode:
+            put(ASSIGN)
+            _varint(strings(node.var), put)
+        elif node_type is BlockNode:
+            put(BLOCK)
+            _varint(len(node.params), put)
+            for param in node.params:
+                _varint(strings(param), put)
+            _varint(len(node.statements), put)
+        elif node_type is MethodNode:
+            put(METHOD)
+            _varint(strings(node.selector), put)
+        elif node_type is ClassNode:
+            put(CLASS)
+            _varint(strings(node.name), put)
+            _varint(strings(node.parent), put)
+            _varint(len(node.methods), put)
+        else: # ProgramNode
+            put(PROGRAM)
+            _varint(len(node.classes), put)
+        records += 1
+
+    desc = 0 if description is None else strings(description) + 1
+
+    head = bytearray(MAGIC)
+    head.append(VERSION)
+    _varint(len(strings.index), head.append)
+    for text in strings.index: # slovnik zachovava poradi vlozeni = poradi indexu
+        data = text.encode("utf-8", errors="surrogatepass")
+        _varint(len(data), head.append)
+        head += data
+    _varint(desc, head.append)
+    _varint(records, head.append)
+    return bytes(head + body)
+
+
+def _children(stack, count, types):
+    '''Poslednich `count` uzlu ze zasobniku, vsechny musi mit typ z `types`'''
+    if not count:
+        return ()
+    if count > len(stack):
+        raise BinaryFormatError("Truncated or corrupted binary AST")
+    children = stack[len(stack) - count:]
+    del stack[len(stack) - count:]
+    for child in children:
+        if type(child) not in types:
+            _unexpected(child)
+    return children
+
+def _unexpected(node):
+    raise BinaryFormatError(f"Corrupted binary AST: unexpected {type(node).__name__}")
+
+def load(data):
+    '''
+    Nacteni AST z bytes, vraci (ProgramNode, popis nebo None).
+    Kazdy zaznam smi mit jen potomky spravneho druhu (trida jen metody, blok
+    jen prirazeni, zprava a prirazeni jen vyrazy...), jinak BinaryFormatError.
+    '''
+    if data[:len(MAGIC)] != MAGIC:
+        raise BinaryFormatError("Not a SOL25 binary AST")
+    if len(data) <= len(MAGIC) or data[len(MAGIC)] != VERSION:
+        raise BinaryFormatError("Unsupported binary AST version")
+    pos = len(MAGIC) + 1
+
+    def varint():
+        nonlocal pos
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            return byte
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    try:
+        strings = []
+        for _ in range(varint()):
+            size = varint()
+            strings.append(data[pos:pos + size].decode("utf-8", errors="surrogatepass"))
+            pos += size
+        desc = varint()
+        description = strings[desc - 1] if desc else None
+        values = list(_CONST_VALUES) + strings # hodnoty literalu
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for _ in range(varint()):
+            kind = data[pos]
+            pos += 1
+            if kind == VAR:
+                push(VarNode(strings[varint()]))
+            elif kind == LITERAL:
+                literal_type = strings[varint()]
+                push(LiteralNode(literal_type, values[varint()]))
+            elif kind == SEND:
+                selector = strings[varint()]
+                count = varint()
+                args = _children(stack, count, _EXPR_TYPES) if count else ()
+                receiver = pop()
+                if type(receiver) not in _EXPR_TYPES:
+                    _unexpected(receiver)
+                push(SendNode(receiver, selector, args))
+            elif kind == ASSIGN:
+                var = strings[varint()]
+                expr = pop()
+                if type(expr) not in _EXPR_TYPES:
+                    _unexpected(expr)
+                push(AssignNode(var, expr))
+            elif kind == BLOCK:
+                params = [strings[varint()] for _ in range(varint())]
+                push(BlockNode(params, _children(stack, varint(), _STATEMENT_TYPES)))
+            elif kind == METHOD:
+                selector = strings[varint()]
+                block = pop()
+                if type(block) is not BlockNode:
+                    _unexpected(block)
+                push(MethodNode(selector, block))
+            elif kind == CLASS:
+                name = strings[varint()]
+                parent = strings[varint()]
+                push(ClassNode(name, parent, _children(stack, varint(), _METHOD_TYPES)))
+            elif kind == PROGRAM:
+                push(ProgramNode(_children(stack, varint(), _CLASS_TYPES)))
+            else:
+                raise BinaryFormatError(f"Unknown record type {kind}")
+    except (IndexError, UnicodeDecodeError):
+        raise BinaryFormatError("Truncated or corrupted binary AST") from None
+
+    if len(stack) != 1 or type(stack[0]) is not ProgramNode or pos != len(data):
+        raise BinaryFormatError("Corrupted binary AST")
+    return stack[0], description
+
+
+def main():
+    '''Prevod binarniho AST ze stdin na XML (stejne jako parse.py)'''
+    from src.xml_writer import write_xml
+    try:
+        program, description = load(sys.stdin.buffer.read())
+    except BinaryFormatError as e:
+        print(e, file=sys.stderr)
+        return 11
+    write_xml(program, sys.stdout, description)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# Konec souboru ast_binary.py (EOF)
@@ -1,48 +1,113 @@
 """
     @file: ast_nodes.py
     @brief: Soubor obsahující třídy pro AST strom
-    @author: Jakub Fukala (xfukal01) 
+    @details: Uzly pouzivaji __slots__ (zadny __dict__ na instanci) a seznamy
+              potomku se ukladaji jako n-tice. Uzly se porovnavaji podle obsahu
+              (==, hash), coz se hodi pro testy a porovnani stromu. Porovnani
+              je iterativni, hash pouziva jen hodnoty primo v uzlu.
+              Atribut tridy `kind` je zakladni trida uzlu - shoduje se i pro
+              pohledy do plocheho AST (src/flat_ast.py), ktere z uzlu dedi.
+    @author: Jakub Fukala (xfukal01)
 """
 
-class ProgramNode:
+class Node:
+    '''Spolecny predek uzlu, `__slots__` tridy `kind` urcuje polozky uzlu'''
+    __slots__ = ()
+    kind = None # Zakladni trida uzlu (nastavi se u kazde tridy nize)
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.kind.__slots__)
+
+    def __eq__(self, other):
+        # Porovnani bez rekurze - hluboce vnorene stromy nenarazi na limit rekurze
+        if not isinstance(other, Node) or self.kind is not other.kind:
+            return NotImplemented
+        pending = [(self, other)]
+        while pending:
+            a, b = pending.pop()
+            if isinstance(a, Node):
+                if not isinstance(b, Node) or a.kind is not b.kind:
+                    return False
+                pending.extend(zip(a._values(), b._values()))
+            elif type(a) is not type(b):
+                return False
+            elif isinstance(a, tuple):
+                if len(a) != len(b):
+                    return False
+                pending.extend(zip(a, b))
+            elif a != b:
+                return False
+        return True
+
+    def __hash__(self):
+        # Jen hodnoty primo v uzlu (retezce, pocty potomku) => bez rekurze,
+        # shodne uzly maji vzdy shodny hash
+        return hash((self.kind.__name__,) + tuple(
+            len(v) if isinstance(v, tuple) else None if isinstance(v, Node) else v
+            for v in self._values()
+        ))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.kind.__slots__)
+        return f"{self.kind.__name__}({fields})"
+
+class ProgramNode(Node):
+    __slots__ = ("classes",)
+
     def __init__(self, classes):
-        self.classes = classes # list of ClassNode
+        self.classes = tuple(classes) # tuple of ClassNode
+
+class ClassNode(Node):
+    __slots__ = ("name", "parent", "methods")
 
-class ClassNode:
     def __init__(self, name, parent, methods):
         self.name = name # str
         self.parent = parent # str
-        self.methods = methods # list of MethodNode
+        self.methods = tuple(methods) # tuple of MethodNode
+
+class MethodNode(Node):
+    __slots__ = ("selector", "block")
 
-class MethodNode:
     def __init__(self, selector, block):
-        self.selector = selector # str   
+        self.selector = selector # str
         self.block = block # BlockNode
 
-class BlockNode:
+class BlockNode(Node):
+    __slots__ = ("params", "statements")
+
     def __init__(self, params, statements):
-        self.params = params # list of param names
-        self.statements = statements # list of StatementNode
+        self.params = tuple(params) # tuple of param names
+        self.statements = tuple(statements) # tuple of StatementNode
+
+class AssignNode(Node):
+    __slots__ = ("var", "expr")
 
-class AssignNode:
     def __init__(self, var, expr):
         self.var = var # str
         self.expr = expr # Union[LiteralNode, VarNode, SendNode]
 
-class SendNode:
+class SendNode(Node):
+    __slots__ = ("receiver", "selector", "arguments")
+
     def __init__(self, receiver, selector, arguments):
         self.receiver = receiver  # Union[LiteralNode, VarNode, SendNode]
         self.selector = selector  # str
-        self.arguments = arguments  # list of Union[LiteralNode, VarNode, SendNode]
+        self.arguments = tuple(arguments)  # tuple of Union[LiteralNode, VarNode, SendNode]
+
+class LiteralNode(Node):
+    __slots__ = ("type", "value")
 
-class LiteralNode:
     def __init__(self, type, value):
         self.type = type # str  `INT`, `STRING`, `NIL`, `TRUE`, `FALSE`
         self.value = value # '42', 'hello', None, True, False
 
-class VarNode:
+class VarNode(Node):
+    __slots__ = ("var",)
+
     def __init__(self, var):
         self.var = var # str
 
+for _cls in (ProgramNode, ClassNode, MethodNode, BlockNode, AssignNode, SendNode, LiteralNode, VarNode):
+    _cls.kind = _cls
 
-# Konec souboru ast_nodes.py (EOF)
\ No newline at end of file
+# Konec souboru ast_nodes.py (EOF)
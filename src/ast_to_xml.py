@@ -46,8 +46,16 @@ def class_to_xml(class_node):
     return class_elem
 
 def block_to_xml(block_node):
-    '''Prevod bloku do XML'''
-    block_elem = ET.Element("block", {"arity": str(len(block_node.params))})
+    '''Prevod bloku do XML (vcetne vnorenych vyrazu, bez rekurze)'''
+    block_elem = ET.Element("block")
+    pending = []
+    _fill_block(block_elem, block_node, pending)
+    _expand(pending)
+    return block_elem
+
+def _fill_block(block_elem, block_node, pending):
+    '''Naplneni elementu <block>, vyrazy prikazu se pridaji do `pending`'''
+    block_elem.set("arity", str(len(block_node.params)))
 
     # Parametry bloku
     for i, param in enumerate(block_node.params, start=1):
@@ -70,52 +78,61 @@ def block_to_xml(block_node):
             })
 
             expr_el = ET.SubElement(assign_elem, "expr")
-            expr_to_xml(statemnt.expr, expr_el)
+            pending.append((statemnt.expr, expr_el))
         else:
             # neznamy typ statementu
             pass
-        
-    return block_elem
 
 def expr_to_xml(expr_node, parent_el):
     """
-    Rekurzivně uloží výraz do parent_el (typicky <expr>).
+    Uloží výraz do parent_el (typicky <expr>).
     Podle druhu expr -> <literal>, <var>, <block> nebo <send>.
+    Vnořené výrazy se zpracují iterativně (explicitní zásobník).
     """
-    if isinstance(expr_node, LiteralNode):
-
-        value = str(expr_node.value)
-        if expr_node.type == "Nil":
-            value = "nil"
-        elif expr_node.type == "True":
-            value = "true"
-        elif expr_node.type == "False":
-            value = "false"
-        
-
-        lit_el = ET.SubElement(parent_el, "literal", {
-            "class": expr_node.type,  # e.g. "int","string","class","nil"...
-            "value": value
-        })
+    _expand([(expr_node, parent_el)])
+
+def _expand(pending):
+    '''
+    Zpracovani zasobniku dvojic (vyraz, rodicovsky element).
+    Elementy obalu (<expr>, <arg>) se vytvori hned ve spravnem poradi,
+    takze na poradi zpracovani zasobniku nezalezi.
+    '''
+    while pending:
+        expr_node, parent_el = pending.pop()
+
+        if isinstance(expr_node, LiteralNode):
+
+            value = str(expr_node.value)
+            if expr_node.type == "Nil":
+                value = "nil"
+            elif expr_node.type == "True":
+                value = "true"
+            elif expr_node.type == "False":
+                value = "false"
+            
+
+            lit_el = ET.SubElement(parent_el, "literal", {
+                "class": expr_node.type,  # e.g. "int","string","class","nil"...
+                "value": value
+            })
 
-    elif isinstance(expr_node, VarNode):
-        var_el = ET.SubElement(parent_el, "var", {"name": expr_node.var})
-        
-    elif isinstance(expr_node, BlockNode):
-        # rekurzivně blok -> block_to_xml
-        block_el = block_to_xml(expr_node)
-        parent_el.append(block_el)
-    elif isinstance(expr_node, SendNode):
-        # <send selector="xxx">
-        send_el = ET.SubElement(parent_el, "send", {"selector": expr_node.selector})
-        # Příjemce => <expr> uvnitř
-        recv_expr = ET.SubElement(send_el, "expr")
-        expr_to_xml(expr_node.receiver, recv_expr)
-        # argumenty => <arg order="N"><expr>...</expr></arg>
-        for i, arg_expr in enumerate(expr_node.arguments, start=1):
-            arg_el = ET.SubElement(send_el, "arg", {"order": str(i)})
-            arg_expr_el = ET.SubElement(arg_el, "expr")
-            expr_to_xml(arg_expr, arg_expr_el)
-    else:
-        # neznámý typ 
-        pass
\ No newline at end of file
+        elif isinstance(expr_node, VarNode):
+            var_el = ET.SubElement(parent_el, "var", {"name": expr_node.var})
+            
+        elif isinstance(expr_node, BlockNode):
+            block_el = ET.SubElement(parent_el, "block")
+            _fill_block(block_el, expr_node, pending)
+        elif isinstance(expr_node, SendNode):
+            # <send selector="xxx">
+            send_el = ET.SubElement(parent_el, "send", {"selector": expr_node.selector})
+            # Příjemce => <expr> uvnitř
+            recv_expr = ET.SubElement(send_el, "expr")
+            pending.append((expr_node.receiver, recv_expr))
+            # argumenty => <arg order="N"><expr>...</expr></arg>
+            for i, arg_expr in enumerate(expr_node.arguments, start=1):
+                arg_el = ET.SubElement(send_el, "arg", {"order": str(i)})
+                arg_expr_el = ET.SubElement(arg_el, "expr")
+                pending.append((arg_expr, arg_expr_el))
+        else:
+            # neznámý typ 
+            pass
@@ -0,0 +1,45 @@
+"""
+    @file: backends.py
+    @brief: Zamenitelne parsery SOL25 (parse.py --parser)
+    @details: Backend je objekt s metodami parse(text) -> ProgramNode a lex(text).
+              Vsechny backendy vraci stejne AST a pri chybe stejny kod
+              (21 lexikalni, 22 syntakticka); vyjimky Larku prevadi Sol25Compiler,
+              ostatni backendy vyhazuji rovnou LexicalError / SyntacticError.
+                lark  - LALR parser z grammar.py s vestavenym Sol25Transformer (vychozi)
+                rd    - rucne psany parser (src/rd_parser.py)
+                parsy - parserove kombinatory knihovny parsy (src/parsy_parser.py)
+              Shodu backendu overuje python3 -m bench.conformance.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import threading
+
+BACKENDS = ("lark", "rd", "parsy")
+DEFAULT_BACKEND = "lark"
+
+_backends = {}
+_lock = threading.Lock()
+
+
+def create_backend(name):
+    '''Nova instance backendu `name` (moduly se nacitaji az zde)'''
+    if name == "lark":
+        from src.grammar import get_parser
+        return get_parser()
+    if name == "rd":
+        from src.rd_parser import RDParser
+        return RDParser()
+    if name == "parsy":
+        from src.parsy_parser import ParsyParser
+        return ParsyParser()
+    raise ValueError(f"Unknown parser backend: {name}")
+
+def get_backend(name=DEFAULT_BACKEND):
+    '''Sdilena instance backendu pro cely proces'''
+    with _lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = _backends[name] = create_backend(name)
+        return backend
+
+# Konec souboru backends.py (EOF)
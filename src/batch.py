@@ -0,0 +1,185 @@
+"""
+    @file: batch.py
+    @brief: Davkovy rezim - preklad vice souboru .sol v jednom behu
+    @details: Soubory se rozdeli mezi procesy (multiprocessing.Pool), kazdy proces
+              si parser vytvori jen jednou. Chyba v jednom souboru davku neprerusi.
+              S cache_dir se vysledky berou/ukladaji do cache (src/cache.py).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import sys
+import contextlib
+from multiprocessing import Pool
+
+from src.cache import CompileCache, DEFAULT_MAX_BYTES, format_stats
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+
+_worker_cache = None # cache procesu (None => bez cache)
+
+
+def collect_inputs(source):
+    '''
+    Seznam vstupnich souboru:
+      - adresar => vsechny soubory *.sol v nem (serazene)
+      - jinak textovy soubor se seznamem cest (jedna na radek)
+    '''
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.endswith(".sol") and os.path.isfile(os.path.join(source, name))
+        )
+
+    base = os.path.dirname(source)
+    with open(source, encoding="utf-8") as f:
+        return [os.path.join(base, line.strip()) for line in f if line.strip()]
+
+def output_path(path, out_dir):
+    '''Cesta k vystupnimu XML pro dany vstup'''
+    name = os.path.splitext(os.path.basename(path))[0] + ".xml"
+    return os.path.join(out_dir, name)
+
+def duplicate_outputs(paths):
+    '''
+    Vstupy se stejnym jmenem vystupu (napr. x/a.sol a y/a.sol => a.xml).
+    Vraci seznam (jmeno XML, [cesty]) v poradi prvniho vyskytu.
+    '''
+    by_name = {}
+    for path in paths:
+        by_name.setdefault(output_path(path, ""), []).append(path)
+    return [(name, group) for name, group in by_name.items() if len(group) > 1]
+
+def _init_worker(cache_dir=None, cache_size=DEFAULT_MAX_BYTES):
+    '''Inicializace procesu - parser (a cache) se vytvori jednou pro cely proces'''
+    global _worker_cache
+    get_compiler()
+    if cache_dir:
+        _worker_cache = CompileCache(cache_dir, cache_size)
+
+def compile_file(path, out_dir, indent="    ", cache=None):
+    '''
+    Preklad jednoho souboru. Vraci (cesta, navratovy kod, chybove hlaseni).
+    XML se zapisuje primo z procesu, ktery soubor prelozil.
+    Neocekavana chyba => kod 99 jen pro tento soubor, davka pokracuje.
+    '''
+    try:
+        return _compile_file(path, out_dir, indent, cache)
+    except Exception as e:
+        return path, 99, f"Internal error: {type(e).__name__}: {e}"
+
+def _compile_file(path, out_dir, indent, cache):
+    try:
+        with open(path, encoding="utf-8") as f:
+            source_code = f.read()
+    except OSError as e:
+        return path, 11, str(e)
+    except UnicodeDecodeError as e:
+        return path, 11, f"Not a UTF-8 file: {e}"
+
+    out_path = output_path(path, out_dir)
+    if cache is not None:
+        code, xml_str, message, _ = cache.compile(source_code, indent, get_compiler())
+    else:
+        try:
+            code, xml_str, message = 0, get_compiler().compile(source_code, indent).xml, ""
+        except Sol25Error as e:
+            code, xml_str, message = e.code, "", str(e)
+    if code:
+        # Stary vystup z predchoziho behu by byl zavadejici
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(out_path)
+        return path, code, message
+
+    try:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(xml_str)
+    except OSError as e:
+        return path, 12, str(e)
+    return path, 0, ""
+
+def _compile_job(job):
+    '''Preklad v procesu workeru, k vysledku se prida prirustek statistik cache'''
+    result = compile_file(*job, cache=_worker_cache)
+    if _worker_cache is None:
+        return result + (None,)
+    counts = _worker_cache.counts
+    _worker_cache.counts = dict.fromkeys(counts, 0)
+    return result + (counts,)
+
+def run_batch(source, out_dir, jobs=None, indent="    ", cache_dir=None,
+              cache_size=DEFAULT_MAX_BYTES, cache_stats=False):
+    '''
+    Preklad vsech souboru z `source` do adresare `out_dir`.
+    Na stdout vypise pro kazdy soubor "kod<TAB>cesta", chyby jdou na stderr.
+    Vraci 0, pokud vse proslo, jinak kod prvniho neuspesneho souboru.
+    S `cache_dir` se pouzije cache prekladu, `cache_stats` vypise jeji statistiky.
+    '''
+    try:
+        paths = collect_inputs(source)
+    except OSError as e:
+        print(f"Cannot read batch input: {e}", file=sys.stderr)
+        return 11
+    # Vystupy by se prepisovaly a chyba jednoho souboru by smazala vystup druheho
+    duplicates = duplicate_outputs(paths)
+    if duplicates:
+        for name, group in duplicates:
+            print(f"Duplicate output name {name}: {', '.join(group)}", file=sys.stderr)
+        return 10
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except OSError as e:
+        print(f"Cannot create output directory: {e}", file=sys.stderr)
+        return 12
+
+    cache = None
+    if cache_dir:
+        try:
+            cache = CompileCache(cache_dir, cache_size)
+        except OSError as e:
+            print(f"Cannot create cache directory: {e}", file=sys.stderr)
+            return 12
+
+    job_list = [(path, out_dir, indent) for path in paths]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(job_list) <= 1:
+        _init_worker(cache_dir, cache_size)
+        results = map(_compile_job, job_list)
+        code = _report(results, cache)
+    else:
+        chunksize = max(1, len(job_list) // (jobs * 4))
+        with Pool(jobs, initializer=_init_worker, initargs=(cache_dir, cache_size)) as pool:
+            code = _report(pool.imap(_compile_job, job_list, chunksize), cache)
+
+    if cache is not None:
+        run_counts = dict(cache.counts)
+        total = cache.flush_stats()
+        if cache_stats:
+            print(f"Cache: {format_stats(run_counts)}", file=sys.stderr)
+            if total is not None:
+                print(f"Cache total: {format_stats(total)}", file=sys.stderr)
+    return code
+
+def _report(results, cache=None):
+    '''Vypis vysledku (v poradi vstupu) a urceni navratoveho kodu davky'''
+    first_error = 0
+    failed = 0
+    total = 0
+    for path, code, message, counts in results:
+        total += 1
+        if counts:
+            cache.add_counts(**counts)
+        print(f"{code}\t{path}")
+        if code:
+            failed += 1
+            if message:
+                print(f"{path}: {message}", file=sys.stderr)
+            if not first_error:
+                first_error = code
+    sys.stdout.flush()
+    print(f"Batch: {total - failed}/{total} OK, {failed} failed", file=sys.stderr)
+    return first_error
+
+# Konec souboru batch.py (EOF)
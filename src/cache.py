@@ -0,0 +1,280 @@
+"""
+    @file: cache.py
+    @brief: Obsahove adresovana cache vysledku prekladu na disku
+    @details: Klic = sha256(otisk prekladace + odsazeni + zdrojovy kod). Otisk
+              prekladace se pocita z gramatiky a zdrojovych souboru parseru,
+              transformeru, checkeru a zapisu XML, takze po zmene prekladace
+              se stare zaznamy uz nenajdou (a casem se vymazou jako nejstarsi).
+
+              Otisk se pocita jen ze souboru (bez importu larku), takze zasah
+              v cache nepotrebuje nacitat parser.
+
+              Zaznam <klic>.entry = "<kod>\\n" + XML (kod 0) nebo chybove hlaseni.
+              Zapis je atomicky (docasny soubor + os.replace), cache lze sdilet
+              mezi soubezne bezicimi procesy. Pri zasahu se zaznamu obnovi cas
+              posledni zmeny, pri prekroceni limitu velikosti se mazou zaznamy
+              s nejstarsim casem (LRU).
+
+              Souhrnne statistiky (zasahy/minuti) se ukladaji do stats.json.
+              Vypis statistik: python3 -m src.cache <adresar> [--clear]
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+
+from src.errors import Sol25Error
+
+# Moduly, jejichz zmena meni vystup prekladu
+COMPILER_MODULES = (
+    "src.grammar",
+    "src.lexer",
+    "src.parse_to_ast",
+    "src.symbols",
+    "src.ast_nodes",
+    "src.sem_checker",
+    "src.xml_writer",
+    "src.visitor",
+    "src.ast_to_xml",
+    "src.compiler",
+    "src.errors",
+)
+
+ENTRY_SUFFIX = ".entry"
+TMP_PREFIX = ".tmp-"
+STATS_FILE = "stats.json"
+LOCK_FILE = "stats.lock"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+STALE_TMP_SECONDS = 3600 # docasne soubory spadlych procesu
+
+STAT_KEYS = ("hits", "misses", "stores", "evictions")
+
+_fingerprint = None
+
+def compiler_fingerprint():
+    '''Otisk verze prekladace (verze larku + zdrojove soubory COMPILER_MODULES)'''
+    global _fingerprint
+    if _fingerprint is None:
+        # Gramatika je primo v src/grammar.py, hlaseni chyb zavisi i na verzi larku
+        digest = hashlib.sha256(importlib.metadata.version("lark").encode("ascii"))
+        for name in COMPILER_MODULES:
+            spec = importlib.util.find_spec(name)
+            digest.update(name.encode("ascii"))
+            with open(spec.origin, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+class CompileCache:
+    '''Cache prekladu v adresari `directory` s limitem `max_bytes`'''
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.counts = dict.fromkeys(STAT_KEYS, 0) # statistiky tohoto procesu
+        self._size = None # odhad velikosti cache (None => zatim nezjisten)
+
+    def key(self, source_code, indent="    "):
+        '''Klic zaznamu pro zdrojovy kod a zpusob odsazeni'''
+        digest = hashlib.sha256(compiler_fingerprint().encode("ascii"))
+        digest.update(b"\0" + repr(indent).encode("utf-8") + b"\0")
+        digest.update(source_code.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        '''Nacteni zaznamu, vraci (kod, xml, chyba) nebo None'''
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.counts["misses"] += 1
+            return None
+
+        header, sep, payload = data.partition(b"\n")
+        if not sep or not header.isdigit():
+            # Poskozeny zaznam => jako by nebyl
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            self.counts["misses"] += 1
+            return None
+
+        # Obnoveni casu => zaznam je "nedavno pouzity" (LRU)
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        self.counts["hits"] += 1
+        code = int(header)
+        text = payload.decode("utf-8", errors="surrogatepass")
+        if code:
+            return code, "", text
+        return 0, text, ""
+
+    def put(self, key, code, xml_str, message):
+        '''Atomicky zapis zaznamu, pri prekroceni limitu se uvolni misto'''
+        data = f"{code}\n".encode("ascii") + (message if code else xml_str).encode("utf-8", errors="surrogatepass")
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+                raise
+        except OSError:
+            return # cache je jen zrychleni, chyba zapisu preklad neovlivni
+        self.counts["stores"] += 1
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        '''Seznam (cas, velikost, cesta) vsech zaznamu; maze stare docasne soubory'''
+        entries = []
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for item in it:
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue # mezitim smazano jinym procesem
+                if item.name.endswith(ENTRY_SUFFIX):
+                    entries.append((st.st_mtime, st.st_size, item.path))
+                elif item.name.startswith(TMP_PREFIX) and now - st.st_mtime > STALE_TMP_SECONDS:
+                    with contextlib.suppress(OSError):
+                        os.remove(item.path)
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        '''Smazani nejdele nepouzitych zaznamu, dokud cache nema nejvyse 90 % limitu'''
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.counts["evictions"] += 1
+            except FileNotFoundError:
+                pass # smazal jiny proces
+            total -= size
+        self._size = total
+
+    def compile(self, source_code, indent="    ", compiler=None):
+        '''
+        Preklad pres cache. Vraci (kod, xml, chyba, zasah).
+        Do cache se ukladaji i chyby prekladu (jsou deterministicke),
+        neocekavane vyjimky se propaguji a neukladaji.
+        Bez `compiler` se sdileny prekladac nacte az pri minuti.
+        '''
+        key = self.key(source_code, indent)
+        entry = self.get(key)
+        if entry is not None:
+            return entry + (True,)
+        if compiler is None:
+            from src.compiler import get_compiler
+            compiler = get_compiler()
+        try:
+            code, xml_str, message = 0, compiler.compile(source_code, indent).xml, ""
+        except Sol25Error as e:
+            code, xml_str, message = e.code, "", str(e)
+        self.put(key, code, xml_str, message)
+        return code, xml_str, message, False
+
+    def add_counts(self, **counts):
+        '''Pricteni statistik z jinych procesu (napr. davkovych workeru)'''
+        for name, value in counts.items():
+            self.counts[name] += value
+
+    def flush_stats(self):
+        '''
+        Pricteni statistik tohoto procesu do stats.json (pod zamkem, aby se
+        soubezne procesy neprepsaly). Vraci souhrnne statistiky.
+        '''
+        try:
+            with open(os.path.join(self.directory, LOCK_FILE), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                total = read_stats(self.directory)
+                for name in STAT_KEYS:
+                    total[name] += self.counts[name]
+                fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=self.directory)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(total, f)
+                os.replace(tmp_path, os.path.join(self.directory, STATS_FILE))
+        except OSError:
+            return None
+        self.counts = dict.fromkeys(STAT_KEYS, 0)
+        return total
+
+
+def read_stats(directory):
+    '''Souhrnne statistiky cache v adresari `directory`'''
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    try:
+        with open(os.path.join(directory, STATS_FILE)) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return stats
+    for name in STAT_KEYS:
+        if isinstance(saved.get(name), int):
+            stats[name] = saved[name]
+    return stats
+
+def format_stats(counts):
+    '''Jednoradkovy popis statistik'''
+    lookups = counts["hits"] + counts["misses"]
+    ratio = 100.0 * counts["hits"] / lookups if lookups else 0.0
+    return (f"{counts['hits']} hits, {counts['misses']} misses ({ratio:.1f} % hit rate), "
+            f"{counts['stores']} stored, {counts['evictions']} evicted")
+
+def main(args):
+    '''Vypis souhrnnych statistik, s --clear smaze zaznamy i statistiky'''
+    if len(args) not in (1, 2) or (len(args) == 2 and args[1] != "--clear"):
+        print("Usage: python3 -m src.cache <cache_dir> [--clear]", file=sys.stderr)
+        return 10
+    directory = args[0]
+    if not os.path.isdir(directory):
+        print(f"Cache directory {directory} does not exist", file=sys.stderr)
+        return 11
+
+    if len(args) == 2:
+        with os.scandir(directory) as it:
+            for item in it:
+                if item.name.endswith(ENTRY_SUFFIX) or item.name == STATS_FILE:
+                    with contextlib.suppress(OSError):
+                        os.remove(item.path)
+        return 0
+
+    entries = CompileCache(directory)._entries()
+    size = sum(size for _, size, _ in entries)
+    print(f"{directory}: {len(entries)} entries, {size / 1024:.1f} KiB")
+    print(format_stats(read_stats(directory)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru cache.py (EOF)
@@ -0,0 +1,86 @@
+"""
+    @file: client.py
+    @brief: Tenky klient pro serverovy rezim parse.py (--serve)
+    @details: Nacte program ze stdin, posle ho serveru pres Unix socket a vypise XML.
+              Navratovy kod odpovida kodu, ktery by vratil parse.py.
+              Modul zamerne neimportuje lark ani zbytek prekladace.
+              Pouziti: python3 -m src.client [--socket cesta] < vstup.sol > vystup.xml
+
+              Protokol (vse big-endian):
+                pozadavek: <u32 delka><zdrojovy kod v UTF-8>
+                odpoved:   <u8 kod><u32 delka XML><u32 delka chyby><XML><chybove hlaseni>
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import socket
+import struct
+import sys
+import tempfile
+
+REQUEST_HEADER = struct.Struct("!I")
+RESPONSE_HEADER = struct.Struct("!BII")
+
+
+def default_socket_path():
+    '''Vychozi cesta k socketu (lze zmenit promennou SOL25_SOCKET)'''
+    path = os.environ.get("SOL25_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"sol25-{os.getuid()}.sock")
+
+def recv_exact(sock, size):
+    '''Precte presne `size` bajtu, pri predcasnem konci spojeni vraci None'''
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 16))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def request(source_code, path=None):
+    '''Odesle program serveru, vraci (kod, xml, chybove hlaseni)'''
+    data = source_code.encode("utf-8")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path or default_socket_path())
+        sock.sendall(REQUEST_HEADER.pack(len(data)) + data)
+
+        header = recv_exact(sock, RESPONSE_HEADER.size)
+        if header is None:
+            raise ConnectionError("Server closed the connection")
+        code, xml_len, err_len = RESPONSE_HEADER.unpack(header)
+        payload = recv_exact(sock, xml_len + err_len)
+        if payload is None:
+            raise ConnectionError("Server closed the connection")
+
+    xml_str = payload[:xml_len].decode("utf-8")
+    message = payload[xml_len:].decode("utf-8")
+    return code, xml_str, message
+
+def main(args):
+    path = None
+    if args[:1] == ["--socket"] and len(args) == 2:
+        path = args[1]
+    elif args:
+        print("Invalid arguments", file=sys.stderr)
+        return 10
+
+    try:
+        code, xml_str, message = request(sys.stdin.read(), path)
+    except OSError as e:
+        print(f"Cannot reach parse server: {e}", file=sys.stderr)
+        return 99
+
+    if message:
+        print(message, file=sys.stderr)
+    sys.stdout.write(xml_str)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
+
+# Konec souboru client.py (EOF)
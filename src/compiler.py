@@ -0,0 +1,160 @@
+"""
+    @file: compiler.py
+    @brief: Knihovni rozhrani prekladace SOL25 (parse -> AST -> kontrola -> XML)
+    @details: Sol25Compiler drzi jednu instanci parseru a lze ho sdilet mezi vlakny.
+              Chyby se hlasi vyjimkami ze src/errors.py (atribut `code` = navratovy kod),
+              nic se nevypisuje a nevola se sys.exit.
+
+              Pouziti:
+                  result = compile_source(text)   # CompileResult
+                  result.xml                      # vystupni XML
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import threading
+from lark import UnexpectedToken, UnexpectedCharacters
+from src.grammar import get_parser, collect_comments
+from src.sem_checker import SemChecker
+from src.xml_writer import write_xml
+from src.errors import Sol25Error, LexicalError, SyntacticError
+
+
+def fix_coment_for_xml(comment):
+    '''Nahradi \\n'''
+    return comment.replace('\\n', '&#10;')
+
+def comment_description(comments):
+    '''Popis programu = text prvniho komentare (bez uvozovek) upraveny pro XML, jinak None'''
+    desc = comments[0].value[1:-1] if comments else None
+    if desc:
+        return fix_coment_for_xml(desc)
+    return None
+
+
+class CompileResult:
+    '''Vysledek uspesneho prekladu'''
+    def __init__(self, xml, ast, description):
+        self.xml = xml # str - vystupni XML vcetne hlavicky
+        self.ast = ast # ProgramNode
+        self.description = description # str nebo None - prvni komentar
+
+
+class Sol25Compiler:
+    '''
+    Znovupouzitelny prekladac. Parser (vcetne zabudovaneho transformeru)
+    je sdileny a bezstavovy, checker se vytvari pro kazdy preklad zvlast,
+    proto je `compile` bezpecne volat z vice vlaken najednou.
+    `check_jobs` > 1 => tela metod se kontroluji ve vice procesech (src/parallel_check.py).
+    '''
+
+    def __init__(self, parser=None, check_jobs=None):
+        self.parser = parser or get_parser()
+        self.check_jobs = check_jobs
+
+    def parse(self, source_code):
+        '''Lexikalni a syntakticka analyza + prevod na AST'''
+        return self.parse_with_comments(source_code)[0]
+
+    def parse_with_comments(self, source_code):
+        '''
+        Jako parse, vraci (AST, komentare). Komentare (tokeny s .line, .column)
+        zachyti lexer behem parsovani, zdrojovy kod se prochazi jen jednou.
+        '''
+        # Parser ma Sol25Transformer zabudovany => vysledkem je rovnou ProgramNode
+        try:
+            return collect_comments(self.parser.parse, source_code)
+        # Syntakticka chyba
+        except UnexpectedToken as e:
+            raise SyntacticError(f"Unexpected token: {e}") from None
+        # Lexikalni chyba
+        except UnexpectedCharacters as e:
+            raise LexicalError(f"Unexpected characters: {e}") from None
+
+    def check(self, ast_root):
+        '''Semanticka kontrola, pri chybe vyhodi SemanticError; vraci SemChecker'''
+        checker = SemChecker(ast_root, jobs=self.check_jobs)
+        checker.check()
+        return checker
+
+    def diagnose(self, source_code):
+        '''
+        Vsechny chyby programu v jednom behu, vraci (AST nebo None, popis, seznam chyb).
+        Lexikalni/syntakticka chyba je vzdy jen jedna (AST pak neni), semanticke
+        chyby se sbiraji vsechny; prvni chyba ma stejny kod jako pri `compile`.
+        '''
+        try:
+            ast_root, comments = self.parse_with_comments(source_code)
+        except Sol25Error as e:
+            return None, None, [e]
+        errors = SemChecker(ast_root, collect=True, jobs=self.check_jobs).check()
+        return ast_root, comment_description(comments), errors
+
+    def write_xml(self, ast_root, out, desc=None, indent="    ", dispatch=None):
+        '''
+        Proudovy zapis XML do `out`; indent=None => kompaktni vystup.
+        `dispatch` (SemChecker.dispatch_tables) => cile zprav tridam a sekce <vtables>
+        (tabulky metod trid i instanci).
+        '''
+        write_xml(ast_root, out, desc, indent, dispatch)
+
+    def to_binary(self, ast_root, desc=None):
+        '''Prevod AST do kompaktniho binarniho formatu (src/ast_binary.py)'''
+        from src.ast_binary import dump
+        return dump(ast_root, desc)
+
+    def to_xml(self, ast_root, desc=None, indent="    "):
+        '''Prevod AST na XML retezec'''
+        out = io.StringIO()
+        self.write_xml(ast_root, out, desc, indent)
+        return out.getvalue()
+
+    def analyze(self, source_code):
+        '''Parse + semanticka kontrola, vraci (AST, popis programu)'''
+        return self.analyze_with_checker(source_code)[:2]
+
+    def analyze_with_checker(self, source_code):
+        '''Jako analyze, vraci (AST, popis programu, SemChecker po kontrole)'''
+        ast_root, comments = self.parse_with_comments(source_code)
+        desc = comment_description(comments)
+        checker = self.check(ast_root)
+        return ast_root, desc, checker
+
+    def optimize(self, ast_root):
+        '''Skladani konstant po kontrole (src/optimizer.py), vraci (AST, FoldReport)'''
+        from src.optimizer import fold_constants
+        return fold_constants(ast_root)
+
+    def compile(self, source_code, indent="    "):
+        '''Cely preklad, vraci CompileResult nebo vyhodi Sol25Error'''
+        ast_root, desc = self.analyze(source_code)
+        return CompileResult(self.to_xml(ast_root, desc, indent), ast_root, desc)
+
+    def compile_to(self, source_code, out, indent="    ", vtables=False):
+        '''
+        Cely preklad se zapisem XML primo do proudu `out`.
+        Pri chybe se do `out` nic nezapise (kontroly probehnou pred zapisem).
+        `vtables` => vystup vcetne tabulek metod (viz write_xml).
+        '''
+        ast_root, desc, checker = self.analyze_with_checker(source_code)
+        self.write_xml(ast_root, out, desc, indent, checker.dispatch_tables() if vtables else None)
+        return ast_root
+
+
+_compilers = {} # backend -> Sol25Compiler
+_default_lock = threading.Lock()
+
+def get_compiler(backend="lark"):
+    '''Sdileny prekladac pro cely proces, `backend` viz src/backends.py'''
+    with _default_lock:
+        compiler = _compilers.get(backend)
+        if compiler is None:
+            from src.backends import get_backend
+            compiler = _compilers[backend] = Sol25Compiler(get_backend(backend))
+        return compiler
+
+def compile_source(source_code):
+    '''Preklad zdrojoveho kodu sdilenym prekladacem, vraci CompileResult'''
+    return get_compiler().compile(source_code)
+
+# Konec souboru compiler.py (EOF)
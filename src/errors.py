@@ -0,0 +1,55 @@
+"""
+    @file: errors.py
+    @brief: Vyjimky prekladace nesouci navratovy kod parse.py
+    @details:
+      - 21: Lexikalni chyba
+      - 22: Syntakticka chyba
+      - 31-35: Semanticke chyby (viz sem_checker.py)
+    @author: Jakub Fukala (xfukal01)
+"""
+
+class Sol25Error(Exception):
+    '''Zakladni trida chyb prekladu, `code` je navratovy kod parse.py'''
+    code = 99
+    class_name = None # Trida a selektor metody, kde chyba nastala (semanticke chyby)
+    selector = None
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.message = message
+        if code is not None:
+            self.code = code
+
+    def location(self):
+        '''Umisteni chyby "Trida>>selektor" (nebo jen "Trida"), jinak None'''
+        if self.class_name is None:
+            return None
+        if self.selector is None:
+            return self.class_name
+        return f"{self.class_name}>>{self.selector}"
+
+class LexicalError(Sol25Error):
+    code = 21
+
+class SyntacticError(Sol25Error):
+    code = 22
+
+class SemanticError(Sol25Error):
+    '''Semanticka chyba, kod 31-35'''
+
+class MissingMainError(SemanticError):
+    code = 31
+
+class UndefinedError(SemanticError):
+    code = 32
+
+class ArityError(SemanticError):
+    code = 33
+
+class VariableCollisionError(SemanticError):
+    code = 34
+
+class RedefinitionError(SemanticError):
+    code = 35
+
+# Konec souboru errors.py (EOF)
@@ -0,0 +1,307 @@
+"""
+    @file: flat_ast.py
+    @brief: Ploche AST ulozene v polich (struct-of-arrays) pro velmi velke programy
+    @details: Kazdy uzel je jeden index do poli modulu `array`:
+                kinds   - druh uzlu (PROGRAM, CLASS, ...)
+                s1, s2  - ID retezcu (jmeno, selektor, typ literalu, ...) nebo cisla
+                first   - index prvniho potomka (-1 = zadny)
+                next    - index dalsiho sourozence (-1 = posledni)
+              Retezce jsou internovane (kazdy ulozen jednou). Uzel zabira 17 B misto
+              objektu se slovnikem/n-ticemi. Zaznamy se pridavaji v post-orderu
+              (potomci pred rodicem), koren je posledni zaznam.
+
+              Uzly pro kontrolu a zapis XML zpristupnuji pohledy (FlatVar, FlatSend, ...),
+              ktere dedi z trid ast_nodes a maji stejne atributy (.var, .receiver, ...).
+              Pohled se vytvori az pri pristupu a nic si nepamatuje, SemChecker
+              a XmlWriter je zpracuji stejne jako puvodni uzly.
+
+              Pouziti:
+                  compiler = Sol25Compiler(get_flat_parser())  # parse() vraci FlatProgram
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import threading
+from array import array
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.parse_to_ast import Sol25Transformer
+
+# Druhy zaznamu
+PROGRAM, CLASS, METHOD, BLOCK, PARAM, ASSIGN, SEND, LITERAL, VAR = range(9)
+
+# Hodnoty literalu, ktere nejsou retezce (ulozene jako zaporne s2)
+_CONST_IDS = {None: -1, True: -2, False: -3}
+_CONST_VALUES = {-1: None, -2: True, -3: False}
+
+
+class FlatAst:
+    '''Pole s uzly a tabulka retezcu'''
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.s1 = array("i")
+        self.s2 = array("i")
+        self.first = array("i")
+        self.next = array("i")
+        self.strings = [] # ID -> retezec
+        self._string_ids = {} # retezec -> ID
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def intern(self, text):
+        '''ID retezce (novy retezec se prida do tabulky)'''
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+    def add(self, kind, s1=-1, s2=-1, children=()):
+        '''Pridani zaznamu, potomci uz musi byt pridani; vraci index'''
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.s1.append(s1)
+        self.s2.append(s2)
+        self.next.append(-1)
+        if children:
+            self.first.append(children[0])
+            nxt = self.next
+            prev = children[0]
+            for child in children[1:]:
+                nxt[prev] = child
+                prev = child
+        else:
+            self.first.append(-1)
+        return index
+
+    def children(self, index):
+        '''Indexy potomku uzlu'''
+        out = []
+        child = self.first[index]
+        nxt = self.next
+        while child != -1:
+            out.append(child)
+            child = nxt[child]
+        return out
+
+    def view(self, index):
+        '''Pohled na uzel (objekt s atributy jako uzly z ast_nodes)'''
+        return _VIEWS[self.kinds[index]](self, index)
+
+    def root(self):
+        '''Pohled na korenovy uzel ProgramNode'''
+        return self.view(len(self.kinds) - 1)
+
+    def nbytes(self):
+        '''Velikost poli s uzly v bajtech (bez tabulky retezcu)'''
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.s1, self.s2, self.first, self.next))
+
+
+# ---------------------
+# Pohledy na uzly
+
+class _View:
+    __slots__ = ()
+
+    def __init__(self, ast, index):
+        self._ast = ast
+        self._i = index
+
+    def _str1(self):
+        return self._ast.strings[self._ast.s1[self._i]]
+
+    def _views(self, indexes):
+        view = self._ast.view
+        return tuple(view(i) for i in indexes)
+
+class FlatProgram(_View, ProgramNode):
+    __slots__ = ("_ast", "_i")
+
+    @property
+    def classes(self):
+        return self._views(self._ast.children(self._i))
+
+    @property
+    def flat(self):
+        '''Podkladove FlatAst'''
+        return self._ast
+
+class FlatClass(_View, ClassNode):
+    __slots__ = ("_ast", "_i")
+    name = property(_View._str1)
+
+    @property
+    def parent(self):
+        return self._ast.strings[self._ast.s2[self._i]]
+
+    @property
+    def methods(self):
+        return self._views(self._ast.children(self._i))
+
+class FlatMethod(_View, MethodNode):
+    __slots__ = ("_ast", "_i")
+    selector = property(_View._str1)
+
+    @property
+    def block(self):
+        return self._ast.view(self._ast.first[self._i])
+
+class FlatBlock(_View, BlockNode):
+    __slots__ = ("_ast", "_i")
+
+    @property
+    def params(self):
+        # Prvnich s2 potomku jsou parametry (PARAM), za nimi prikazy
+        ast = self._ast
+        count = ast.s2[self._i]
+        strings = ast.strings
+        return tuple(strings[ast.s1[i]] for i in ast.children(self._i)[:count])
+
+    @property
+    def statements(self):
+        return self._views(self._ast.children(self._i)[self._ast.s2[self._i]:])
+
+class FlatAssign(_View, AssignNode):
+    __slots__ = ("_ast", "_i")
+    var = property(_View._str1)
+
+    @property
+    def expr(self):
+        return self._ast.view(self._ast.first[self._i])
+
+class FlatSend(_View, SendNode):
+    __slots__ = ("_ast", "_i")
+    selector = property(_View._str1)
+
+    @property
+    def receiver(self):
+        return self._ast.view(self._ast.first[self._i])
+
+    @property
+    def arguments(self):
+        return self._views(self._ast.children(self._i)[1:])
+
+class FlatLiteral(_View, LiteralNode):
+    __slots__ = ("_ast", "_i")
+    type = property(_View._str1)
+
+    @property
+    def value(self):
+        sid = self._ast.s2[self._i]
+        if sid < 0:
+            return _CONST_VALUES[sid]
+        return self._ast.strings[sid]
+
+class FlatVar(_View, VarNode):
+    __slots__ = ("_ast", "_i")
+    var = property(_View._str1)
+
+_VIEWS = {
+    PROGRAM: FlatProgram,
+    CLASS: FlatClass,
+    METHOD: FlatMethod,
+    BLOCK: FlatBlock,
+    ASSIGN: FlatAssign,
+    SEND: FlatSend,
+    LITERAL: FlatLiteral,
+    VAR: FlatVar,
+}
+
+
+# ---------------------
+# Stavba behem parsovani
+
+class FlatSol25Transformer(Sol25Transformer):
+    '''
+    Sol25Transformer, ktery vnitrni uzly zapisuje do FlatAst (vraci jejich indexy).
+    Listy (VarNode, LiteralNode) vytvari rodicovska trida jako objekty, do poli
+    se zapisi az jako potomek vnitrniho uzlu. Stav je pro kazde vlakno zvlast,
+    pred kazdym parsovanim se musi zavolat begin() (dela to FlatParser).
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self._state = threading.local()
+
+    def begin(self):
+        self._state.ast = FlatAst()
+
+    def _ref(self, node):
+        '''Index uzlu; list se teprve zapise'''
+        if type(node) is int:
+            return node
+        ast = self._state.ast
+        if type(node) is VarNode:
+            return ast.add(VAR, ast.intern(node.var))
+        value = node.value
+        s2 = _CONST_IDS[value] if value is None or value is True or value is False else ast.intern(value)
+        return ast.add(LITERAL, ast.intern(node.type), s2)
+
+    def _make_program(self, classes):
+        ast = self._state.ast
+        ast.add(PROGRAM, children=list(classes))
+        self._state.ast = None
+        return ast.root()
+
+    def _make_class(self, name, parent, methods):
+        ast = self._state.ast
+        return ast.add(CLASS, ast.intern(name), ast.intern(parent), list(methods))
+
+    def _make_method(self, selector, block):
+        ast = self._state.ast
+        return ast.add(METHOD, ast.intern(selector), children=[block])
+
+    def _make_block(self, params, statements):
+        ast = self._state.ast
+        children = [ast.add(PARAM, ast.intern(p)) for p in params]
+        children.extend(statements)
+        return ast.add(BLOCK, s2=len(params), children=children)
+
+    def _make_assign(self, var, expr):
+        ast = self._state.ast
+        expr = self._ref(expr)
+        return ast.add(ASSIGN, ast.intern(var), children=[expr])
+
+    def _make_send(self, receiver, selector, args):
+        children = [self._ref(receiver)]
+        children.extend(self._ref(a) for a in args)
+        ast = self._state.ast
+        return ast.add(SEND, ast.intern(selector), children=children)
+
+
+class FlatParser:
+    '''Obal Lark parseru s FlatSol25Transformer; parse() vraci FlatProgram'''
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.transformer = parser.options.transformer
+
+    def parse(self, text):
+        self.transformer.begin()
+        return self.parser.parse(text)
+
+    def lex(self, text):
+        return self.parser.lex(text)
+
+
+_flat_parser = None
+
+def get_flat_parser():
+    '''Sdileny parser stavejici ploche AST (vytvori se jen jednou)'''
+    global _flat_parser
+    if _flat_parser is None:
+        from src.grammar import create_parser
+        _flat_parser = FlatParser(create_parser(transformer=FlatSol25Transformer()))
+    return _flat_parser
+
+# Konec souboru flat_ast.py (EOF)
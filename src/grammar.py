@@ -4,7 +4,17 @@
     @author: Jakub Fukala (xfukal01)
 """
 
+import hashlib
+import os
+import stat
+import sys
+import threading
+
+import lark
 from lark import Lark
+from src.lexer import Sol25Lexer
+from src.parse_to_ast import Sol25Transformer
+from src.symbols import symbol_scope
 
 sol25_grammar = r"""
 // 0) Start pravidlo
@@ -45,7 +55,8 @@ multi_selector: (ID COLON)+
 // ---------------------
 // 5) Bloky podle 10-14
 
-BLOCK_PARAM_ID: /:(?!self|super|true|false|nil|class)[a-z_][a-zA-Z0-9_]*/
+// Jen hned za "[" nebo za jinym parametrem (rozhoduje src/lexer.py)
+BLOCK_PARAM_ID: /:[a-z_][a-zA-Z0-9_]*/
 
 block: "[" block_params? "|" block_stat? "]"
 
@@ -113,15 +124,17 @@ ASSIGN: ":="
 
 CID: /[A-Z][a-zA-Z0-9_]*/
 
-ID: /(?!class|nil|true|false|self|super)[a-z_][a-zA-Z0-9_]*/
+// Klicove slovo je jen cele jmeno ("classify" je ID), viz src/lexer.py
+ID: /[a-z_][a-zA-Z0-9_]*/
 
-INT: /[+\-]?\d+/
+INT: /[+\-]?[0-9]+/
 
 STRING: /'(\\[ntr'\\]|[^'\\\n])*'/
 
 
-// Comments
-%ignore /"[^"]*"/
+// Comments (pojmenovany terminal => lexer_callbacks, viz collect_comments)
+COMMENT: /"[^"]*"/
+%ignore COMMENT
 
 // Whitespace
 %import common.WS
@@ -129,7 +142,110 @@ STRING: /'(\\[ntr'\\]|[^'\\\n])*'/
 
 """
 
-def create_parser():
-    return Lark(sol25_grammar, start='start', parser='lalr')
+# Hash gramatiky => klic pro cache s predpocitanymi LALR tabulkami
+GRAMMAR_HASH = hashlib.sha256(sol25_grammar.encode("utf-8")).hexdigest()
+
+_parser = None # Sdilena instance parseru v ramci procesu
+
+# Komentare zachycene lexerem; parser je sdileny mezi vlakny => seznam pro kazde vlakno
+_comment_state = threading.local()
+
+
+def _collect_comment(token):
+    '''Callback lexeru pro COMMENT (vola se i pro ignorovane terminaly)'''
+    comments = getattr(_comment_state, "comments", None)
+    if comments is not None:
+        comments.append(token)
+    return token
+
+def collect_comments(parse, text):
+    '''
+    Zavola parse(text) a vrati (vysledek, komentare). Komentare jsou tokeny
+    COMMENT (vcetne uvozovek, s .line a .column) v poradi ve zdrojovem kodu,
+    zachycene behem jedineho pruchodu lexeru.
+    '''
+    comments = []
+    _comment_state.comments = comments
+    try:
+        return parse(text), comments
+    finally:
+        _comment_state.comments = None
+
+
+class Sol25Lark(Lark):
+    '''Lark, ktery kazde parsovani provede s vlastni tabulkou symbolu (src/symbols.py)'''
+
+    def parse(self, text, start=None, on_error=None):
+        with symbol_scope():
+            return super().parse(text, start, on_error)
+
+
+def parser_cache_dir():
+    '''Adresar cache tabulek: SOL25_CACHE_DIR, jinak $XDG_CACHE_HOME/sol25 nebo ~/.cache/sol25'''
+    cache_dir = os.environ.get("SOL25_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sol25")
+
+def _private(info):
+    '''Patri soubor/adresar aktualnimu uzivateli a nemuze do nej zapisovat nikdo jiny?'''
+    if not hasattr(os, "getuid"): # Windows - vlastnika takto overit nelze
+        return True
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+def parser_cache_path():
+    '''
+    Cesta k souboru s LALR tabulkami, nebo None (cache se nepouzije).
+    Cache je pickle, nacteni ciziho souboru by spustilo cizi kod. Pouzije se
+    proto jen adresar a soubor aktualniho uzivatele, do kterych nikdo jiny
+    nemuze zapisovat (symbolicky odkaz misto souboru se odmitne).
+    '''
+    cache_dir = parser_cache_dir()
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if not _private(os.stat(cache_dir)):
+            return None
+        name = "sol25_lalr_%s_%s_py%d%d.cache" % (GRAMMAR_HASH[:16], lark.__version__, *sys.version_info[:2])
+        path = os.path.join(cache_dir, name)
+        try:
+            info = os.lstat(path)
+        except FileNotFoundError:
+            return path
+        if stat.S_ISREG(info.st_mode) and _private(info):
+            return path
+    except OSError:
+        pass
+    return None
+
+def create_parser(cache=True, transformer=None):
+    '''
+    Vytvoreni LALR parseru. Tabulky se nacitaji z cache na disku,
+    pri zmene gramatiky (jiny hash) se automaticky pregeneruji.
+    Se zadanym `transformer` vraci parse() rovnou vysledek transformace
+    (callbacky se volaji behem redukci, lark.Tree se vubec nevytvari).
+    Komentare lze behem parsovani zachytit pres collect_comments().
+    Jmena v AST jsou internovana v tabulce, kterou ma kazde parsovani vlastni.
+    Tokeny vyrabi rucne psany lexer (src/lexer.py), terminaly gramatiky
+    urcuji jen jejich typy.
+    '''
+    options = {
+        "start": "start",
+        "parser": "lalr",
+        "lexer": Sol25Lexer,
+        "transformer": transformer,
+        "lexer_callbacks": {"COMMENT": _collect_comment},
+    }
+    cache_path = parser_cache_path() if cache else None
+    if cache_path:
+        options["cache"] = cache_path
+    return Sol25Lark(sol25_grammar, **options)
+
+def get_parser():
+    '''Vraci sdilenou instanci parseru, ktery rovnou stavi AST (vytvori se jen jednou)'''
+    global _parser
+    if _parser is None:
+        _parser = create_parser(transformer=Sol25Transformer())
+    return _parser
 
 # Konec souboru grammar.py (EOF)
\ No newline at end of file
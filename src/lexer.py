@@ -0,0 +1,175 @@
+"""
+    @file: lexer.py
+    @brief: Rucne psany lexer SOL25 (konecny automat) pro Lark LALR parser
+    @details: Lexer projde vstup jednou zleva doprava. Prvni znak tokenu urci stav
+              automatu (tabulka _START), ve stavu se pak precte cely beh znaku
+              jedne tridy (jmeno, cislice, bile znaky) jednoduchym vzorem bez
+              lookaheadu. Klicova slova se rozpoznaji az po precteni celeho jmena
+              vyhledanim v tabulce, `classify` nebo `nilCount` jsou tedy obycejna ID.
+              Escape sekvence v retezcich se kontroluji primo pri cteni.
+
+              BLOCK_PARAM_ID (":x") muze byt jen v hlavicce bloku, tedy hned
+              za "[" nebo za jinym parametrem; jinde je ":" vzdy COLON.
+              ":=" je ASSIGN, jen kde parser prijima COLON a ne ASSIGN (napr.
+              `x foo:= 1`), je to COLON a "=" pak nepasuje (chyba 21) - stejne
+              jako u kontextoveho lexeru Larku.
+
+              Tokeny jsou lark.Token se stejnymi typy jako terminaly v grammar.py
+              (vcetne pozice, radku a sloupce), komentare jdou do lexer_callbacks
+              (COMMENT), nepasujici znak vyvola UnexpectedCharacters (chyba 21).
+              Parser ho pouziva pres create_parser(lexer=Sol25Lexer).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import re
+
+from lark import Token
+from lark.exceptions import UnexpectedCharacters
+from lark.lexer import Lexer
+
+# Stavy automatu podle prvniho znaku tokenu
+_NAME, _CLASS_NAME, _DIGIT, _SIGN, _STRING, _COMMENT, _COLON, _PUNCT = range(8)
+
+_START = {}
+for _c in "abcdefghijklmnopqrstuvwxyz_":
+    _START[_c] = _NAME
+for _c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    _START[_c] = _CLASS_NAME
+for _c in "0123456789":
+    _START[_c] = _DIGIT
+for _c in "+-":
+    _START[_c] = _SIGN
+for _c in "{}[]|.()":
+    _START[_c] = _PUNCT
+_START["'"] = _STRING
+_START['"'] = _COMMENT
+_START[":"] = _COLON
+
+# Behy znaku jedne tridy
+_spaces = re.compile(r"[ \t\f\r\n]*").match
+_name_tail = re.compile(r"[a-zA-Z0-9_]*").match
+_digits = re.compile(r"[0-9]*").match
+_string_plain = re.compile(r"[^'\\\n]*").match
+
+_DIGIT_CHARS = frozenset("0123456789")
+_NAME_START = frozenset("abcdefghijklmnopqrstuvwxyz_")
+_ESCAPES = frozenset("ntr'\\")
+
+
+class Sol25Lexer(Lexer):
+    '''Lexer pro Lark (lexer=Sol25Lexer); typy tokenu se berou z terminalu gramatiky'''
+    __future_interface__ = True # lex(lexer_state, parser_state)
+
+    def __init__(self, lexer_conf):
+        # Retezcove terminaly (klicova slova, oddelovace) -> jmeno terminalu
+        self.fixed = {t.pattern.value: t.name for t in lexer_conf.terminals if t.pattern.type == "str"}
+        self.comment_callback = lexer_conf.callbacks.get("COMMENT")
+        self.param_after = {self.fixed["["], "BLOCK_PARAM_ID"}
+        self.colon = self.fixed[":"]
+        self.assign = self.fixed[":="]
+
+    def lex(self, lexer_state, parser_state):
+        text = lexer_state.text
+        end = len(text)
+        fixed = self.fixed
+        start_state = _START.get
+        pos = 0
+        line = 1
+        line_start = 0 # pozice zacatku aktualniho radku
+        prev = None # typ predchoziho tokenu
+
+        while True:
+            stop = _spaces(text, pos).end()
+            if stop != pos:
+                newlines = text.count("\n", pos, stop)
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind("\n", pos, stop) + 1
+                pos = stop
+            if pos >= end:
+                return
+
+            state = start_state(text[pos])
+            if state == _NAME:
+                stop = _name_tail(text, pos + 1).end()
+                value = text[pos:stop]
+                token_type = fixed.get(value, "ID") # klicove slovo jen jako cele jmeno
+            elif state == _CLASS_NAME:
+                stop = _name_tail(text, pos + 1).end()
+                value = text[pos:stop]
+                token_type = "CID"
+            elif state == _DIGIT:
+                stop = _digits(text, pos + 1).end()
+                value = text[pos:stop]
+                token_type = "INT"
+            elif state == _PUNCT:
+                stop = pos + 1
+                value = text[pos]
+                token_type = fixed[value]
+            elif state == _COLON:
+                stop = pos + 1
+                token_type = fixed[":"]
+                following = text[stop:stop + 1]
+                if following == "=":
+                    if not self._colon_only(parser_state):
+                        stop += 1
+                        token_type = self.assign
+                elif prev in self.param_after and following in _NAME_START:
+                    name_end = _name_tail(text, stop + 1).end()
+                    if text[stop:name_end] not in fixed: # ":nil" je COLON a NIL
+                        stop = name_end
+                        token_type = "BLOCK_PARAM_ID"
+                value = text[pos:stop]
+            elif state == _STRING:
+                stop = self._string_end(text, pos, line, line_start, parser_state)
+                value = text[pos:stop]
+                token_type = "STRING"
+            elif state == _SIGN and text[pos + 1:pos + 2] in _DIGIT_CHARS:
+                stop = _digits(text, pos + 2).end()
+                value = text[pos:stop]
+                token_type = "INT"
+            elif state == _COMMENT:
+                stop = text.find('"', pos + 1) + 1
+                if not stop:
+                    self._error(text, pos, line, line_start, parser_state)
+                value = text[pos:stop]
+                if self.comment_callback is not None:
+                    self.comment_callback(Token("COMMENT", value, pos, line, pos - line_start + 1))
+                newlines = value.count("\n")
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind("\n", pos, stop) + 1
+                pos = stop
+                continue
+            else:
+                self._error(text, pos, line, line_start, parser_state)
+
+            yield Token(token_type, value, pos, line, pos - line_start + 1, line, stop - line_start + 1, stop)
+            prev = token_type
+            pos = stop
+
+    def _colon_only(self, parser_state):
+        '''Prijima parser v aktualnim stavu COLON, ale ne ASSIGN? (bez parseru ne)'''
+        if parser_state is None:
+            return False
+        accepted = parser_state.parse_conf.states[parser_state.position]
+        return self.colon in accepted and self.assign not in accepted
+
+    def _string_end(self, text, pos, line, line_start, parser_state):
+        '''Konec retezce zacinajiciho na `pos` (za uzaviraci uvozovkou), kontroluje escape sekvence'''
+        i = pos + 1
+        while True:
+            i = _string_plain(text, i).end()
+            char = text[i:i + 1]
+            if char == "'":
+                return i + 1
+            if char == "\\" and text[i + 1:i + 2] in _ESCAPES:
+                i += 2
+                continue
+            # Neplatna escape sekvence => chyba na ni, konec radku / vstupu => na zacatku retezce
+            self._error(text, i if char == "\\" else pos, line, line_start, parser_state)
+
+    def _error(self, text, pos, line, line_start, parser_state):
+        raise UnexpectedCharacters(text, pos, line, pos - line_start + 1, state=parser_state)
+
+# Konec souboru lexer.py (EOF)
@@ -0,0 +1,220 @@
+"""
+    @file: optimizer.py
+    @brief: Skladani konstant - zpravy s vysledkem znamym uz pri prekladu (parse.py --fold)
+    @details: Pruchod po SemChecker.check() a pred zapisem XML. AST se postavi znovu
+              zdola nahoru (navstevnik nad walk() ze src/visitor.py) a zpravy
+              vestavenym tridam se nahradi literalem:
+                - Integer literal  plus: / minus: / multiplyBy: Integer literal
+                - Integer literal  divBy: kladny Integer literal (jen nezaporny delenec,
+                  kde se deleni s oriznutim a zaokrouhlenim dolu shoduje)
+                - Integer literal  equalTo: / greaterThan: Integer literal => true / false
+                - Integer literal  asString => String literal
+                - Integer from: Integer literal => Integer literal
+                - [ | ] value => nil
+                - [ | x := literal. ] value => literal, pokud x neni parametr metody
+                  a v cele metode se prirazuje jen zde (promenna bloku neni videt)
+              Vysledek celociselne operace musi byt v 64bitovem rozsahu (jinak by
+              se mohlo lisit preteceni v interpretu). Pokud program definuje
+              vlastni tridu Integer nebo Block, prislusna pravidla se nepouziji.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.visitor import Visitor, walk
+
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+_ARITHMETIC = {
+    "plus:": lambda a, b: a + b,
+    "minus:": lambda a, b: a - b,
+    "multiplyBy:": lambda a, b: a * b,
+}
+_COMPARISON = {
+    "equalTo:": lambda a, b: a == b,
+    "greaterThan:": lambda a, b: a > b,
+}
+
+
+class FoldReport:
+    '''Vysledek skladani konstant'''
+    def __init__(self):
+        self.folded = 0 # pocet nahrazenych zprav
+        self.removed = 0 # pocet odstranenych uzlu
+
+    def __str__(self):
+        return f"{self.folded} send(s) folded, {self.removed} node(s) removed"
+
+
+def count_nodes(node):
+    '''Pocet uzlu podstromu (iterativne)'''
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        kind = node.kind
+        if kind is SendNode:
+            stack.append(node.receiver)
+            stack.extend(node.arguments)
+        elif kind is AssignNode:
+            stack.append(node.expr)
+        elif kind is BlockNode:
+            stack.extend(node.statements)
+        elif kind is MethodNode:
+            stack.append(node.block)
+        elif kind is ClassNode:
+            stack.extend(node.methods)
+        elif kind is ProgramNode:
+            stack.extend(node.classes)
+    return count
+
+def _int_value(node):
+    '''Hodnota Integer literalu, jinak None'''
+    if node.kind is LiteralNode and node.type == "Integer":
+        return int(node.value)
+    return None
+
+def _int_literal(value):
+    if INT_MIN <= value <= INT_MAX:
+        return LiteralNode("Integer", str(value))
+    return None
+
+def _bool_literal(value):
+    return LiteralNode("True", True) if value else LiteralNode("False", False)
+
+
+class FoldVisitor(Visitor):
+    '''
+    Stavba noveho AST pri opousteni uzlu: potomci jsou na zasobniku `values`
+    v poradi pruchodu, rodic je z nej vezme a vlozi sebe (pripadne slozeny literal).
+    '''
+
+    def __init__(self, user_classes):
+        self.fold_integers = "Integer" not in user_classes
+        self.fold_blocks = "Block" not in user_classes
+        self.values = []
+        self.method = None # aktualni metoda (puvodni uzel)
+        self.report = FoldReport()
+
+    def _take(self, count):
+        values = self.values
+        if not count:
+            return ()
+        taken = tuple(values[-count:])
+        del values[-count:]
+        return taken
+
+    def enter_MethodNode(self, node, role, index):
+        self.method = node
+
+    def leave_ProgramNode(self, node, role, index):
+        self.values.append(ProgramNode(self._take(len(node.classes))))
+
+    def leave_ClassNode(self, node, role, index):
+        self.values.append(ClassNode(node.name, node.parent, self._take(len(node.methods))))
+
+    def leave_MethodNode(self, node, role, index):
+        self.values.append(MethodNode(node.selector, self.values.pop()))
+
+    def leave_BlockNode(self, node, role, index):
+        self.values.append(BlockNode(node.params, self._take(len(node.statements))))
+
+    def leave_AssignNode(self, node, role, index):
+        self.values.append(AssignNode(node.var, self.values.pop()))
+
+    def leave_SendNode(self, node, role, index):
+        args = self._take(len(node.arguments))
+        receiver = self.values.pop()
+        send = SendNode(receiver, node.selector, args)
+        folded = self._fold(send)
+        if folded is None:
+            self.values.append(send)
+            return
+        self.report.folded += 1
+        self.report.removed += count_nodes(send) - count_nodes(folded)
+        self.values.append(folded)
+
+    def leave_LiteralNode(self, node, role, index):
+        self.values.append(node)
+
+    leave_VarNode = leave_LiteralNode
+
+    def _fold(self, send):
+        '''Literal s vysledkem zpravy `send` (potomci uz jsou slozeni), jinak None'''
+        receiver = send.receiver
+        selector = send.selector
+        args = send.arguments
+        if self.fold_integers:
+            value = _int_value(receiver)
+            if value is not None:
+                if not args:
+                    return LiteralNode("String", str(value)) if selector == "asString" else None
+                arg = _int_value(args[0])
+                if arg is None:
+                    return None
+                if selector in _ARITHMETIC:
+                    return _int_literal(_ARITHMETIC[selector](value, arg))
+                if selector in _COMPARISON:
+                    return _bool_literal(_COMPARISON[selector](value, arg))
+                if selector == "divBy:" and value >= 0 and arg > 0:
+                    return _int_literal(value // arg)
+                return None
+            if (selector == "from:" and receiver.kind is LiteralNode and receiver.type == "class"
+                    and receiver.value == "Integer" and _int_value(args[0]) is not None):
+                return args[0]
+        if self.fold_blocks and selector == "value" and receiver.kind is BlockNode and not receiver.params:
+            return self._fold_block(receiver)
+        return None
+
+    def _fold_block(self, block):
+        '''Vysledek bloku bez parametru, pokud je konstantni a blok nema viditelne ucinky'''
+        statements = block.statements
+        if not statements:
+            return LiteralNode("Nil", None)
+        if len(statements) != 1:
+            return None
+        statement = statements[0]
+        if statement.expr.kind is not LiteralNode or statement.expr.type == "class":
+            return None
+        if statement.var in self.method.block.params or _assignments(self.method, statement.var) != 1:
+            return None
+        return statement.expr
+
+
+def _assignments(method, name):
+    '''Pocet prirazeni do promenne `name` v cele metode (vcetne vnorenych bloku)'''
+    count = 0
+    stack = [method.block]
+    while stack:
+        node = stack.pop()
+        kind = node.kind
+        if kind is BlockNode:
+            if name in node.params:
+                count += 1
+            stack.extend(node.statements)
+        elif kind is AssignNode:
+            if node.var == name:
+                count += 1
+            stack.append(node.expr)
+        elif kind is SendNode:
+            stack.append(node.receiver)
+            stack.extend(node.arguments)
+    return count
+
+def fold_constants(ast_root):
+    '''Skladani konstant, vraci (nove AST, FoldReport); vstupni AST se nemeni'''
+    visitor = FoldVisitor({c.name for c in ast_root.classes})
+    walk(ast_root, (visitor,))
+    return visitor.values.pop(), visitor.report
+
+# Konec souboru optimizer.py (EOF)
@@ -0,0 +1,83 @@
+"""
+    @file: parallel_check.py
+    @brief: Kontrola tel metod po tridach ve vice procesech (SemChecker(jobs=N))
+    @details: Globalni pohled na tridy (index trid, tabulky metod, rodice) sestavi
+              SemChecker v hlavnim procesu. Procesy ho dostanou pri startu
+              (initializer) a dal ho jen ctou. Pool se vzdy vytvari s metodou
+              "fork", checker ani AST se tedy neserializuji (pickle hlubokeho
+              AST by skoncil RecursionError, spawn/forkserver je od Pythonu 3.14
+              vychozi). Kde fork neni k dispozici (Windows), kontroluje se
+              v jednom procesu.
+              Tridy se rozdeli na souvisle useky, kazdy proces vraci chyby sveho
+              useku. Useky se spoji v poradi trid, takze prvni chyba (a tedy
+              navratovy kod) je stejna jako pri kontrole v jednom procesu;
+              bez `collect` vraci usek nejvyse jednu chybu.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import multiprocessing
+
+from src.errors import Sol25Error
+
+CHUNKS_PER_JOB = 4 # Vice useku nez procesu => vyrovnani ruzne velkych trid
+
+_checker = None # SemChecker s globalnim pohledem na tridy (v procesu workeru)
+
+
+def _init_worker(checker):
+    global _checker
+    _checker = checker
+
+def _check_range(bounds):
+    '''Kontrola trid ast_root.classes[start:end], vraci seznam chyb'''
+    start, end = bounds
+    checker = _checker
+    checker.errors = []
+    try:
+        for c in checker.ast_root.classes[start:end]:
+            checker._check_class(c)
+    except Sol25Error as e: # bez `collect` => prvni chyba useku
+        return [e]
+    return checker.errors
+
+def class_ranges(count, jobs):
+    '''Rozdeleni `count` trid na souvisle useky (start, end)'''
+    chunks = max(1, min(count, jobs * CHUNKS_PER_JOB))
+    size, extra = divmod(count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (i < extra)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def _fork_context():
+    '''Kontext multiprocessing s metodou fork, None pokud ji platforma nema'''
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+def check_classes_parallel(checker, jobs):
+    '''
+    Nahrada SemChecker._check_all_classes: tridy se kontroluji v `jobs` procesech.
+    Chyby se hlasi pres checker._report v poradi trid.
+    '''
+    ranges = class_ranges(len(checker.ast_root.classes), jobs)
+    context = _fork_context()
+    if len(ranges) <= 1 or context is None:
+        checker._check_all_classes()
+        return
+
+    with context.Pool(min(jobs, len(ranges)), initializer=_init_worker, initargs=(checker,)) as pool:
+        results = pool.map(_check_range, ranges, chunksize=1)
+
+    for errors in results:
+        for error in errors:
+            # Umisteni uz nastavil worker
+            if not checker.collect:
+                raise error
+            checker.errors.append(error)
+
+# Konec souboru parallel_check.py (EOF)
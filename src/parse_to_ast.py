@@ -2,6 +2,12 @@
     @file parse_to_ast.py
     @brief Soubor pro transformaci AST stromu pomocí Lark
     @details Třída Sol25Transformer je potomek třídy Transformer z Lark.
+             Vnitrni uzly se vytvari pres atributy _make_* (vychozi jsou tridy
+             z ast_nodes), potomek je muze nahradit jinou reprezentaci AST
+             (viz src/flat_ast.py). Listy (VarNode, LiteralNode) jsou vzdy objekty.
+             Jmena a selektory se internuji v tabulce symbolu aktualniho
+             parsovani (src/symbols.py), selektory se skladaji z internovanych
+             casti bez opakovaneho spojovani.
     @author Jakub Fukala (xfukal01)
 """
 
@@ -16,20 +22,41 @@ from src.ast_nodes import (
     LiteralNode,
     VarNode,
 )
-
-import sys
+from src.errors import LexicalError
+from src.symbols import SymbolTable, current_symbols
 
 @v_args(inline=True)
 class Sol25Transformer(Transformer):
     """Tranformer pro stavbu AST stromu"""
 
+    # Tovarny vnitrnich uzlu
+    _make_program = ProgramNode
+    _make_class = ClassNode
+    _make_method = MethodNode
+    _make_block = BlockNode
+    _make_assign = AssignNode
+    _make_send = SendNode
+    @property
+    def _symbols(self):
+        '''
+        Tabulka symbolu pro jmena a selektory - tabulka parsovani (otevre ji
+        grammar.Sol25Lark), mimo symbol_scope (samostatne transform) vlastni
+        tabulka transformeru
+        '''
+        table = current_symbols()
+        if table is None:
+            table = self.__dict__.get("_own_symbols")
+            if table is None:
+                table = self._own_symbols = SymbolTable()
+        return table
+
     def start(self, program_node):
         # start: program
         return program_node
 
     def program(self, *class_defs):
         # program: class_def*5
-        return ProgramNode(list(class_defs))
+        return self._make_program(class_defs)
     
     def class_def(self, cname, pname, *methods):
         # class_def: "class" CID ":" CID "{" method* "}"
@@ -38,11 +65,11 @@ class Sol25Transformer(Transformer):
         if isinstance(pname, LiteralNode) and pname.type == "class":
             pname = pname.value
             
-        return ClassNode(str(cname), str(pname), list(methods))
+        return self._make_class(self._symbols.intern(cname), self._symbols.intern(pname), methods)
     
     def method(self, selector, block):
         # method: selector block
-        return MethodNode(selector, block)
+        return self._make_method(selector, block)
     
     def single_selector(self, token):
         # single_selector: ID
@@ -50,21 +77,22 @@ class Sol25Transformer(Transformer):
         if isinstance(token, VarNode):
             return token.var
         else:
-            return str(token)
+            return self._symbols.intern(token)
         
     def multi_selector(self, *parts):
         # multi_selector: (ID COLON)+
         # parts = [ID, COLON, ID, COLON, ...]
-        sel = ""
+        keyword = self._symbols.keyword
+        sel_parts = []
         i = 0
         while i < len(parts):
             node = parts[i]
             if isinstance(node, VarNode):
-                sel += node.var + ":"
+                sel_parts.append(keyword(node.var))
             else:
-                sel += str(node) + ":"
+                sel_parts.append(keyword(str(node)))
             i += 2  # posun o 2 => ID, COLON
-        return sel
+        return self._symbols.join(tuple(sel_parts))
 
     def selector(self, child):
        # selector: single_selector | multi_selector
@@ -81,29 +109,29 @@ class Sol25Transformer(Transformer):
         """
         if len(children) == 0:
             # prázdný block => [|]
-            return BlockNode(params=[], statements=[])
+            return self._make_block([], [])
 
         elif len(children) == 1:
             # buď jen parametry NEBO jen statementy
             single = children[0]
             if not single:
                 # je to prázdný list => [|]
-                return BlockNode([], [])
+                return self._make_block([], [])
             # Rozlišíme, zda v single jsou parametry nebo statementy
             if single and isinstance(single[0], str):
                 # => parametry
-                return BlockNode(params=single, statements=[])
+                return self._make_block(single, [])
             else:
                 # => statementy
-                return BlockNode(params=[], statements=single)
+                return self._make_block([], single)
 
         elif len(children) == 2:
             # (param-list, statement-list)
             params_list, stat_list = children
-            return BlockNode(params=params_list, statements=stat_list)
+            return self._make_block(params_list, stat_list)
 
         else:
-            return BlockNode([], [])
+            return self._make_block([], [])
     
     def block_params(self, *params):
         # block_params: (BLOCK_PARAM_ID)*
@@ -113,7 +141,7 @@ class Sol25Transformer(Transformer):
             if isinstance(p, VarNode):
                 out.append(p.var)
             else:
-                out.append(str(p)[:1]) # zahodit dvojtečku
+                out.append(self._symbols.intern(str(p)[:1])) # zahodit dvojtečku
         return out
     
     def block_stat(self, *statements):
@@ -130,8 +158,8 @@ class Sol25Transformer(Transformer):
         if isinstance(var, VarNode):
             var = var.var
         else:
-            var = str(var)
-        return AssignNode(var, expr)
+            var = self._symbols.intern(var)
+        return self._make_assign(var, expr)
     
     def expr(self, expr):
         # expr: send_expr
@@ -153,7 +181,7 @@ class Sol25Transformer(Transformer):
         # Pokud je jen jedna zpráva, vrátíme SendNode
         if len(messages) == 1:
             sel, args = messages[0]
-            return SendNode(primary, sel, args)
+            return self._make_send(primary, sel, args)
 
         # Pokud je více zpráv, spojíme je do jedné
         selector_parts = []
@@ -163,8 +191,8 @@ class Sol25Transformer(Transformer):
             selector_parts.append(sel)
             full_args.extend(args)
         
-        full_selector = "".join(selector_parts)
-        return SendNode(primary, full_selector, full_args)
+        full_selector = self._symbols.join(tuple(selector_parts))
+        return self._make_send(primary, full_selector, full_args)
 
     def msg_send(self, child):
         # msg_send: paramless_send | keyword_send
@@ -176,10 +204,11 @@ class Sol25Transformer(Transformer):
         if isinstance(selector, VarNode):
               return (selector.var, [])
         else:
-            return (str(selector), [])
+            return (self._symbols.intern(selector), [])
 
     def keyword_send(self, *tokens):
         # keyword_send: (ID COLON arg_expr)+
+        keyword = self._symbols.keyword
         sel_parts = []
         args = []
         i = 0
@@ -194,13 +223,13 @@ class Sol25Transformer(Transformer):
             # s je typicky VarNode("from") nebo "from"
             # e je výraz
             if isinstance(s, VarNode):
-                sel_parts.append(s.var + ":")
+                sel_parts.append(keyword(s.var))
             else:
-                sel_parts.append(str(s) + ":")
+                sel_parts.append(keyword(str(s)))
 
             args.append(e)
 
-        selector = "".join(sel_parts)
+        selector = self._symbols.join(tuple(sel_parts))
         return (selector, args)
 
     def primary(self, child):
@@ -215,8 +244,7 @@ class Sol25Transformer(Transformer):
         raw = token.value
         val = raw[1:-1] # Remove quotes
         if val == "\\n":  # Pokud je to pouze \n, je to neplatné
-            print("Invalid string: '\\n'", file=sys.stderr)
-            sys.exit(21)
+            raise LexicalError("Invalid string: '\\n'")
         return LiteralNode("String", val)
     
     def NIL(self, _):
@@ -229,18 +257,18 @@ class Sol25Transformer(Transformer):
         return LiteralNode("False", False)
     
     def SELF(self, _):
-        return VarNode("self")
+        return VarNode(self._symbols.intern("self"))
     
     def SUPER(self, _):
-        return VarNode("super")
+        return VarNode(self._symbols.intern("super"))
     
     def ID(self, token):
         # proměnná
-        return VarNode(token.value)
+        return VarNode(self._symbols.intern(token.value))
     
     def CID(self, token):
         # třída
-        return LiteralNode("class", token.value)
+        return LiteralNode("class", self._symbols.intern(token.value))
     
     def BLOCK_PARAM_ID(self, token):
         return token.value[1:] # Zahodit dvojtečku
@@ -0,0 +1,192 @@
+"""
+    @file: parsy_parser.py
+    @brief: Parser SOL25 z parserovych kombinatoru knihovny parsy - backend "parsy"
+    @details: Kombinatory pracuji nad tokeny z rd_parser.tokenize (polozka
+              = (druh, text, pozice, parametr)), AST i chybove kody jsou stejne
+              jako u ostatnich backendu. Chyba se hlasi na nejvzdalenejsim tokenu,
+              kde zadna alternativa neuspela; kod 21/22 urcuje Tokens.fail.
+              Kombinatory jsou rekurzivni (kazda uroven zavorek, bloku nebo
+              argumentu stoji 20-50 ramcu Pythonu). Parsovani proto bezi ve vlakne
+              se zasobnikem PARSE_STACK_SIZE (1 GiB, stranky se alokuji az pri
+              pouziti). Limit rekurze je spolecny pro cely proces, modul ho
+              nemeni: hloubku vnoreni urcuje sys.getrecursionlimit() (s vychozim
+              limitem 1000 asi 20-50 urovni). Aplikace ho muze zvysit nejvyse
+              na RECURSION_LIMIT, ktery zasobniku vlakna odpovida (parse.py to
+              dela pro --parser parsy); pak parsy zvladne vnoreni jako ostatni
+              backendy (10^5 zavorek). Po vycerpani limitu vraci chybu 99.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import threading
+
+from parsy import ParseError, forward_declaration, peek, seq, test_item
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.errors import LexicalError, Sol25Error
+from src.symbols import current_symbols, symbol_scope
+from src.rd_parser import (
+    ID, CID, INT, STRING, NIL, TRUE, FALSE, SELF, SUPER, CLASS,
+    COLON, ASSIGN, LBRACE, RBRACE, LBRACK, RBRACK, PIPE, DOT, LPAREN, RPAREN, END,
+    RDParser,
+    tokenize,
+)
+
+
+PARSE_STACK_SIZE = 1024 ** 3 # zasobnik vlakna parseru (stranky se alokuji az pri pouziti)
+BYTES_PER_FRAME = 400 # rezerva C zasobniku na ramec kombinatoru (namereno 150-330 B)
+RECURSION_LIMIT = PARSE_STACK_SIZE // BYTES_PER_FRAME # nejvyssi bezpecny limit rekurze pro parsy
+
+_stack_lock = threading.Lock() # velikost zasobniku novych vlaken je globalni
+
+
+def _token(kind, description):
+    return test_item(lambda item: item[0] == kind, description)
+
+def _string(item):
+    text = item[1][1:-1]
+    if text == "\\n": # stejne jako Sol25Transformer.STRING
+        raise LexicalError("Invalid string: '\\n'")
+    return LiteralNode("String", text)
+
+def _send(receiver, messages):
+    '''Zpravy za jednim prijemcem se spoji do jednoho selektoru (jako Sol25Transformer.send_expr)'''
+    if not messages:
+        return receiver
+    selector = current_symbols().join(tuple(sel for sel, _ in messages))
+    return SendNode(receiver, selector, [arg for _, args in messages for arg in args])
+
+def _keyword_selector(tokens):
+    '''Selektor klicove zpravy z tokenu ID jejich casti'''
+    symbols = current_symbols()
+    return symbols.join(tuple(symbols.keyword(t[1]) for t in tokens))
+
+def _build():
+    '''Sestaveni kombinatoru, vraci parser programu'''
+    ident = _token(ID, "ID")
+    colon = _token(COLON, "COLON")
+
+    expr = forward_declaration()
+    block = forward_declaration()
+
+    primary = (
+        ident.map(lambda t: VarNode(t[1]))
+        | _token(INT, "INT").map(lambda t: LiteralNode("Integer", t[1]))
+        | _token(STRING, "STRING").map(_string)
+        | _token(CID, "CID").map(lambda t: LiteralNode("class", t[1]))
+        | _token(NIL, "NIL").map(lambda _: LiteralNode("Nil", None))
+        | _token(TRUE, "TRUE").map(lambda _: LiteralNode("True", True))
+        | _token(FALSE, "FALSE").map(lambda _: LiteralNode("False", False))
+        | _token(SELF, "SELF").map(lambda _: VarNode(current_symbols().intern("self")))
+        | _token(SUPER, "SUPER").map(lambda _: VarNode(current_symbols().intern("super")))
+        | block
+        | _token(LPAREN, "(") >> expr << _token(RPAREN, ")")
+    )
+
+    # Po argumentu klicove zpravy uz ID musi pokracovat ":" (Lark: shift/reduce => shift);
+    # at_least tu ID uz zkusilo, nejvzdalenejsi chyba je tedy az za nim
+    keyword_end = peek(ident).should_fail("no ID")
+    keyword_send = seq(ident << colon, primary).at_least(1).map(
+        lambda parts: (_keyword_selector(t for t, _ in parts), [arg for _, arg in parts])
+    ) << keyword_end
+    paramless_send = ident.map(lambda t: (t[1], []))
+    expr.become(seq(primary, (keyword_send | paramless_send).many()).combine(_send))
+
+    # ":" hned pred ID v hlavicce bloku = BLOCK_PARAM_ID (polozka nese prvni znak jmena)
+    param = test_item(lambda item: item[0] == COLON and item[3] is not None, "BLOCK_PARAM_ID")
+    statement = seq(ident << _token(ASSIGN, ":="), expr << _token(DOT, ".")).combine(
+        lambda var, value: AssignNode(var[1], value)
+    )
+    block.become(seq(
+        _token(LBRACK, "[") >> (param << ident).map(lambda t: t[3]).many() << _token(PIPE, "|"),
+        statement.many() << _token(RBRACK, "]"),
+    ).combine(BlockNode))
+
+    selector = (
+        (ident << colon).at_least(1).map(_keyword_selector)
+        | ident.map(lambda t: t[1])
+    )
+    method = seq(selector, block).combine(MethodNode)
+    class_def = seq(
+        _token(CLASS, "class") >> _token(CID, "CID").map(lambda t: t[1]),
+        colon >> _token(CID, "CID").map(lambda t: t[1]),
+        _token(LBRACE, "{") >> method.many() << _token(RBRACE, "}"),
+    ).combine(ClassNode)
+    return class_def.many().map(ProgramNode) << _token(END, "$END")
+
+_program = _build()
+
+
+class ParsyParser(RDParser):
+    '''Backend "parsy" - parse(text) vraci ProgramNode, lexer je spolecny s RDParser'''
+
+    def parse(self, text):
+        tokens = tokenize(text)
+        kinds = tokens.kinds
+        values = tokens.values
+        starts = tokens.starts
+        intern = tokens.symbols.intern
+        items = []
+        for i, kind in enumerate(kinds):
+            param = None
+            if kind == COLON and kinds[i + 1] == ID and starts[i + 1] == starts[i] + 1:
+                param = intern(values[i + 1][:1]) # jen prvni znak jako Sol25Transformer.block_params
+            items.append((kind, values[i], starts[i], param))
+        try:
+            return run_deep(_parse_items, items, tokens.symbols)
+        except ParseError as e:
+            tokens.fail(e.index, colon_ok="COLON" in e.expected)
+        except RecursionError:
+            raise Sol25Error("Program is nested too deeply for the parsy backend") from None
+
+
+
+def _parse_items(items, symbols):
+    '''Parsovani polozek (ve vlakne run_deep) s tabulkou symbolu lexeru'''
+    with symbol_scope(symbols):
+        return _program.parse(items)
+
+def run_deep(fn, *args):
+    '''
+    Zavola fn(*args) ve vlakne se zasobnikem PARSE_STACK_SIZE, vraci vysledek
+    nebo vyvola jeho vyjimku. Velikost zasobniku se nastavi jen na dobu
+    vytvoreni vlakna, limit rekurze se nemeni. Pokud platforma takove vlakno
+    nedovoli, zavola fn primo.
+    '''
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((True, fn(*args)))
+        except BaseException as e: # predava se do volajiciho vlakna
+            outcome.append((False, e))
+
+    thread = threading.Thread(target=run, name="sol25-parsy")
+    with _stack_lock:
+        try:
+            old_size = threading.stack_size(PARSE_STACK_SIZE)
+        except (ValueError, RuntimeError):
+            return fn(*args)
+        try:
+            thread.start()
+        except RuntimeError: # vlakno nelze vytvorit (napr. malo pameti)
+            thread = None
+        finally:
+            threading.stack_size(old_size)
+    if thread is None:
+        return fn(*args)
+    thread.join()
+    ok, value = outcome[0]
+    if ok:
+        return value
+    raise value
+
+# Konec souboru parsy_parser.py (EOF)
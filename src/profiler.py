@@ -0,0 +1,134 @@
+"""
+    @file: profiler.py
+    @brief: Profilovani prekladu (--profile) - cProfile + vzorkovani zasobniku
+    @details: Spusteni: python3.11 parse.py --profile <soubor> [--profile-phase faze] < vstup.sol
+              Vystupy:
+                <soubor>           - pstats (python3 -m pstats <soubor>, snakeviz, ...)
+                <soubor>.collapsed - "ramec;ramec;... pocet" pro flamegraph.pl / speedscope
+              Zasobniky se vzorkuji z vedlejsiho vlakna (sys._current_frames),
+              proto je flamegraph zavisly jen na case, ne na poctu volani.
+              Bez --profile-phase se profiluje cely preklad vcetne nacteni
+              prekladace a chyboveho konce, jinak jen zvolena faze.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import contextlib
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+
+from src.errors import Sol25Error
+
+PHASES = ("create_parser", "parse", "check", "xml")
+SAMPLE_INTERVAL = 0.001 # s
+
+
+def frame_name(code):
+    '''Nazev ramce pro collapsed stack: soubor:funkce'''
+    path = code.co_filename
+    if path.startswith(os.getcwd()):
+        path = os.path.relpath(path)
+    return f"{path}:{code.co_name}"
+
+
+class Profiler:
+    '''cProfile a vzorkovani zasobniku hlavniho vlakna; `only` => jen jedna faze'''
+
+    def __init__(self, only=None, interval=SAMPLE_INTERVAL):
+        self.only = only
+        self.interval = interval
+        self.profile = cProfile.Profile()
+        self.samples = Counter() # collapsed stack -> pocet vzorku
+        self._thread_id = threading.get_ident()
+        self._stop_event = None
+        self._sampler = None
+        self._switch_interval = None
+
+    def start(self):
+        # Kratsi prepinaci interval => vzorkovaci vlakno se dostane ke slovu
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        self._stop_event = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self._stop_event.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        '''Profilovani faze `name`, pokud je zvolena (--profile-phase)'''
+        if self.only != name:
+            yield
+            return
+        self.start()
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def _sample(self):
+        cache = {} # code -> nazev ramce
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                name = cache.get(code)
+                if name is None:
+                    name = cache[code] = frame_name(code)
+                stack.append(name)
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[";".join(stack)] += 1
+
+    def dump(self, path):
+        '''Zapis pstats do `path` a collapsed stacks do `path`.collapsed'''
+        self.profile.dump_stats(path)
+        with open(path + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def profile_compile(source_code, out, path, only=None, indent="    ", backend="lark"):
+    '''
+    Preklad s profilovanim, XML jde do `out` (parser `backend`, viz src/backends.py).
+    Profil se zapise i pri chybe.
+    Vraci (kod, chybove hlaseni, OSError pri zapisu profilu nebo None) - chyba
+    zapisu profilu nemeni vysledek prekladu, XML uz muze byt v `out`.
+    '''
+    profiler = Profiler(only)
+    if only is None:
+        profiler.start()
+    try:
+        from src.compiler import get_compiler, comment_description
+        with profiler.phase("create_parser"):
+            compiler = get_compiler(backend)
+        with profiler.phase("parse"):
+            ast_root, comments = compiler.parse_with_comments(source_code)
+        desc = comment_description(comments)
+        with profiler.phase("check"):
+            compiler.check(ast_root)
+        with profiler.phase("xml"):
+            compiler.write_xml(ast_root, out, desc, indent)
+        code, message = 0, ""
+    except Sol25Error as e:
+        code, message = e.code, str(e)
+    finally:
+        if only is None:
+            profiler.stop()
+
+    try:
+        profiler.dump(path)
+    except OSError as e:
+        return code, message, e
+    return code, message, None
+
+# Konec souboru profiler.py (EOF)
@@ -0,0 +1,371 @@
+"""
+    @file: rd_parser.py
+    @brief: Rucne psany parser SOL25 (rekurzivni sestup bez rekurze) - backend "rd"
+    @details: Vysledkem je stejne AST (ProgramNode) a stejne chybove kody jako
+              u Lark LALR parseru v grammar.py, vcetne jeho zvlastnosti:
+                - po argumentu klicove zpravy musi za ID nasledovat ":"
+                  (konflikt shift/reduce, Lark ho resi posunem)
+                - zpravy za jednim prijemcem se spoji do jednoho selektoru
+                - z parametru bloku zustava jen prvni znak (Sol25Transformer)
+
+              Lexer ma stejna pravidla jako src/lexer.py, ale cely vstup projde
+              jednim regularnim vyrazem (bile znaky jsou jeho prefixem), klicova
+              slova urci tabulka po precteni celeho jmena. Na miste, kde nepasuje
+              zadny terminal, vlozi token ERROR a skonci; chyba 21 se ohlasi, az na
+              nej parser narazi, takze drivejsi syntakticka chyba ma prednost jako
+              u Larku. ":x" v hlavicce bloku (COLON + ID bez mezery) je BLOCK_PARAM_ID.
+              ":=" tam, kde Lark ceka COLON (a ne ASSIGN), je ":" a nepasujici "="
+              (chyba 21), viz Tokens.fail.
+              Jmena (ID, CID) se internuji uz v lexeru, v tabulce symbolu tohoto
+              parsovani (Tokens.symbols, src/symbols.py).
+
+              Bloky a zavorky se zpracovavaji s explicitnim zasobnikem, hloubka
+              vnoreni neni omezena limitem rekurze.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import re
+
+from lark import Token
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.errors import LexicalError, SyntacticError
+from src.grammar import _collect_comment
+from src.symbols import SymbolTable
+
+# Druhy tokenu
+(ID, CID, INT, STRING, NIL, TRUE, FALSE, SELF, SUPER, CLASS,
+ COLON, ASSIGN, LBRACE, RBRACE, LBRACK, RBRACK, PIPE, DOT, LPAREN, RPAREN,
+ END, ERROR) = range(22)
+
+# Terminaly stejne jako v src/lexer.py; skupina 1 = jmeno nebo klicove slovo
+_TOKEN_RE = re.compile(r"""[ \t\f\r\n]*(?:
+    ([a-z_][a-zA-Z0-9_]*)
+  | ([A-Z][a-zA-Z0-9_]*)
+  | ([+\-]?[0-9]+)
+  | ('(?:\\[ntr'\\]|[^'\\\n])*')
+  | ("[^"]*")
+  | (:=|[:{}\[\]|.()])
+)""", re.VERBOSE)
+
+_GROUP_KINDS = (None, ID, CID, INT, STRING, None)
+_KEYWORDS = {"class": CLASS, "nil": NIL, "true": TRUE, "false": FALSE, "self": SELF, "super": SUPER}
+_FIXED_KINDS = {
+    ":=": ASSIGN, ":": COLON, "{": LBRACE, "}": RBRACE, "[": LBRACK, "]": RBRACK,
+    "|": PIPE, ".": DOT, "(": LPAREN, ")": RPAREN,
+}
+_NAME_GROUP = 1
+_CLASS_GROUP = 2
+_COMMENT_GROUP = 5
+_FIXED_GROUP = 6
+_WHITESPACE = " \t\f\r\n"
+
+
+class Tokens:
+    '''Vysledek lexeru: paralelni seznamy druhu, textu a pozic tokenu'''
+
+    def __init__(self, text):
+        self.text = text
+        self.kinds = []
+        self.values = []
+        self.starts = []
+        self.symbols = SymbolTable() # tabulka symbolu tohoto parsovani
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def line_column(self, offset):
+        '''Radek a sloupec (od 1) pozice ve zdrojovem kodu'''
+        line = self.text.count("\n", 0, offset) + 1
+        return line, offset - self.text.rfind("\n", 0, offset)
+
+    def fail(self, index, colon_ok=False):
+        '''
+        Chyba na tokenu `index`. Kod 21, pokud by na tom miste lexer Larku nenasel
+        zadny terminal, jinak 22. `colon_ok` => parser tu prijima COLON (a ne
+        ASSIGN), ":=" se tedy rozdeli na ":" a "=", ktere uz zadnemu terminalu
+        neodpovida.
+        '''
+        kind = self.kinds[index]
+        offset = self.starts[index]
+        if kind == ASSIGN and colon_ok:
+            offset += 1
+            kind = ERROR
+        line, column = self.line_column(offset)
+        if kind == ERROR:
+            raise LexicalError(f"Unexpected characters: No terminal matches "
+                               f"{self.text[offset]!r} at line {line} col {column}")
+        if kind == END:
+            raise SyntacticError(f"Unexpected token: Unexpected end of input at line {line} col {column}")
+        raise SyntacticError(f"Unexpected token: {self.values[index]!r} at line {line} col {column}")
+
+
+def tokenize(text):
+    '''
+    Lexikalni analyza celeho vstupu, vraci Tokens (posledni je END).
+    Komentare se predaji do collect_comments (grammar.py) jako tokeny COMMENT.
+    '''
+    tokens = Tokens(text)
+    kinds = tokens.kinds
+    values = tokens.values
+    starts = tokens.starts
+    comments = []
+    intern = tokens.symbols.intern
+    pos = 0
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() != pos:
+            break # na pozici `pos` (za bilymi znaky) nepasuje zadny terminal
+        pos = match.end()
+        group = match.lastindex
+        value = match.group(group)
+        if group == _NAME_GROUP:
+            kinds.append(_KEYWORDS.get(value, ID))
+            value = intern(value)
+        elif group == _FIXED_GROUP:
+            kinds.append(_FIXED_KINDS[value])
+        elif group == _COMMENT_GROUP:
+            comments.append((match.start(group), value))
+            continue
+        else:
+            kinds.append(_GROUP_KINDS[group])
+            if group == _CLASS_GROUP:
+                value = intern(value)
+        values.append(value)
+        starts.append(match.start(group))
+
+    rest = len(text) - len(text[pos:].lstrip(_WHITESPACE))
+    if rest < len(text):
+        kinds.append(ERROR)
+        values.append(text[rest])
+        starts.append(rest)
+    kinds.append(END)
+    values.append("")
+    starts.append(len(text))
+
+    # Radky se pocitaji postupne od predchoziho komentare (ne vzdy od zacatku textu)
+    line, line_start, prev = 1, 0, 0
+    for start, value in comments:
+        newlines = text.count("\n", prev, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", prev, start) + 1
+        _collect_comment(Token("COMMENT", value, start, line, start - line_start + 1))
+        line += value.count("\n")
+        prev = start + len(value)
+        if "\n" in value:
+            line_start = text.rfind("\n", start, prev) + 1
+    return tokens
+
+
+# ---------------------
+# Parser
+
+# Ramce zasobniku v _block
+_BLOCK, _ASSIGN, _PAREN, _EXPR = range(4)
+_PAREN_FRAME = (_PAREN,)
+
+# Rezimy _block: dalsi prikaz bloku / zacatek primarniho vyrazu / hotova hodnota
+_STATEMENT, _PRIMARY, _VALUE = range(3)
+
+
+def _open_block(tokens, pos, frames):
+    '''Hlavicka bloku "[" :param* "|" na pozici `pos`, vraci pozici za ni'''
+    kinds = tokens.kinds
+    starts = tokens.starts
+    pos += 1
+    params = []
+    while kinds[pos] == COLON:
+        # BLOCK_PARAM_ID = ":" a hned za ni ID
+        if kinds[pos + 1] != ID or starts[pos + 1] != starts[pos] + 1:
+            tokens.fail(pos)
+        params.append(tokens.symbols.intern(tokens.values[pos + 1][:1])) # jen prvni znak jako Sol25Transformer.block_params
+        pos += 2
+    if kinds[pos] != PIPE:
+        tokens.fail(pos)
+    frames.append((_BLOCK, params, []))
+    return pos + 1
+
+def _block(tokens, pos):
+    '''Blok na pozici `pos` (vcetne vnorenych bloku a zavorek), vraci (BlockNode, pozice)'''
+    kinds = tokens.kinds
+    values = tokens.values
+    symbols = tokens.symbols
+    frames = []
+    pos = _open_block(tokens, pos, frames)
+    mode = _STATEMENT
+    while True:
+        if mode == _STATEMENT:
+            # Vrchol zasobniku je blok: "ID := vyraz ." nebo "]"
+            kind = kinds[pos]
+            if kind == ID:
+                if kinds[pos + 1] != ASSIGN:
+                    tokens.fail(pos + 1)
+                frames.append((_ASSIGN, values[pos]))
+                pos += 2
+                mode = _PRIMARY
+            elif kind == RBRACK:
+                pos += 1
+                _, params, statements = frames.pop()
+                value = BlockNode(params, statements)
+                if not frames:
+                    return value, pos
+                mode = _VALUE
+            else:
+                tokens.fail(pos)
+
+        elif mode == _PRIMARY:
+            kind = kinds[pos]
+            if kind == ID:
+                value = VarNode(values[pos])
+            elif kind == INT:
+                value = LiteralNode("Integer", values[pos])
+            elif kind == STRING:
+                text = values[pos][1:-1]
+                if text == "\\n": # stejne jako Sol25Transformer.STRING
+                    raise LexicalError("Invalid string: '\\n'")
+                value = LiteralNode("String", text)
+            elif kind == CID:
+                value = LiteralNode("class", values[pos])
+            elif kind == SELF:
+                value = VarNode(symbols.intern("self"))
+            elif kind == NIL:
+                value = LiteralNode("Nil", None)
+            elif kind == TRUE:
+                value = LiteralNode("True", True)
+            elif kind == FALSE:
+                value = LiteralNode("False", False)
+            elif kind == SUPER:
+                value = VarNode(symbols.intern("super"))
+            elif kind == LBRACK:
+                pos = _open_block(tokens, pos, frames)
+                mode = _STATEMENT
+                continue
+            elif kind == LPAREN:
+                frames.append(_PAREN_FRAME)
+                pos += 1
+                continue
+            else:
+                tokens.fail(pos)
+            pos += 1
+            mode = _VALUE
+
+        else: # _VALUE - predani hotove hodnoty ramci na vrcholu zasobniku
+            frame = frames[-1]
+            if frame[0] == _EXPR:
+                frame[3].append(value) # argument klicove zpravy
+                after_keyword = True
+            elif kinds[pos] == ID:
+                # Prijemce, za kterym nasleduji zpravy
+                frame = [_EXPR, value, [], []]
+                frames.append(frame)
+                after_keyword = False
+            elif frame[0] == _ASSIGN:
+                if kinds[pos] != DOT:
+                    tokens.fail(pos)
+                pos += 1
+                frames.pop()
+                frames[-1][2].append(AssignNode(frame[1], value))
+                mode = _STATEMENT
+                continue
+            else: # _PAREN
+                if kinds[pos] != RPAREN:
+                    tokens.fail(pos)
+                pos += 1
+                frames.pop()
+                continue
+
+            # Zpravy: "ID" bez parametru, "ID :" argument klicove zpravy
+            parts = frame[2]
+            while kinds[pos] == ID:
+                following = kinds[pos + 1]
+                if following == COLON:
+                    parts.append(symbols.keyword(values[pos]))
+                    pos += 2
+                    mode = _PRIMARY
+                    break
+                if after_keyword or following == ASSIGN:
+                    tokens.fail(pos + 1, colon_ok=True)
+                parts.append(values[pos])
+                pos += 1
+            else:
+                # Konec vyrazu, hodnota jde o ramec niz
+                frames.pop()
+                value = SendNode(frame[1], symbols.join(tuple(parts)), frame[3]) if parts else frame[1]
+
+def _selector(tokens, pos):
+    '''Selektor metody na pozici `pos` (ID), vraci (selektor, pozice bloku)'''
+    kinds = tokens.kinds
+    values = tokens.values
+    symbols = tokens.symbols
+    following = kinds[pos + 1]
+    if following == LBRACK:
+        return values[pos], pos + 1
+    if following != COLON:
+        tokens.fail(pos + 1, colon_ok=True)
+    parts = [symbols.keyword(values[pos])]
+    pos += 2
+    while kinds[pos] == ID:
+        if kinds[pos + 1] != COLON:
+            tokens.fail(pos + 1, colon_ok=True)
+        parts.append(symbols.keyword(values[pos]))
+        pos += 2
+    if kinds[pos] != LBRACK:
+        tokens.fail(pos)
+    return symbols.join(tuple(parts)), pos
+
+def parse_tokens(tokens):
+    '''Syntakticka analyza tokenu z tokenize(), vraci ProgramNode'''
+    kinds = tokens.kinds
+    values = tokens.values
+    pos = 0
+    classes = []
+    while kinds[pos] == CLASS:
+        # "class" CID ":" CID "{" method* "}"
+        if kinds[pos + 1] != CID:
+            tokens.fail(pos + 1)
+        if kinds[pos + 2] != COLON:
+            tokens.fail(pos + 2, colon_ok=True)
+        if kinds[pos + 3] != CID:
+            tokens.fail(pos + 3)
+        if kinds[pos + 4] != LBRACE:
+            tokens.fail(pos + 4)
+        name = values[pos + 1]
+        parent = values[pos + 3]
+        pos += 5
+        methods = []
+        while kinds[pos] == ID:
+            selector, pos = _selector(tokens, pos)
+            block, pos = _block(tokens, pos)
+            methods.append(MethodNode(selector, block))
+        if kinds[pos] != RBRACE:
+            tokens.fail(pos)
+        pos += 1
+        classes.append(ClassNode(name, parent, methods))
+    if kinds[pos] != END:
+        tokens.fail(pos)
+    return ProgramNode(classes)
+
+
+class RDParser:
+    '''Backend "rd" - stejne rozhrani jako Lark parser s transformerem (parse vraci ProgramNode)'''
+
+    def parse(self, text):
+        return parse_tokens(tokenize(text))
+
+    def lex(self, text):
+        '''Tokeny bez END (pro pocitani v --stats), pri lexikalni chybe vyhodi LexicalError'''
+        tokens = tokenize(text)
+        if tokens.kinds[-2:-1] == [ERROR]:
+            tokens.fail(len(tokens) - 2)
+        return tokens.values[:-1]
+
+# Konec souboru rd_parser.py (EOF)
@@ -8,9 +8,17 @@
       - 33: Arita
       - 34: Kolize param vs lokální var, param je read-only
       - 35: Duplicitní param vs param, redefinice třídy, cyklická dědičnost
+      S jobs > 1 se tela metod kontroluji po tridach v procesech (src/parallel_check.py).
 """
 
-import sys
+from src.errors import (
+    Sol25Error,
+    MissingMainError,
+    UndefinedError,
+    ArityError,
+    VariableCollisionError,
+    RedefinitionError,
+)
 from src.ast_nodes import (
     ProgramNode,
     ClassNode,
@@ -22,233 +30,375 @@ from src.ast_nodes import (
     VarNode,
 )
 
+class _Deferred:
+    '''
+    Chyba zpravy tride, ktera se nahlasi az po kontrole argumentu
+    (na zasobniku vyrazu v SemChecker._check_block mezi uzly)
+    '''
+    __slots__ = ("error",)
+    kind = None
+
+    def __init__(self, error):
+        self.error = error
+
 class SemChecker:
-    def __init__(self, ast_root):
+    def __init__(self, ast_root, collect=False, jobs=None):
         self.ast_root = ast_root # Korenovy uzel AST stromu
+        # collect=True => chyby se sbiraji a kontrola pokracuje (vsechny chyby v jednom behu)
+        self.collect = collect
+        self.jobs = jobs # Pocet procesu pro kontrolu trid (None/1 => v tomto procesu)
+        self.errors = [] # Nalezene chyby (v poradi, v jakem by se hlasily)
+        self._class = None # Aktualne kontrolovana trida a metoda (pro hlaseni chyb)
+        self._selector = None
         self.defined_classes = set()  # Tabulka s definovanymi tridami (bez built-in trid)
 
         # Built-in tridy
         self.builtin_classes = {"Object", "String", "Integer", "Nil", "True", "False", "Block", "Nil"}
-        # Built-in metody
+        # Built-in metody trid (zpravy literalu tridy), ostatni built-in tridy je dedi z Object
         self.builtin_class_methods = {
             "Object": {"new", "from:"},
-            "Nil": {"new", "from:"},
-            "True": {"new", "from:"},
-            "False": {"new", "from:"},
-            "Integer": {"new", "from:"},  
-            "String": {"new", "from:", "read"},
-            "Block": {"new", "from:"}
+            "String": {"read"},
+        }
+        # Built-in metody instanci (jen pro tabulky metod na vystupu, --vtables)
+        self.builtin_instance_methods = {
+            "Object": {"identicalTo:", "equalTo:", "asString", "isNumber", "isString", "isBlock", "isNil"},
+            "Nil": {"asString", "isNil"},
+            "True": {"not", "and:", "or:", "ifTrue:ifFalse:"},
+            "False": {"not", "and:", "or:", "ifTrue:ifFalse:"},
+            "Integer": {"equalTo:", "greaterThan:", "plus:", "minus:", "multiplyBy:", "divBy:",
+                        "asString", "asInteger", "timesRepeat:", "isNumber"},
+            "String": {"print", "equalTo:", "asString", "asInteger", "concatenateWith:",
+                       "startsWith:endsBefore:", "length", "isString"},
+            # value s libovolnou aritou, v tabulce do tri argumentu
+            "Block": {"value", "value:", "value:value:", "value:value:value:", "whileTrue:", "isBlock"},
         }
 
-        self.class_parents = {} # Rodicovske tridy
+        # Rodicovske tridy (built-in tridy dedi z Object)
+        self.class_parents = dict.fromkeys(self.builtin_classes - {"Object"}, "Object")
+        self.class_index = {} # Jmeno tridy -> ClassNode
+        self.known_classes = set(self.builtin_classes) # Definovane + built-in tridy
+        self._method_tables = {} # Jmeno tridy -> {selektor: definujici trida}
+        self._instance_tables = {} # Jmeno tridy -> {selektor: definujici trida} pro metody instanci
 
 
     def check(self):
-        '''Spusteni semantickych kontrol'''
+        '''
+        Spusteni semantickych kontrol. Bez `collect` vyhodi prvni chybu,
+        jinak vraci seznam vsech chyb (prvni ma stejny kod jako bez `collect`).
+        '''
         # Sbírání definovaných tříd 
         self._collect_classes() 
         # Kontrola existence Main tridy a metody run => (31)
         self._check_main_class() 
         # Kontrola definic => rodičovská třída, počet parametrů => (32), (33)
-        self._check_all_classes()
+        if self.jobs and self.jobs > 1:
+            from src.parallel_check import check_classes_parallel
+            check_classes_parallel(self, self.jobs)
+        else:
+            self._check_all_classes()
         # Kontrola cyklické dědičnosti => (35)
         self.check_no_cycles()
+        return self.errors
 
+    def _report(self, error):
+        '''Chyba s umistenim (trida, metoda); bez `collect` se hned vyhodi'''
+        error.class_name = self._class
+        error.selector = self._selector
+        if not self.collect:
+            raise error
+        self.errors.append(error)
 
 
     def _collect_classes(self):
-        '''Naplnění tabulky definovaných tříd'''
-        seen = set()
+        '''Naplnění tabulky definovaných tříd a indexu tříd podle jména'''
         for c in self.ast_root.classes:
-            # Redefinice tridy?
-            if c.name in seen:
-                print(f"Class {c.name} redefined", file=sys.stderr)
-                sys.exit(35)
-            seen.add(c.name)
+            # Redefinice tridy? (plati prvni definice)
+            if c.name in self.class_index:
+                self._class = c.name
+                self._report(RedefinitionError(f"Class {c.name} redefined"))
+                continue
 
+            self.class_index[c.name] = c
             self.defined_classes.add(c.name)
             self.class_parents[c.name] = c.parent # pro check_no_cycles
 
-    def get_all_methods(self, class_name):
-        ''' Získání všech metod pro danou třídu včetně zděděných'''
-        methods = set()
+        self.known_classes = self.defined_classes | self.builtin_classes
+        self._build_method_tables()
+
+    def _build_method_tables(self):
+        '''Predpocitani tabulek metod pro vsechny definovane tridy'''
+        for name in self.class_index:
+            self.method_table(name)
+
+    def method_table(self, class_name):
+        '''
+        Tabulka metod tridy pro kontrolu zprav tridam (built-in metody trid
+        a uzivatelske metody, vcetne zdedenych): selektor -> trida, ktera ho definuje.
+        Vysledek se pamatuje, kazda trida v hierarchii se tak zpracuje jen jednou.
+        '''
+        table = self._method_tables.get(class_name)
+        if table is None:
+            table = self._inherited_table(class_name, self._method_tables, self._own_methods)
+        return table
+
+    def instance_side_table(self, class_name):
+        '''Metody instanci (built-in i uzivatelske) vcetne zdedenych: selektor -> definujici trida'''
+        tables = self._instance_tables
+        table = tables.get(class_name)
+        if table is None:
+            table = self._inherited_table(class_name, tables, self._own_instance_methods)
+        return table
+
+    def _inherited_table(self, class_name, tables, own_methods):
+        '''
+        Sestaveni tabulky tridy do pameti `tables` z vlastnich metod (`own_methods`)
+        trid na ceste k predkovi, ktery uz tabulku ma.
+        '''
+        # Cesta nahoru po hierarchii az ke tride se spocitanou tabulkou
+        chain = []
+        on_chain = set()
+        name = class_name
+        while name and name not in on_chain and name not in tables:
+            on_chain.add(name)
+            chain.append(name)
+            name = self.class_parents.get(name)
+
+        if name in on_chain:
+            # Cyklicka dedicnost (chyba 35 se hlasi az v check_no_cycles) =>
+            # pro tridy na ceste se tabulka sestavi pruchodem az do opakovani
+            for c in chain:
+                tables[c] = self._walk_methods(c, own_methods)
+            return tables[class_name]
+
+        inherited = tables.get(name, {})
+        for c in reversed(chain):
+            table = dict(inherited)
+            table.update(own_methods(c))
+            tables[c] = table
+            inherited = table
+        return tables[class_name]
+
+    def _own_methods(self, class_name):
+        '''Metody definovane primo ve tride (built-in metody tridy i uzivatelske)'''
+        own = dict.fromkeys(self.builtin_class_methods.get(class_name, ()), class_name)
+        class_obj = self.class_index.get(class_name)
+        if class_obj:
+            for method in class_obj.methods:
+                own[method.selector] = class_name
+        return own
+
+    def _own_instance_methods(self, class_name):
+        own = dict.fromkeys(self.builtin_instance_methods.get(class_name, ()), class_name)
+        class_obj = self.class_index.get(class_name)
+        if class_obj:
+            for method in class_obj.methods:
+                own[method.selector] = class_name
+        return own
+
+    def _walk_methods(self, class_name, own_methods):
+        '''Pruchod hierarchii bez pameti (pouze pro cyklickou dedicnost)'''
+        table = {}
         checked_classes = set()
-
         while class_name and class_name not in checked_classes:
             checked_classes.add(class_name)
-
-            # Pokud je to built-in třída, přidáme metody
-            if class_name in self.builtin_class_methods:
-                methods.update(self.builtin_class_methods[class_name])
-
-            # Přidání metod aktuální třídy
-            class_obj = next((c for c in self.ast_root.classes if c.name == class_name), None)
-            if class_obj:
-                for method in class_obj.methods:
-                    methods.add(method.selector)
-
-            # Posun na rodičovskou třídu
+            for sel, definer in own_methods(class_name).items():
+                table.setdefault(sel, definer)
             class_name = self.class_parents.get(class_name)
+        return table
 
-
-        return methods
+    def get_all_methods(self, class_name):
+        ''' Získání všech metod pro danou třídu včetně zděděných'''
+        return self.method_table(class_name).keys()
+
+    def dispatch_tables(self):
+        '''
+        Tabulky metod pro vystup (--vtables), az po check():
+        {"class": {trida: {selektor: definujici trida}}, "instance": {...}}.
+        Strana "class" jsou zpravy, ktere kontrola prijme od literalu tridy
+        (method_table: new, from:, read a uzivatelske metody), strana "instance"
+        metody instanci vcetne built-in. Definovane tridy v poradi definic,
+        pak zbyle built-in tridy; selektory serazene.
+        '''
+        names = list(self.class_index)
+        names += sorted(self.builtin_classes - self.defined_classes)
+        return {
+            "class": {name: dict(sorted(self.method_table(name).items())) for name in names},
+            "instance": {name: dict(sorted(self.instance_side_table(name).items())) for name in names},
+        }
 
 
     def _check_main_class(self):
         '''Kontrola existence Main tridy a metody run'''
-        main_class = None
-        for c in self.ast_root.classes:
-            if c.name == "Main":
-                main_class = c
-                break
-        
+        main_class = self.class_index.get("Main")
+        self._class, self._selector = "Main", None
         if main_class is None:
             # Main trida neexistuje
-            print("Main class not found", file=sys.stderr)
-            sys.exit(31)
+            self._report(MissingMainError("Main class not found"))
+            return
 
         found_run = False
         for m in main_class.methods:
-            colon_count = m.selector.count(":")
-            if m.selector == "run" and colon_count == 0:
+            if m.selector == "run":
                 found_run = True
                 break
         
         if not found_run:
             # Metoda run neexistuje
-            print("Method run not found in Main class", file=sys.stderr)
-            sys.exit(31)
+            self._report(MissingMainError("Method run not found in Main class"))
     
     def _check_all_classes(self):
         '''Kontrola všech tříd a jejich metod'''
         for c in self.ast_root.classes:
-            # (32) Kontrola existence rodicovske tridy
-            if c.parent not in (self.defined_classes | self.builtin_classes):
-                print(f"Parent class {c.parent} not defined", file=sys.stderr)
-                sys.exit(32)
-
-            defined_methods = set()
-            
-            for m in c.methods:
-                # (35) Kontrola duplicitnich metod
-                if m.selector in defined_methods:
-                    print(f"Method {m.selector} already defined", file=sys.stderr)
-                    sys.exit(35)
-                defined_methods.add(m.selector)
-
-                # (33) Kontrola poctu parametru metody
-                expected_params =  m.selector.count(":")
-                block_params_count = len(m.block.params)
-                if expected_params != block_params_count:
-                    print(f"Method {m.selector} expected {expected_params} params, got {block_params_count}", file=sys.stderr)
-                    sys.exit(33) # Arita metody
-
-                builtins_vars = {"self", "nil", "true", "false"}
-
-                # Kontrola duplicitnich parametru bloku
-                if len(m.block.params) != len(set(m.block.params)):
-                    print("Duplicate block params", file=sys.stderr)
-                    sys.exit(35) # Duplicitni parametry
-
-                self._check_block(m.block, builtins_vars)
+            self._check_class(c)
+
+    def _check_class(self, c):
+        '''
+        Kontrola jedne tridy vcetne metod. Zavisi jen na globalnim pohledu
+        na tridy z _collect_classes, tridy lze tedy kontrolovat nezavisle.
+        '''
+        self._class, self._selector = c.name, None
+        # (32) Kontrola existence rodicovske tridy
+        if c.parent not in self.known_classes:
+            self._report(UndefinedError(f"Parent class {c.parent} not defined"))
+
+        defined_methods = set()
+
+        for m in c.methods:
+            self._selector = m.selector
+            # (35) Kontrola duplicitnich metod
+            if m.selector in defined_methods:
+                self._report(RedefinitionError(f"Method {m.selector} already defined"))
+            defined_methods.add(m.selector)
+
+            # (33) Kontrola poctu parametru metody
+            expected_params = m.selector.count(":")
+            block_params_count = len(m.block.params)
+            if expected_params != block_params_count:
+                self._report(ArityError(f"Method {m.selector} expected {expected_params} params, got {block_params_count}")) # Arita metody
+
+            builtins_vars = {"self", "nil", "true", "false"}
+
+            # Kontrola duplicitnich parametru bloku
+            if len(m.block.params) != len(set(m.block.params)):
+                self._report(RedefinitionError("Duplicate block params")) # Duplicitni parametry
+
+            self._check_block(m.block, builtins_vars)
 
     def _check_block(self, block, parent_builtins):
-        
-        local_vars = set(parent_builtins) 
+        '''
+        Kontrola tela metody (vcetne vnorenych bloku a vyrazu).
+        Misto rekurze se pouziva explicitni zasobnik, hloubka vnoreni neni omezena.
+        Poradi kontrol odpovida rekurzivnimu pruchodu: prijemce, argumenty,
+        pak metoda tridy; u prirazeni nejdriv vyraz, pak promenna.
+
+        Prikazy bloku se kontroluji postupne, vyraz prikazu se prochazi
+        zasobnikem `exprs`, na kterem jsou jen uzly (a vyjimecne _Deferred
+        s chybou zpravy tride). Vnoreny blok odlozi rozpracovany stav
+        nadrazeneho bloku do `frames` a po jeho kontrole se pokracuje.
+        '''
+        known_classes = self.known_classes
+        method_table = self.method_table
+        report = self._report
+
         param_vars = set(block.params) # Parametry bloku
+        local_vars = set(parent_builtins) | param_vars
+        statements = iter(block.statements)
+        assign = None # Prirazeni, jehoz vyraz se prave kontroluje
+        exprs = []
+        frames = [] # Rozpracovane nadrazene bloky
+
+        while True:
+            while exprs:
+                node = exprs.pop()
+                kind = node.kind # zakladni trida uzlu (i pro pohledy do plocheho AST)
+
+                # Kontrola, zda je promenna definovana
+                if kind is VarNode:
+                    if node.var not in local_vars:
+                        report(UndefinedError(f"Variable {node.var} not defined"))
+
+                # Kontrola, zda je trida definovana
+                elif kind is LiteralNode:
+                    if node.type == "class" and node.value not in known_classes:
+                        report(UndefinedError(f"Class {node.value} not defined"))
+                    # Je to "int", "string", "nil", "true", "false" => nic nedelame
+
+                # Nejdriv prijemce a argumenty, pak metoda tridy
+                elif kind is SendNode:
+                    receiver = node.receiver
+                    if receiver.kind is LiteralNode and receiver.type == "class":
+                        class_name = receiver.value # Napr. "Integer"
+                        sel = node.selector         # Napr. "new"
+                        # Tabulka metod je predpocitana => jedno vyhledani
+                        # (nedefinovana trida se hlasi u prijemce)
+                        if class_name in known_classes and sel not in method_table(class_name):
+                            exprs.append(_Deferred(UndefinedError(f"Class {class_name} has no method {sel}")))
+                    args = node.arguments
+                    if args:
+                        exprs.extend(reversed(args))
+                    exprs.append(receiver)
+
+                # Kontrola bloku => parametry, promenne
+                elif kind is BlockNode:
+                    params = node.params
+                    # Kontrola duplicitnich parametru bloku
+                    if len(params) != len(set(params)):
+                        report(RedefinitionError("Duplicate block params"))
+                    frames.append((statements, assign, exprs, local_vars, param_vars))
+                    param_vars = set(params)
+                    local_vars = local_vars | param_vars
+                    statements = iter(node.statements)
+                    assign = None
+                    exprs = []
+                    break
+
+                else: # _Deferred
+                    report(node.error)
 
-        local_vars |= param_vars
-        
-        for st in block.statements: # Pro kazdy statement
-            if isinstance(st, AssignNode):
-                # Kontrola expr
-                self._check_expr(st.expr, local_vars)
-                # Kolize jmen promennych
-                if st.var in param_vars:
-                    print(f"Variable {st.var} already defined", file=sys.stderr)
-                    sys.exit(34)
-                # Pak kontrola vyrazu, zda neni pouzita nedefinovana promenna
-
-                # Pridani promenne do lokalnich promennych
-                local_vars.add(st.var)
             else:
-                print("Unknown statement type", file=sys.stderr)
-                sys.exit(99)
-
-    def _check_expr(self, expr, local_vars):
-        # Kontrola, zda je promenna definovana
-        if isinstance(expr, VarNode):
-            if expr.var not in local_vars:
-                print(f"Variable {expr.var} not defined", file=sys.stderr)
-                sys.exit(32)
-        # Kontrola, zda je trida definovana
-        elif isinstance(expr, LiteralNode):
-            if expr.type == "class" :
-                if expr.value not in (self.defined_classes | self.builtin_classes):
-                    print(f"Class {expr.value} not defined", file=sys.stderr)
-                    sys.exit(32)
+                # Vyraz prirazeni je zkontrolovan => promenna
+                if assign is not None:
+                    # Kolize jmen promennych
+                    if assign.var in param_vars:
+                        report(VariableCollisionError(f"Variable {assign.var} already defined"))
+                    else:
+                        # Pridani promenne do lokalnich promennych
+                        local_vars.add(assign.var)
+                    assign = None
+
+                # Dalsi prikaz bloku
+                st = next(statements, None)
+                if st is not None:
+                    if isinstance(st, AssignNode):
+                        assign = st
+                        exprs.append(st.expr)
+                    else:
+                        report(Sol25Error("Unknown statement type"))
+                elif frames:
+                    # Konec vnoreneho bloku => pokracovani v nadrazenem
+                    statements, assign, exprs, local_vars, param_vars = frames.pop()
                 else:
-                    # Je to "int", "string", "nil", "true", "false" => nic nedelame
-                    pass
-        # Kontrola, zda je metoda definovana
-        elif isinstance(expr, SendNode):
-            self._check_expr(expr.receiver, local_vars)
-            for arg in expr.arguments:
-                self._check_expr(arg, local_vars)
-
-            # Kontrola, zda trida ma metodu
-            if isinstance(expr.receiver, LiteralNode) and expr.receiver.type == "class":
-                # Kontrola, zda trida ma metodu
-                class_name = expr.receiver.value    # Napr. "Integer"
-                sel = expr.selector                 # Napr. "new"        
-
-                # Zjisteni vsech metod
-                available_methods = self.get_all_methods(class_name)
-
-                if sel not in available_methods:
-                    print(f"Class {class_name} has no method {sel}", file=sys.stderr)
-                    sys.exit(32)
-        
-        # Kontrola bloku => parametry, promenne
-        elif isinstance(expr, BlockNode):
-            new_scope = set(expr.params) | local_vars
-            # Kontrola duplicitnich parametru bloku
-            if len(expr.params) != len(set(expr.params)):
-                print("Duplicate block params", file=sys.stderr)
-                sys.exit(35)
-            self._check_block(expr, new_scope)
-        else:
-            pass
-    
+                    return
+
     def check_no_cycles(self):
-        """Kontrola cyklické dědičnosti pomocí DFS"""
+        """Kontrola cyklické dědičnosti - pruchod po rodicich bez rekurze"""
         visited = set()
-        stack = set()
+        self._selector = None
 
-        def dfs(cls_name):
-            # Kontrola cyklu
-            # Pokud je trida v zasobniku, tak je cyklus
+        for c in self.class_index: # poradi definic => deterministicke hlaseni
+            # Kazda trida ma jednoho rodice => staci jit po retezci nahoru
+            # Pokud je trida na aktualni ceste, tak je cyklus
             # Pokud byla trida navstivena, tak ji nemusime znovu kontrolovat
-            if cls_name in stack:
-                print("Cycle in class hierarchy", file=sys.stderr)
-                sys.exit(35)
-            if cls_name in visited:
-                return
-            visited.add(cls_name)
-            stack.add(cls_name)
-
-            # Rekurze na rodice
-            parent = self.class_parents.get(cls_name)
-            if parent in self.defined_classes:
-                dfs(parent)
-            
-            stack.remove(cls_name)
-
-        for c in self.defined_classes:
-            if c not in visited:
-                dfs(c)
-                
-                
+            path = set()
+            cls_name = c
+            while cls_name in self.defined_classes and cls_name not in visited:
+                if cls_name in path:
+                    self._class = cls_name
+                    self._report(RedefinitionError("Cycle in class hierarchy"))
+                    break
+                path.add(cls_name)
+                cls_name = self.class_parents.get(cls_name)
+            visited |= path
 
 # Konec souboru sem_checker.py (EOF)   
                     
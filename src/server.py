@@ -0,0 +1,124 @@
+"""
+    @file: server.py
+    @brief: Serverovy rezim - parser zustava nacteny a obsluhuje pozadavky pres Unix socket
+    @details: Spusteni: python3.11 parse.py --serve [cesta_k_socketu]
+              Kazde spojeni = jeden pozadavek (protokol viz src/client.py),
+              spojeni se obsluhuji soubezne ve vlaknech.
+              S cache_dir se vysledky berou/ukladaji do cache (src/cache.py).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from src.cache import CompileCache, DEFAULT_MAX_BYTES, format_stats
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.client import REQUEST_HEADER, RESPONSE_HEADER, default_socket_path, recv_exact
+
+
+class Sol25RequestHandler(socketserver.BaseRequestHandler):
+    '''Obsluha jednoho pozadavku: zdrojovy kod -> (kod, XML, chyba)'''
+
+    def handle(self):
+        header = recv_exact(self.request, REQUEST_HEADER.size)
+        if header is None:
+            return
+        (size,) = REQUEST_HEADER.unpack(header)
+        data = recv_exact(self.request, size)
+        if data is None:
+            return
+
+        code, xml_str, message = self.server.compile(data.decode("utf-8", errors="replace"))
+        xml_data = xml_str.encode("utf-8")
+        err_data = message.encode("utf-8")
+        self.request.sendall(RESPONSE_HEADER.pack(code, len(xml_data), len(err_data)) + xml_data + err_data)
+
+
+class Sol25Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, cache=None):
+        self.compiler = get_compiler() # parser se nacte jen jednou pri startu
+        self.cache = cache
+        self.cache_lock = threading.Lock() # citace statistik cache
+        super().__init__(path, Sol25RequestHandler)
+
+    def compile(self, source_code):
+        '''Preklad jednoho programu, vraci (kod, xml, chybove hlaseni)'''
+        try:
+            if self.cache is not None:
+                with self.cache_lock:
+                    key = self.cache.key(source_code)
+                    entry = self.cache.get(key)
+                if entry is not None:
+                    return entry
+                try:
+                    entry = 0, self.compiler.compile(source_code).xml, ""
+                except Sol25Error as e:
+                    entry = e.code, "", str(e)
+                with self.cache_lock:
+                    self.cache.put(key, *entry)
+                return entry
+            return 0, self.compiler.compile(source_code).xml, ""
+        except Sol25Error as e:
+            return e.code, "", str(e)
+        except Exception as e:
+            return 99, "", f"Internal error: {e}"
+
+
+def _remove_stale_socket(path):
+    '''Smaze socket po predchozim (spadlem) serveru; bezici server necha byt'''
+    if not os.path.exists(path):
+        return True
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            os.remove(path)
+            return True
+    return False
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+def serve(path=None, cache_dir=None, cache_size=DEFAULT_MAX_BYTES, cache_stats=False):
+    '''Spusteni serveru, bezi do preruseni (Ctrl+C / SIGTERM)'''
+    path = path or default_socket_path()
+    if not _remove_stale_socket(path):
+        print(f"Server already running on {path}", file=sys.stderr)
+        return 12
+
+    cache = None
+    if cache_dir:
+        try:
+            cache = CompileCache(cache_dir, cache_size)
+        except OSError as e:
+            print(f"Cannot create cache directory: {e}", file=sys.stderr)
+            return 12
+
+    server = Sol25Server(path, cache)
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+        if cache is not None:
+            run_counts = dict(cache.counts)
+            total = cache.flush_stats()
+            if cache_stats:
+                print(f"Cache: {format_stats(run_counts)}", file=sys.stderr)
+                if total is not None:
+                    print(f"Cache total: {format_stats(total)}", file=sys.stderr)
+    return 0
+
+# Konec souboru server.py (EOF)
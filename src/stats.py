@@ -0,0 +1,203 @@
+"""
+    @file: stats.py
+    @brief: Statistiky prekladu (--stats) - cas, CPU a pamet jednotlivych fazi, pocty
+    @details: Pro kazdou fazi se meri cas (perf_counter) a CPU cas (process_time)
+              bez tracemalloc (ten preklad nekolikrat zpomali). Spicku alokaci
+              (tracemalloc) lze zapnout parametrem `memory` (--stats-memory):
+              faze lex, parse, check a xml se pak po mereni casu provedou
+              jeste jednou se zapnutym tracemalloc a XML se zahodi.
+
+              Faze:
+                import        - nacteni prekladace (lark, gramatika)
+                create_parser - vytvoreni parseru (LALR tabulky z cache na disku)
+                lex           - samostatny pruchod lexeru jen kvuli poctu tokenu
+                parse         - lexer + LALR + Sol25Transformer (bezi behem parsovani)
+                check         - SemChecker
+                xml           - proudovy zapis XML (bez ElementTree)
+
+              Statistiky jdou na stderr nebo do souboru, XML na stdout se nemeni.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import contextlib
+import json
+import time
+import tracemalloc
+
+from src.ast_nodes import Node
+from src.errors import Sol25Error
+
+
+class CountingWriter:
+    '''Obal vystupniho proudu, ktery pocita zapsane bajty (UTF-8)'''
+
+    def __init__(self, out):
+        self.out = out
+        self.bytes = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode("utf-8"))
+        return self.out.write(text)
+
+
+class NullWriter:
+    '''Proud, ktery zapsany text zahodi (XML z pruchodu pro mereni pameti)'''
+
+    def write(self, text):
+        return len(text)
+
+
+def count_nodes(ast_root):
+    '''Pocty uzlu AST podle typu (bez rekurze)'''
+    counts = {}
+    stack = [ast_root]
+    while stack:
+        node = stack.pop()
+        name = node.kind.__name__
+        counts[name] = counts.get(name, 0) + 1
+        for value in node._values():
+            if type(value) is tuple:
+                stack.extend(v for v in value if isinstance(v, Node)) # params jsou retezce
+            elif isinstance(value, Node):
+                stack.append(value)
+    return counts
+
+
+class CompileStats:
+    '''Namerene faze a pocty jednoho prekladu'''
+
+    def __init__(self):
+        self.phases = {} # faze -> {"wall_ms", "cpu_ms"[, "peak_kib"]}
+        self.counts = {}
+        self.error = None # (kod, hlaseni) pri neuspesnem prekladu
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        '''Mereni casu jedne faze (i kdyz skonci vyjimkou)'''
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self.phases[name] = {
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+            }
+
+    @contextlib.contextmanager
+    def memory(self, name):
+        '''Spicka alokaci jiz zmerene faze (tracemalloc musi bezet)'''
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - base
+            if name in self.phases:
+                self.phases[name]["peak_kib"] = round(max(peak, 0) / 1024, 1)
+
+    def to_dict(self):
+        total_wall = sum(p["wall_ms"] for p in self.phases.values())
+        total_cpu = sum(p["cpu_ms"] for p in self.phases.values())
+        data = {
+            "phases": self.phases,
+            "total": {"wall_ms": round(total_wall, 3), "cpu_ms": round(total_cpu, 3)},
+            "counts": self.counts,
+        }
+        if self.error:
+            data["error"] = {"code": self.error[0], "message": self.error[1]}
+        return data
+
+    def format_text(self):
+        lines = [f"{'faze':14} {'cas ms':>10} {'CPU ms':>10} {'spicka KiB':>11}"]
+        for name, p in self.phases.items():
+            peak = f"{p['peak_kib']:11.1f}" if "peak_kib" in p else f"{'-':>11}"
+            lines.append(f"{name:14} {p['wall_ms']:10.2f} {p['cpu_ms']:10.2f} {peak}")
+        total = self.to_dict()["total"]
+        lines.append(f"{'celkem':14} {total['wall_ms']:10.2f} {total['cpu_ms']:10.2f}")
+        for name, value in self.counts.items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{k} {v}" for k, v in sorted(value.items()))
+            lines.append(f"{name}: {value}")
+        if self.error:
+            lines.append(f"error: {self.error[0]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, dest, fmt="text"):
+        '''Zapis statistik do proudu `dest` ve formatu text nebo json'''
+        if fmt == "json":
+            dest.write(json.dumps(self.to_dict(), indent=2) + "\n")
+        else:
+            dest.write(self.format_text())
+
+
+def compile_with_stats(source_code, out, indent="    ", backend="lark", memory=False):
+    '''
+    Preklad se zapisem XML do `out` a merenim fazi (parser `backend`, viz src/backends.py). Vraci CompileStats,
+    pri chybe prekladu je v nich `error` (vyjimka se nepropaguje).
+    S `memory` se spicka alokaci zmeri v druhem pruchodu (measure_memory).
+    '''
+    stats = CompileStats()
+    compiler = None
+    try:
+        with stats.phase("import"):
+            from src.compiler import get_compiler, comment_description
+            from lark.exceptions import LarkError
+        with stats.phase("create_parser"):
+            compiler = get_compiler(backend)
+
+        with stats.phase("lex"):
+            try:
+                stats.counts["tokens"] = sum(1 for _ in compiler.parser.lex(source_code))
+            except (LarkError, Sol25Error):
+                stats.counts["tokens"] = None # chybu ohlasi az parse
+
+        stats.counts["source_bytes"] = len(source_code.encode("utf-8"))
+
+        with stats.phase("parse"):
+            ast_root, comments = compiler.parse_with_comments(source_code)
+        desc = comment_description(comments)
+        nodes = count_nodes(ast_root)
+        stats.counts["nodes"] = nodes
+        stats.counts["classes"] = nodes.get("ClassNode", 0)
+        stats.counts["methods"] = nodes.get("MethodNode", 0)
+        stats.counts["sends"] = nodes.get("SendNode", 0)
+
+        with stats.phase("check"):
+            compiler.check(ast_root)
+
+        writer = CountingWriter(out)
+        with stats.phase("xml"):
+            compiler.write_xml(ast_root, writer, desc, indent)
+        stats.counts["output_bytes"] = writer.bytes
+    except Sol25Error as e:
+        stats.error = (e.code, str(e))
+    if memory and compiler is not None:
+        measure_memory(stats, compiler, source_code, indent)
+    return stats
+
+def measure_memory(stats, compiler, source_code, indent="    "):
+    '''
+    Druhy pruchod se zapnutym tracemalloc: spicka alokaci fazi lex, parse,
+    check a xml (jen fazi, ktere probehly pri mereni casu). Import a vytvoreni
+    parseru uz podruhe zmerit nelze, spicku nemaji.
+    '''
+    from lark.exceptions import LarkError
+    tracemalloc.start()
+    try:
+        with stats.memory("lex"), contextlib.suppress(LarkError, Sol25Error):
+            sum(1 for _ in compiler.parser.lex(source_code))
+        with stats.memory("parse"):
+            ast_root, _ = compiler.parse_with_comments(source_code)
+        with stats.memory("check"):
+            compiler.check(ast_root)
+        with stats.memory("xml"):
+            compiler.write_xml(ast_root, NullWriter(), None, indent)
+    except Sol25Error: # stejnou chybu uz zaznamenalo mereni casu
+        pass
+    finally:
+        tracemalloc.stop()
+
+# Konec souboru stats.py (EOF)
@@ -0,0 +1,78 @@
+"""
+    @file: symbols.py
+    @brief: Tabulka symbolu - internovana jmena trid, promennych a selektoru
+    @details: Kazde jmeno ma v tabulce jediny objekt str. Uzly AST dostanou
+              vzdy tentyz objekt, takze se opakovana jmena neukladaji znovu
+              a porovnani v mnozinach a slovnicich skonci na shode identity.
+              Spojeni casti selektoru se pamatuje.
+
+              Tabulka patri jednomu parsovani: parser ji otevre pres
+              symbol_scope() a transformer ji najde v current_symbols()
+              (thread-local, stejne jako komentare v grammar.collect_comments).
+              Po parsovani na ni odkazuji jen jmena v AST, takze dlouho bezici
+              proces (--serve, --watch) si symboly starych prekladu nedrzi.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import contextlib
+import threading
+
+_state = threading.local() # aktivni tabulka aktualniho vlakna
+
+
+class SymbolTable:
+    '''Jmeno -> internovany objekt (pouziva ji jedno vlakno)'''
+
+    def __init__(self):
+        self._canonical = {} # jmeno -> internovany objekt
+        self._keywords = {} # "foo" -> "foo:"
+        self._joined = {} # n-tice casti selektoru -> spojeny selektor
+
+    def __len__(self):
+        return len(self._canonical)
+
+    def intern(self, name):
+        '''Internovany objekt jmena (novy symbol se prida do tabulky)'''
+        canonical = self._canonical.get(name)
+        if canonical is None:
+            canonical = self._canonical[name] = str(name)
+        return canonical
+
+    def keyword(self, name):
+        '''Cast klicove zpravy "name:" (internovana)'''
+        part = self._keywords.get(name)
+        if part is None:
+            part = self._keywords[name] = self.intern(name + ":")
+        return part
+
+    def join(self, parts):
+        '''Selektor spojeny z casti (n-tice internovanych jmen)'''
+        if len(parts) == 1:
+            return parts[0]
+        selector = self._joined.get(parts)
+        if selector is None:
+            selector = self._joined[parts] = self.intern("".join(parts))
+        return selector
+
+
+@contextlib.contextmanager
+def symbol_scope(table=None):
+    '''
+    Tabulka symbolu aktivni v bloku with (v aktualnim vlakne), vraci ji.
+    Bez `table` se pouzije uz aktivni tabulka, jinak nova - vnorene
+    parsovani tak sdili tabulku vnejsiho rozsahu.
+    '''
+    previous = getattr(_state, "table", None)
+    if table is None:
+        table = previous if previous is not None else SymbolTable()
+    _state.table = table
+    try:
+        yield table
+    finally:
+        _state.table = previous
+
+def current_symbols():
+    '''Aktivni tabulka (symbol_scope), mimo rozsah None'''
+    return getattr(_state, "table", None)
+
+# Konec souboru symbols.py (EOF)
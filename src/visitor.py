@@ -0,0 +1,129 @@
+"""
+    @file: visitor.py
+    @brief: Navstevnik AST s tabulkami obsluhy podle druhu uzlu
+    @details: Potomek Visitor definuje metody enter_<Trida> / leave_<Trida>
+              (napr. enter_SendNode). Pri prvnim pouziti tridy se z nich sestavi
+              tabulka druh uzlu -> metoda, za behu se obsluha hleda jednim
+              vyhledanim ve slovniku podle `node.kind` (funguje i pro pohledy
+              do plocheho AST).
+
+              walk(root, visitors) projde AST jednou (explicitni zasobnik, bez
+              rekurze) a u kazdeho uzlu zavola obsluhu vsech navstevniku v poradi,
+              v jakem jsou zadani. Obsluha dostane (node, role, index) - roli uzlu
+              v rodici a poradi (od 1 u argumentu a prikazu, jinak od 0).
+
+              Poradi pruchodu: tridy, metody, telo metody, prikazy bloku;
+              u prirazeni vyraz, u zpravy prijemce a pak argumenty. Prikaz, ktery
+              neni prirazeni, se neprochazi, navstevnik dostane jen
+              bad_statement(node, index) ve chvili, kdy by na nej v poradi doslo.
+
+              Pouziva ho jen skladani konstant (src/optimizer.py, --fold).
+              SemChecker a XmlWriter maji vlastni specializovane pruchody
+              (spojeni kontroly a zapisu XML do jednoho pruchodu navstevniku
+              bylo asi o 20 % pomalejsi nez dva samostatne pruchody).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+
+NODE_TYPES = (ProgramNode, ClassNode, MethodNode, BlockNode, AssignNode, SendNode, LiteralNode, VarNode)
+
+# Role uzlu v rodici
+ROOT, CLASS, METHOD, BODY, STATEMENT, VALUE, RECEIVER, ARGUMENT = range(8)
+
+# Polozky zasobniku ve walk
+_ENTER, _LEAVE, _BAD = range(3)
+
+
+class Visitor:
+    '''Zaklad navstevniku, tabulky obsluhy se sestavi jednou pro kazdou tridu'''
+    _tables = None
+
+    @classmethod
+    def handler_tables(cls):
+        '''(enter, leave) - slovniky druh uzlu -> nevazana metoda'''
+        tables = cls.__dict__.get("_tables")
+        if tables is None:
+            tables = ({}, {})
+            for node_type in NODE_TYPES:
+                for table, prefix in zip(tables, ("enter_", "leave_")):
+                    method = getattr(cls, prefix + node_type.__name__, None)
+                    if method is not None:
+                        table[node_type] = method
+            cls._tables = tables
+        return tables
+
+    def bad_statement(self, node, index):
+        '''Prikaz bloku, ktery neni prirazeni'''
+
+
+def _dispatch(visitors):
+    '''Spojene tabulky vsech navstevniku: druh uzlu -> n-tice vazanych metod'''
+    enter = {}
+    leave = {}
+    for visitor in visitors:
+        enter_table, leave_table = type(visitor).handler_tables()
+        for node_type, method in enter_table.items():
+            enter[node_type] = enter.get(node_type, ()) + (method.__get__(visitor),)
+        for node_type, method in leave_table.items():
+            leave[node_type] = leave.get(node_type, ()) + (method.__get__(visitor),)
+    return enter, leave
+
+def walk(root, visitors):
+    '''Jeden pruchod AST od `root`, obsluhu volaji vsichni `visitors`'''
+    enter, leave = _dispatch(visitors)
+    no_handlers = ()
+    stack = [(root, ROOT, 0, _ENTER)]
+    push = stack.append
+    pop = stack.pop
+
+    while stack:
+        node, role, index, step = pop()
+        if step == _BAD:
+            for visitor in visitors:
+                visitor.bad_statement(node, index)
+            continue
+        kind = node.kind
+        if step == _LEAVE:
+            for handler in leave.get(kind, no_handlers):
+                handler(node, role, index)
+            continue
+
+        for handler in enter.get(kind, no_handlers):
+            handler(node, role, index)
+        push((node, role, index, _LEAVE))
+
+        # Potomci v obracenem poradi (zasobnik)
+        if kind is SendNode:
+            args = node.arguments
+            for i in range(len(args), 0, -1):
+                push((args[i - 1], ARGUMENT, i, _ENTER))
+            push((node.receiver, RECEIVER, 0, _ENTER))
+        elif kind is AssignNode:
+            push((node.expr, VALUE, 0, _ENTER))
+        elif kind is BlockNode:
+            statements = node.statements
+            for i in range(len(statements), 0, -1):
+                statement = statements[i - 1]
+                push((statement, STATEMENT, i, _ENTER if isinstance(statement, AssignNode) else _BAD))
+        elif kind is MethodNode:
+            push((node.block, BODY, 0, _ENTER))
+        elif kind is ClassNode:
+            methods = node.methods
+            for i in range(len(methods) - 1, -1, -1):
+                push((methods[i], METHOD, i, _ENTER))
+        elif kind is ProgramNode:
+            classes = node.classes
+            for i in range(len(classes) - 1, -1, -1):
+                push((classes[i], CLASS, i, _ENTER))
+
+# Konec souboru visitor.py (EOF)
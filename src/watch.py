@@ -0,0 +1,131 @@
+"""
+    @file: watch.py
+    @brief: Rezim sledovani adresare - prekladac zustava nacteny a preklada jen zmenene soubory
+    @details: Spusteni: python3.11 parse.py --watch <adresar> [--interval s]
+              Adresar se pravidelne prochazi (bez zavislosti na inotify). Soubor se
+              precte jen pri zmene casu/velikosti a prelozi se jen pri zmene obsahu
+              (sha256). XML se zapise vedle zdroje (x.sol -> x.xml), pri chybe se
+              stary x.xml smaze. Pro kazdy preklad se vypise "kod<TAB>cesta<TAB>ms".
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import contextlib
+import hashlib
+import os
+import sys
+import time
+
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+
+DEFAULT_INTERVAL = 0.5 # s
+
+
+def scan_sources(directory):
+    '''Soubory *.sol v adresari => {cesta: (mtime_ns, velikost)}'''
+    sources = {}
+    with os.scandir(directory) as it:
+        for item in it:
+            if not item.name.endswith(".sol"):
+                continue
+            try:
+                if not item.is_file():
+                    continue
+                st = item.stat()
+            except OSError:
+                continue # mezitim smazano
+            sources[item.path] = (st.st_mtime_ns, st.st_size)
+    return sources
+
+def xml_path(path):
+    '''Vystupni XML vedle zdrojoveho souboru'''
+    return os.path.splitext(path)[0] + ".xml"
+
+
+class Watcher:
+    '''Stav sledovani: pro kazdy soubor posledni (mtime, velikost) a hash obsahu'''
+
+    def __init__(self, directory, indent="    ", out=sys.stdout, err=sys.stderr):
+        self.directory = directory
+        self.indent = indent
+        self.out = out
+        self.err = err
+        self.compiler = get_compiler() # parser se nacte jen jednou
+        self.stats = {} # cesta -> (mtime_ns, velikost)
+        self.hashes = {} # cesta -> sha256 posledniho prelozeneho obsahu
+
+    def poll(self):
+        '''Jeden pruchod adresarem, vraci pocet prelozenych souboru'''
+        sources = scan_sources(self.directory)
+        for path in list(self.stats):
+            if path not in sources:
+                del self.stats[path]
+                self.hashes.pop(path, None)
+
+        compiled = 0
+        for path in sorted(sources):
+            stat = sources[path]
+            if self.stats.get(path) == stat:
+                continue
+            self.stats[path] = stat
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue # smazano mezi pruchodem a ctenim
+            digest = hashlib.sha256(data).digest()
+            if self.hashes.get(path) == digest:
+                continue # jen "touch" nebo ulozeni beze zmeny
+            self.hashes[path] = digest
+            self.compile_file(path, data.decode("utf-8", errors="replace"))
+            compiled += 1
+        return compiled
+
+    def compile_file(self, path, source_code):
+        '''Preklad jednoho souboru a zapis XML vedle nej'''
+        start = time.perf_counter()
+        out_path = xml_path(path)
+        code, message = 0, ""
+        try:
+            xml_str = self.compiler.compile(source_code, self.indent).xml
+        except Sol25Error as e:
+            code, message = e.code, str(e)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(out_path)
+        else:
+            # Zapis pres docasny soubor => editor/prohlizec nevidi polovicni XML
+            tmp_path = out_path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(xml_str)
+                os.replace(tmp_path, out_path)
+            except OSError as e:
+                code, message = 12, str(e)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"{code}\t{path}\t{elapsed:.1f} ms", file=self.out, flush=True)
+        if message:
+            print(f"{path}: {message}", file=self.err, flush=True)
+
+    def run(self, interval=DEFAULT_INTERVAL):
+        '''Sledovani do preruseni (Ctrl+C)'''
+        while True:
+            self.poll()
+            time.sleep(interval)
+
+
+def watch(directory, indent="    ", interval=DEFAULT_INTERVAL):
+    '''Spusteni rezimu sledovani, vraci navratovy kod'''
+    if not os.path.isdir(directory):
+        print(f"Cannot watch {directory}: not a directory", file=sys.stderr)
+        return 11
+
+    watcher = Watcher(directory, indent)
+    print(f"Watching {directory}", file=sys.stderr)
+    try:
+        watcher.run(interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+# Konec souboru watch.py (EOF)
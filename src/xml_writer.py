@@ -0,0 +1,243 @@
+"""
+    @file: xml_writer.py
+    @brief: Proudovy zapis AST do XML (bez stavby ElementTree)
+    @details: AST se projde jednou a XML se rovnou zapisuje do vystupniho proudu.
+              Vystup je bajtove shodny s ast_to_xml + ET.indent + ET.tostring,
+              s indent=None se zapise kompaktne (bez odradkovani a odsazeni).
+              Jmena a selektory se escapuji jen jednou pro kazde jmeno (XmlWriter.symbol,
+              pamatuje se jen po dobu jednoho zapisu).
+              S tabulkami metod (`dispatch`, SemChecker.dispatch_tables) dostane
+              kazda zprava tride atribut target (trida, ktera metodu definuje)
+              a na konec <program> se zapise sekce <vtables> s tabulkami metod
+              trid a metod instanci.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Typy uzlu, ktere mohou byt vyrazem
+EXPR_TYPES = (LiteralNode, VarNode, BlockNode, SendNode)
+
+# Hodnoty literalu, ktere se nezapisuji pres str()
+LITERAL_VALUES = {"Nil": "nil", "True": "true", "False": "false"}
+
+
+def escape_attrib(text):
+    '''Escapovani hodnoty atributu (stejne jako xml.etree.ElementTree)'''
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    if "\"" in text:
+        text = text.replace("\"", "&quot;")
+    if "\r" in text:
+        text = text.replace("\r", "&#13;")
+    if "\n" in text:
+        text = text.replace("\n", "&#10;")
+    if "\t" in text:
+        text = text.replace("\t", "&#09;")
+    return text
+
+class XmlWriter:
+    '''Zapis XML do proudu `out` (cokoliv s metodou write)'''
+
+    def __init__(self, out, indent="    ", dispatch=None):
+        self.write = out.write
+        self.indent = indent
+        self.dispatch = dispatch # {"class"|"instance": {trida: {selektor: definujici trida}}} nebo None
+        self._pads = ["\n"]
+        self._symbols = {} # jmeno / selektor -> escapovana hodnota atributu
+
+    def symbol(self, name):
+        '''Escapovana hodnota atributu pro jmeno nebo selektor (pamatuje se)'''
+        text = self._symbols.get(name)
+        if text is None:
+            text = self._symbols[name] = escape_attrib(name)
+        return text
+
+    def _pad(self, level):
+        '''Odradkovani a odsazeni pro danou uroven (v kompaktnim rezimu nic)'''
+        if self.indent is None:
+            return ""
+        while len(self._pads) <= level:
+            self._pads.append("\n" + self.indent * len(self._pads))
+        return self._pads[level]
+
+    def start(self, level, tag, attrs="", empty=False):
+        '''Otevreni elementu, `attrs` je jiz escapovany retezec atributu'''
+        pad = self._pad(level) if level else ""
+        self.write(f"{pad}<{tag}{attrs}{' />' if empty else '>'}")
+
+    def end(self, level, tag):
+        '''Uzavreni elementu, ktery ma potomky'''
+        self.write(f"{self._pad(level)}</{tag}>")
+
+    def program(self, program_node, first_coment=None):
+        '''Zapis celeho dokumentu vcetne XML hlavicky'''
+        attrs = ' language="SOL25"'
+        if first_coment:
+            desc = first_coment.replace("\n", "&nbsp;")
+            attrs += f' description="{escape_attrib(desc)}"'
+
+        self.write(XML_HEADER)
+        classes = program_node.classes
+        has_children = classes or self.dispatch is not None
+        self.start(0, "program", attrs, not has_children)
+        if has_children:
+            for cls in classes:
+                self.class_(cls, 1)
+            if self.dispatch is not None:
+                self.vtables(1)
+            self.end(0, "program")
+
+    def class_(self, class_node, level):
+        attrs = f' name="{self.symbol(class_node.name)}" parent="{self.symbol(class_node.parent)}"'
+        methods = class_node.methods
+        self.start(level, "class", attrs, not methods)
+        if methods:
+            for method in methods:
+                self.start(level + 1, "method", f' selector="{self.symbol(method.selector)}"')
+                self.block(method.block, level + 2)
+                self.end(level + 1, "method")
+            self.end(level, "class")
+
+    def block(self, block_node, level):
+        '''
+        Zapis bloku vcetne vnorenych vyrazu a bloku.
+        Misto rekurze se pouziva explicitni zasobnik, na kterem jsou bud hotove
+        retezce k zapisu (uzaviraci tagy), nebo dvojice (uzel, uroven).
+        '''
+        write = self.write
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        self._open_block(block_node, level, push)
+
+        while stack:
+            item = pop()
+            if type(item) is str:
+                write(item)
+                continue
+
+            node, level = item
+            node_type = node.kind # zakladni trida uzlu (i pro pohledy do plocheho AST)
+            if node_type is SendNode:
+                attrs = f' selector="{self.symbol(node.selector)}"'
+                if self.dispatch is not None:
+                    attrs += self._target(node)
+                self.start(level, "send", attrs)
+                push(f"{self._pad(level)}</send>")
+                # argumenty => <arg order="N"><expr>...</expr></arg>
+                args = node.arguments
+                arg_end = f"{self._pad(level + 1)}</arg>"
+                for i in range(len(args), 0, -1):
+                    push(arg_end)
+                    self._push_expr(args[i - 1], level + 2, push)
+                    push(f'{self._pad(level + 1)}<arg order="{i}">')
+                # Příjemce => <expr> uvnitř
+                self._push_expr(node.receiver, level + 1, push)
+            elif node_type is BlockNode:
+                self._open_block(node, level, push)
+            else:
+                self.leaf(node, level)
+
+    def _target(self, send_node):
+        '''
+        Atribut target pro zpravu tride (vyhledani v tabulce strany "class", tedy
+        ve stejnych selektorech, ktere prijme kontrola), jinak ""
+        '''
+        receiver = send_node.receiver
+        if receiver.kind is not LiteralNode or receiver.type != "class":
+            return ""
+        definer = self.dispatch["class"].get(receiver.value, {}).get(send_node.selector)
+        if definer is None:
+            return ""
+        return f' target="{self.symbol(definer)}"'
+
+    def vtables(self, level):
+        '''
+        Sekce <vtables>: pro kazdou tridu tabulka metod tridy (side="class")
+        a metod instanci (side="instance"), u selektoru trida, ktera ho definuje
+        '''
+        class_side = self.dispatch["class"]
+        instance_side = self.dispatch["instance"]
+        self.start(level, "vtables", "", not class_side)
+        if not class_side:
+            return
+        for name in class_side:
+            for side, table in (("class", class_side[name]), ("instance", instance_side[name])):
+                attrs = f' class="{self.symbol(name)}" side="{side}"'
+                self.start(level + 1, "vtable", attrs, not table)
+                if table:
+                    for selector, definer in table.items():
+                        attrs = f' selector="{self.symbol(selector)}" class="{self.symbol(definer)}"'
+                        self.start(level + 2, "entry", attrs, True)
+                    self.end(level + 1, "vtable")
+        self.end(level, "vtables")
+
+    def _open_block(self, block_node, level, push):
+        '''Zapis <block> s parametry, prikazy se vlozi na zasobnik'''
+        params = block_node.params
+        statements = block_node.statements
+        empty = not params and not statements
+        self.start(level, "block", f' arity="{len(params)}"', empty)
+        if empty:
+            return
+
+        # Parametry bloku
+        for i, param in enumerate(params, start=1):
+            self.start(level + 1, "parameter", f' order="{i}" name="{self.symbol(param)}"', True)
+
+        # Statementy bloku (v obracenem poradi kvuli zasobniku)
+        push(f"{self._pad(level)}</block>")
+        assign_end = f"{self._pad(level + 1)}</assign>"
+        for i in range(len(statements), 0, -1):
+            statemnt = statements[i - 1]
+            if isinstance(statemnt, AssignNode):
+                push(assign_end)
+                self._push_expr(statemnt.expr, level + 2, push)
+                push(f'{self._pad(level + 1)}<assign order="{i}">'
+                     f'{self._pad(level + 2)}<var name="{self.symbol(statemnt.var)}" />')
+            # jinak neznamy typ statementu => preskocit
+
+    def _push_expr(self, expr_node, level, push):
+        '''Vlozeni <expr> obalujiciho jeden vyraz na zasobnik'''
+        if not isinstance(expr_node, EXPR_TYPES):
+            # neznamy typ => prazdny <expr />
+            push(f"{self._pad(level)}<expr />")
+            return
+        pad = self._pad(level)
+        push(f"{pad}</expr>")
+        push((expr_node, level + 1))
+        push(f"{pad}<expr>")
+
+    def leaf(self, expr_node, level):
+        '''Zapis listu -> <literal> nebo <var>'''
+        if expr_node.kind is LiteralNode:
+            value = LITERAL_VALUES.get(expr_node.type)
+            if value is None:
+                value = str(expr_node.value)
+            attrs = f' class="{escape_attrib(expr_node.type)}" value="{escape_attrib(value)}"'
+            self.start(level, "literal", attrs, True)
+        else:
+            self.start(level, "var", f' name="{self.symbol(expr_node.var)}"', True)
+
+
+def write_xml(program_node, out, first_coment=None, indent="    ", dispatch=None):
+    '''Zapis AST do proudu `out`; indent=None => kompaktni vystup, `dispatch` => sekce <vtables>'''
+    XmlWriter(out, indent, dispatch).program(program_node, first_coment)
+
+# Konec souboru xml_writer.py (EOF)
@@ -0,0 +1,104 @@
+"""
+    @file: test_all_errors.py
+    @brief: Testy sberu vsech semantickych chyb (Sol25Compiler.diagnose, parse.py --all-errors)
+    @details: Vsechny semanticke chyby v poradi zdroje, prvni chyba ma stejny kod
+              jako pri compile; lexikalni a syntakticka chyba je vzdy jen jedna.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.sem_checker import SemChecker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MULTI = """class Main : Object {
+  run [| a := b. c := Foo new. ]
+  foo: [:x | x := 1. ]
+}
+class A : Object {
+  bar [| y := z. ]
+}
+"""
+
+SOURCES = {
+    "multi": (MULTI, [
+        (32, "Main>>run", "Variable b not defined"),
+        (32, "Main>>run", "Class Foo not defined"),
+        (34, "Main>>foo:", "Variable x already defined"),
+        (32, "A>>bar", "Variable z not defined"),
+    ]),
+    "no main": ("class A : Object { run [| a := b. ] }", [
+        (31, "Main", "Main class not found"),
+        (32, "A>>run", "Variable b not defined"),
+    ]),
+    "cycle": ("class Main : Object { run [| ] }\nclass A : B { f [| a := q. ] }\nclass B : A { }", [
+        (32, "A>>f", "Variable q not defined"),
+        (35, "A", "Cycle in class hierarchy"),
+    ]),
+}
+
+
+def diagnose(source):
+    ast_root, desc, errors = get_compiler().diagnose(source)
+    return ast_root, desc, [(e.code, e.location(), str(e)) for e in errors]
+
+def compile_code(source):
+    try:
+        get_compiler().compile(source)
+    except Sol25Error as e:
+        return e.code
+    return 0
+
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_all_errors(name):
+    source, expected = SOURCES[name]
+    ast_root, _, errors = diagnose(source)
+    assert ast_root is not None
+    assert errors == expected
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_first_error_matches_compile(name):
+    source, _ = SOURCES[name]
+    assert diagnose(source)[2][0][0] == compile_code(source)
+
+def test_checker_without_collect_raises_first():
+    source, expected = SOURCES["multi"]
+    ast_root = get_compiler().parse(source)
+    with pytest.raises(Sol25Error) as info:
+        SemChecker(ast_root).check()
+    assert (info.value.code, info.value.location(), str(info.value)) == expected[0]
+
+def test_valid_program_has_no_errors():
+    source = '"popis" class Main : Object { run [| a := 1. ] }'
+    ast_root, desc, errors = diagnose(source)
+    assert errors == []
+    assert desc == "popis"
+    assert get_compiler().to_xml(ast_root, desc) == get_compiler().compile(source).xml
+
+@pytest.mark.parametrize("source, code", [
+    ("class Main : Object { run [| a := 1 @ 2. a := b. ] }", 21),
+    ("class Main : Object { run [| a := . a := b. ] }", 22),
+])
+def test_parse_error_is_single(source, code):
+    ast_root, desc, errors = diagnose(source)
+    assert ast_root is None and desc is None
+    assert [e[0] for e in errors] == [code]
+
+def test_cli():
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "parse.py"), "--all-errors"],
+                            input=MULTI, capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 32
+    assert result.stdout == ""
+    lines = result.stderr.splitlines()
+    assert lines[0] == "32\tMain>>run\tVariable b not defined"
+    assert lines[-1] == "4 error(s)"
+
+# Konec souboru test_all_errors.py (EOF)
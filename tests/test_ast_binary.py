@@ -0,0 +1,156 @@
+"""
+    @file: test_ast_binary.py
+    @brief: Testy binarniho formatu AST (src/ast_binary.py, parse.py --format=bin)
+    @details: load(dump(ast)) vraci stejne AST i popis, XML z nacteneho AST je
+              shodne s XML z prekladu. Zkraceny nebo poskozeny vstup vyhodi
+              BinaryFormatError (nebo se nacte jine platne AST), nikdy jinou chybu.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import random
+import sys
+
+import pytest
+
+from bench.generator import generate_program
+from src import ast_binary
+from src.ast_binary import (
+    MAGIC, VERSION, VAR, LITERAL, SEND, ASSIGN, BLOCK, METHOD, CLASS, PROGRAM,
+    BinaryFormatError, dump, load,
+)
+from src.ast_nodes import ProgramNode, ClassNode, MethodNode, BlockNode, AssignNode, SendNode, LiteralNode, VarNode
+from src.compiler import get_compiler
+
+SOURCES = [
+    "class Main : Object {\n  run [| ]\n}\n",
+    '"popis & <test>\nradek" class Main : Object { run [| ] }',
+    "class Main : Object {\n  run [|\n    a := 'x\\'y\\n'.\n    b := -42.\n"
+    "    c := nil. d := true. e := false. f := Integer.\n"
+    "    g := [:x :y | z := x plus: y. ] value: 1 value: 2.\n    h := 'ěšč ∀ 😀'.\n  ]\n}\n",
+    "class Main : Object { run [| ] }\nclass A : Main { foo: [:x | ] bar [| a := self foo: 1. ] }\n",
+    generate_program(classes=5, methods=3, statements=6, nesting=4, seed=1),
+    generate_program(classes=3, methods=2, statements=4, keyword_parts=4, comments=2, seed=2),
+]
+
+
+def analyzed(source):
+    return get_compiler().analyze(source)
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_round_trip(source):
+    ast, desc = analyzed(source)
+    assert load(dump(ast, desc)) == (ast, desc)
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_same_xml(source):
+    compiler = get_compiler()
+    ast, desc = analyzed(source)
+    loaded, loaded_desc = load(dump(ast, desc))
+    assert compiler.to_xml(loaded, loaded_desc) == compiler.compile(source).xml
+
+def test_empty_program():
+    ast = ProgramNode(())
+    assert load(dump(ast)) == (ast, None)
+
+def test_truncated():
+    ast, desc = analyzed(SOURCES[2])
+    data = dump(ast, desc)
+    for size in range(len(data)):
+        with pytest.raises(BinaryFormatError):
+            load(data[:size])
+
+def test_trailing_data():
+    ast, desc = analyzed(SOURCES[0])
+    with pytest.raises(BinaryFormatError):
+        load(dump(ast, desc) + b"\x00")
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"SOL25XML\x01",
+    MAGIC,
+    MAGIC + bytes([VERSION + 1]),
+    MAGIC + bytes([VERSION]) + b"\x00\x00\x01\xff", # neznamy typ zaznamu
+    MAGIC + bytes([VERSION]) + b"\x00\x00\x00", # zadny zaznam
+    MAGIC + bytes([VERSION]) + b"\x01\x02\xff\xfe\x00\x00", # neplatne UTF-8
+])
+def test_invalid_header_and_records(data):
+    with pytest.raises(BinaryFormatError):
+        load(data)
+
+def records(*body, strings=(b"x",)):
+    '''Binarni data s tabulkou retezcu `strings` a zaznamy `body` (bajty)'''
+    head = bytes([len(strings)]) + b"".join(bytes([len(s)]) + s for s in strings)
+    return MAGIC + bytes([VERSION]) + head + bytes([0, len(body)]) + b"".join(bytes(r) for r in body)
+
+def test_records_helper_builds_valid_program():
+    program, _ = load(records(
+        [LITERAL, 0, 3], [ASSIGN, 0], [BLOCK, 0, 1], [METHOD, 0], [CLASS, 0, 0, 1], [PROGRAM, 1]))
+    assert program.classes[0].methods[0].block.statements[0].var == "x"
+
+@pytest.mark.parametrize("body", [
+    ([VAR, 0], [PROGRAM, 1]), # trida je VarNode
+    ([VAR, 0], [CLASS, 0, 0, 1], [PROGRAM, 1]), # metoda je VarNode
+    ([VAR, 0], [METHOD, 0], [CLASS, 0, 0, 1], [PROGRAM, 1]), # telo metody neni blok
+    ([VAR, 0], [BLOCK, 0, 1], [METHOD, 0], [CLASS, 0, 0, 1], [PROGRAM, 1]), # prikaz neni prirazeni
+    ([BLOCK, 0, 0], [METHOD, 0], [ASSIGN, 0], [BLOCK, 0, 1], [METHOD, 0],
+     [CLASS, 0, 0, 1], [PROGRAM, 1]), # vyraz prirazeni je metoda
+    ([BLOCK, 0, 0], [METHOD, 0], [VAR, 0], [SEND, 0, 1], [PROGRAM, 0]), # prijemce je metoda
+    ([VAR, 0], [BLOCK, 0, 0], [METHOD, 0], [SEND, 0, 1], [PROGRAM, 0]), # argument je metoda
+    ([PROGRAM, 0], [PROGRAM, 1]), # trida je program
+    ([PROGRAM, 2],), # chybejici tridy
+    ([ASSIGN, 0], [PROGRAM, 0]), # prirazeni bez vyrazu
+])
+def test_mistyped_records(body):
+    with pytest.raises(BinaryFormatError):
+        load(records(*body))
+
+def test_module_main_rejects_mistyped(monkeypatch, capsys):
+    data = records([VAR, 0], [PROGRAM, 1])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+    assert ast_binary.main() == 11
+    assert "Corrupted" in capsys.readouterr().err
+
+def assert_well_formed(program):
+    '''Kazdy uzel ma potomky spravneho druhu'''
+    assert type(program) is ProgramNode
+    for cls in program.classes:
+        assert type(cls) is ClassNode
+        for method in cls.methods:
+            assert type(method) is MethodNode and type(method.block) is BlockNode
+            blocks = [method.block]
+            while blocks:
+                block = blocks.pop()
+                for statement in block.statements:
+                    assert type(statement) is AssignNode
+                    exprs = [statement.expr]
+                    while exprs:
+                        expr = exprs.pop()
+                        if type(expr) is SendNode:
+                            exprs.append(expr.receiver)
+                            exprs.extend(expr.arguments)
+                        elif type(expr) is BlockNode:
+                            blocks.append(expr)
+                        else:
+                            assert expr.kind in (VarNode, LiteralNode)
+
+def test_corrupted():
+    '''Nahodne zmenene bajty => BinaryFormatError nebo jine spravne utvorene AST'''
+    ast, desc = analyzed(SOURCES[4])
+    data = dump(ast, desc)
+    rnd = random.Random(0)
+    errors = 0
+    for _ in range(2000):
+        corrupted = bytearray(data)
+        for _ in range(rnd.randint(1, 3)):
+            corrupted[rnd.randrange(len(MAGIC) + 1, len(data))] = rnd.randrange(256)
+        try:
+            program, _ = load(bytes(corrupted))
+        except BinaryFormatError:
+            errors += 1
+            continue
+        assert_well_formed(program)
+    assert errors
+
+# Konec souboru test_ast_binary.py (EOF)
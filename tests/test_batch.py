@@ -0,0 +1,59 @@
+"""
+    @file: test_batch.py
+    @brief: Testy davkoveho rezimu (src/batch.py, parse.py --batch)
+    @details: Chyba jednoho souboru (neplatne UTF-8, syntakticka chyba,
+              neocekavana vyjimka) davku neprerusi, v jednom procesu ani v poolu.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+
+import pytest
+
+import src.batch
+from src.batch import run_batch
+
+VALID = "class Main : Object {\n  run [| a := 1. ]\n}\n"
+
+
+def write_inputs(directory):
+    (directory / "a_ok.sol").write_text(VALID, encoding="utf-8")
+    (directory / "b_latin1.sol").write_bytes("\"popis \xe9\" ".encode("latin-1") + VALID.encode())
+    (directory / "c_syntax.sol").write_text("class Main : Object {", encoding="utf-8")
+    (directory / "d_ok.sol").write_text(VALID, encoding="utf-8")
+
+def codes(output):
+    return dict(line.split("\t")[::-1] for line in output.splitlines())
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_non_utf8_file_does_not_abort(tmp_path, capsys, jobs):
+    write_inputs(tmp_path)
+    out_dir = tmp_path / "out"
+    assert run_batch(str(tmp_path), str(out_dir), jobs=jobs) == 11
+
+    captured = capsys.readouterr()
+    by_name = {os.path.basename(path): int(code) for path, code in codes(captured.out).items()}
+    assert by_name == {"a_ok.sol": 0, "b_latin1.sol": 11, "c_syntax.sol": 22, "d_ok.sol": 0}
+    assert "Not a UTF-8 file" in captured.err
+    assert "Batch: 2/4 OK, 2 failed" in captured.err
+    assert sorted(os.listdir(out_dir)) == ["a_ok.xml", "d_ok.xml"]
+
+def test_unexpected_error_is_per_file(tmp_path, capsys, monkeypatch):
+    class Broken:
+        def compile(self, source_code, indent):
+            if "boom" in source_code:
+                raise RuntimeError("boom")
+            return Real.compile(source_code, indent)
+
+    Real = src.batch.get_compiler()
+    monkeypatch.setattr(src.batch, "get_compiler", Broken)
+    (tmp_path / "a.sol").write_text('"boom" ' + VALID, encoding="utf-8")
+    (tmp_path / "b.sol").write_text(VALID, encoding="utf-8")
+
+    assert run_batch(str(tmp_path), str(tmp_path / "out"), jobs=1) == 99
+    captured = capsys.readouterr()
+    assert list(codes(captured.out).values()) == ["99", "0"]
+    assert "Internal error: RuntimeError: boom" in captured.err
+
+# Konec souboru test_batch.py (EOF)
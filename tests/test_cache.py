@@ -0,0 +1,134 @@
+"""
+    @file: test_cache.py
+    @brief: Testy cache vysledku prekladu na disku (src/cache.py, parse.py --cache-dir)
+    @details: Zasah vraci stejny vysledek jako preklad (XML i chyby), klic zavisi
+              na zdroji a odsazeni, poskozeny zaznam se chova jako minuti
+              a pri prekroceni limitu se mazou nejdele nepouzite zaznamy.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+
+import pytest
+
+from src import cache
+from src.cache import ENTRY_SUFFIX, CompileCache, read_stats
+from src.compiler import get_compiler
+
+SOURCE = "class Main : Object {\n  run [| a := 1 plus: 2. ]\n}\n"
+BAD_SOURCE = "class Main : Object {\n  run [| a := b. ]\n}\n"
+
+
+def entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(ENTRY_SUFFIX))
+
+class CountingCompiler:
+    '''Prekladac, ktery pocita volani compile'''
+    def __init__(self):
+        self.calls = 0
+        self.compiler = get_compiler()
+
+    def compile(self, source_code, indent):
+        self.calls += 1
+        return self.compiler.compile(source_code, indent)
+
+
+def test_hit_returns_compiled_xml(tmp_path):
+    store = CompileCache(str(tmp_path))
+    compiler = CountingCompiler()
+    expected = get_compiler().compile(SOURCE).xml
+    assert store.compile(SOURCE, compiler=compiler) == (0, expected, "", False)
+    assert store.compile(SOURCE, compiler=compiler) == (0, expected, "", True)
+    assert compiler.calls == 1
+
+def test_errors_are_cached(tmp_path):
+    store = CompileCache(str(tmp_path))
+    code, xml_str, message, hit = store.compile(BAD_SOURCE)
+    assert (code, xml_str, hit) == (32, "", False)
+    assert store.compile(BAD_SOURCE) == (32, "", message, True)
+
+def test_shared_between_instances(tmp_path):
+    CompileCache(str(tmp_path)).compile(SOURCE)
+    compiler = CountingCompiler()
+    assert CompileCache(str(tmp_path)).compile(SOURCE, compiler=compiler)[3]
+    assert compiler.calls == 0
+
+def test_key_depends_on_source_and_indent(tmp_path):
+    store = CompileCache(str(tmp_path))
+    key = store.key(SOURCE)
+    assert store.key(SOURCE) == key
+    assert store.key(SOURCE + " ") != key
+    assert store.key(SOURCE, "  ") != key
+    assert store.key(SOURCE, None) != key
+
+def test_key_depends_on_compiler(tmp_path, monkeypatch):
+    store = CompileCache(str(tmp_path))
+    key = store.key(SOURCE)
+    monkeypatch.setattr(cache, "_fingerprint", "0" * 64)
+    assert store.key(SOURCE) != key
+
+def test_indent_variants(tmp_path):
+    store = CompileCache(str(tmp_path))
+    for indent in ("    ", "  ", None):
+        store.compile(SOURCE, indent)
+    for indent in ("    ", "  ", None):
+        code, xml_str, _, hit = store.compile(SOURCE, indent)
+        assert hit and xml_str == get_compiler().compile(SOURCE, indent).xml
+
+@pytest.mark.parametrize("content", [b"", b"garbage", b"x\n<program/>"])
+def test_corrupted_entry_is_a_miss(tmp_path, content):
+    store = CompileCache(str(tmp_path))
+    store.compile(SOURCE)
+    name, = entries(tmp_path)
+    (tmp_path / name).write_bytes(content)
+    code, xml_str, _, hit = store.compile(SOURCE)
+    assert (code, hit) == (0, False)
+    assert xml_str == get_compiler().compile(SOURCE).xml
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    sources = [SOURCE.replace("1 plus: 2", f"{i} plus: 2") for i in range(4)]
+    store = CompileCache(str(tmp_path), max_bytes=10 ** 6)
+    for i, source in enumerate(sources):
+        store.compile(source)
+        os.utime(store._path(store.key(source)), (i, i))
+    size = sum(os.path.getsize(tmp_path / name) for name in entries(tmp_path))
+
+    store.get(store.key(sources[0])) # nejstarsi zaznam se pouzije => nejnovejsi
+    store.max_bytes = size - 1
+    store.evict()
+    assert store.get(store.key(sources[0])) is not None
+    assert store.get(store.key(sources[1])) is None
+    assert store.get(store.key(sources[3])) is not None
+    assert store.counts["evictions"] == 1
+
+def test_limit_is_kept_on_put(tmp_path):
+    store = CompileCache(str(tmp_path), max_bytes=2000)
+    for i in range(20):
+        store.compile(SOURCE.replace("1 plus: 2", f"{i} plus: 2"))
+    size = sum(os.path.getsize(tmp_path / name) for name in entries(tmp_path))
+    assert 0 < size <= 2000
+    assert store.counts["evictions"]
+
+def test_stats(tmp_path):
+    store = CompileCache(str(tmp_path))
+    store.compile(SOURCE)
+    store.compile(SOURCE)
+    store.compile(BAD_SOURCE)
+    total = store.flush_stats()
+    assert total == {"hits": 1, "misses": 2, "stores": 2, "evictions": 0}
+    assert read_stats(str(tmp_path)) == total
+    CompileCache(str(tmp_path)).compile(SOURCE)
+    assert read_stats(str(tmp_path))["hits"] == 1 # bez flush_stats se nic nepricte
+
+def test_module_main_clear(tmp_path, capsys):
+    store = CompileCache(str(tmp_path))
+    store.compile(SOURCE)
+    store.flush_stats()
+    assert cache.main([str(tmp_path)]) == 0
+    assert "1 entries" in capsys.readouterr().out
+    assert cache.main([str(tmp_path), "--clear"]) == 0
+    assert entries(tmp_path) == []
+    assert read_stats(str(tmp_path))["misses"] == 0
+    assert cache.main([str(tmp_path / "missing")]) == 11
+
+# Konec souboru test_cache.py (EOF)
@@ -0,0 +1,78 @@
+"""
+    @file: test_comments.py
+    @brief: Testy zachyceni komentaru lexerem (grammar.collect_comments) a atributu description
+    @details: Komentare zachyti lexer behem parsovani (tokeny COMMENT s .line
+              a .column), description je text prvniho komentare. Uvozovky
+              uvnitr retezcoveho literalu komentar nezacinaji.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.backends import BACKENDS
+from src.compiler import get_compiler
+
+
+def comments(backend, source):
+    '''Komentare jako (text, radek, sloupec)'''
+    _, tokens = get_compiler(backend).parse_with_comments(source)
+    return [(t.value, t.line, t.column) for t in tokens]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_quote_inside_string_is_not_comment(backend):
+    source = "class Main : Object {\n  run [| a := 'has \"quote\" inside'. ]\n}\n"
+    result = get_compiler(backend).compile(source)
+    assert comments(backend, source) == []
+    assert result.description is None
+    assert "description=" not in result.xml
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_quote_inside_string_before_comment(backend):
+    source = "class Main : Object {\n  run [| a := 'x \"y\" z'. \"real\" ]\n}\n"
+    assert comments(backend, source) == [('"real"', 2, 26)]
+    assert get_compiler(backend).compile(source).description == "real"
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_multiline_comment(backend):
+    source = '"first\nsecond\nthird"\nclass Main : Object {\n  run [| ]\n}\n'
+    assert comments(backend, source) == [('"first\nsecond\nthird"', 1, 1)]
+    result = get_compiler(backend).compile(source)
+    assert result.description == "first\nsecond\nthird"
+    assert 'description="first' in result.xml
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_first_comment_is_description(backend):
+    source = ('class Main : Object {\n  "one" run [|\n    "two"\n    a := 1.\n  ]\n}\n'
+              '"three"\n')
+    assert comments(backend, source) == [('"one"', 2, 3), ('"two"', 3, 5), ('"three"', 7, 1)]
+    result = get_compiler(backend).compile(source)
+    assert result.description == "one"
+    assert 'description="one"' in result.xml
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_first_comment(backend):
+    source = '"" class Main : Object { "later" run [| ] }'
+    assert [c[0] for c in comments(backend, source)] == ['""', '"later"']
+    assert get_compiler(backend).compile(source).description is None
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_concurrent_capture(backend):
+    '''Sdileny parser, kazde vlakno musi dostat komentare sveho zdrojoveho kodu'''
+    compiler = get_compiler(backend)
+
+    def compile_nth(i):
+        source = (f'"program {i}"\nclass Main : Object {{\n'
+                  f'  run [| a := {i}. "inner {i}" b := \'"q{i}"\'. ]\n}}\n')
+        _, tokens = compiler.parse_with_comments(source)
+        return i, compiler.compile(source).description, [t.value for t in tokens]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(compile_nth, range(400)))
+    for i, description, values in results:
+        assert description == f"program {i}"
+        assert values == [f'"program {i}"', f'"inner {i}"']
+
+# Konec souboru test_comments.py (EOF)
@@ -0,0 +1,64 @@
+"""
+    @file: test_conformance.py
+    @brief: Shoda backendu parseru (zmensena verze bench/conformance.py)
+    @details: Generovane programy, hranicni pripady, vnoreni a nahodne mutace
+              musi dat u vsech backendu stejne XML nebo stejny kod chyby.
+              Plna sada (vcetne vnoreni 10^5): python3 -m bench.conformance
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import random
+import sys
+
+import pytest
+
+from bench.conformance import check, edge_programs, generated_programs, mutate
+from src.backends import BACKENDS
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.parsy_parser import RECURSION_LIMIT
+
+DEEP_CASES = (
+    "a := " + "(" * 3000 + "1" + ")" * 3000 + ".",
+    "a := " + "1 plus: (" * 500 + "1" + ")" * 500 + ".",
+    "a := " + "[| b := " * 500 + "1" + ". ]" * 500 + ".",
+)
+
+
+@pytest.fixture(scope="module")
+def compilers():
+    return {name: get_compiler(name) for name in BACKENDS}
+
+@pytest.fixture
+def parsy_recursion_limit():
+    '''Limit rekurze pro vlakno parsy (jako parse.py --parser parsy), pak puvodni'''
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(RECURSION_LIMIT)
+    yield
+    sys.setrecursionlimit(limit)
+
+
+@pytest.mark.parametrize("source", list(generated_programs()) + list(edge_programs()))
+def test_base_programs(compilers, source):
+    assert check(compilers, source) is None
+
+def test_mutations(compilers):
+    base = list(generated_programs()) + list(edge_programs())
+    rnd = random.Random(0)
+    for _ in range(300):
+        source = mutate(rnd, rnd.choice(base), rnd.randint(1, 3))
+        assert check(compilers, source) is None, source
+
+@pytest.mark.parametrize("body", DEEP_CASES)
+def test_deep_nesting(compilers, body, parsy_recursion_limit):
+    source = next(edge_programs((body,)))
+    assert check(compilers, source, indent=None) is None
+
+def test_parsy_reports_too_deep_with_default_limit(compilers):
+    '''Bez zvyseneho limitu rekurze skonci parsy chybou 99, ne padem procesu'''
+    source = next(edge_programs(DEEP_CASES[:1]))
+    with pytest.raises(Sol25Error) as info:
+        compilers["parsy"].compile(source)
+    assert info.value.code == 99
+
+# Konec souboru test_conformance.py (EOF)
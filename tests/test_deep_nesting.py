@@ -0,0 +1,70 @@
+"""
+    @file: test_deep_nesting.py
+    @brief: Hluboke vnoreni (10^5) - parse, kontrola a kompaktni XML bez rekurze
+    @details: Bezi s nizkym limitem rekurze, takze navrat k rekurzivnimu
+              pruchodu (parser, SemChecker, XmlWriter, Node.__eq__) test shodi
+              s RecursionError. Backend parsy je rekurzivni, hluboke vnoreni
+              pro nej overuje tests/test_conformance.py a bench.conformance.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import sys
+
+import pytest
+
+from bench.bench_deep_nesting import nested_args, nested_blocks, nested_receivers
+from src.compiler import get_compiler
+
+DEPTH = 100000
+RECURSION_LIMIT = 300 # rezerva pro pytest a Lark, zadna uroven vnoreni nesmi stat ramec
+
+def nested_parens(depth):
+    '''x := (((1)))'''
+    return "x := " + "(" * depth + "1" + ")" * depth + "."
+
+# generator tela, pocet <send>, <block> a <literal> ve vystupu
+CASES = {
+    "parens": (nested_parens, 0, 1, 1),
+    "args": (nested_args, DEPTH, 1, DEPTH + 1),
+    "receivers": (nested_receivers, DEPTH, 1, DEPTH + 1),
+    "blocks": (nested_blocks, 0, DEPTH + 1, 1),
+}
+
+
+@pytest.fixture
+def low_recursion_limit():
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(RECURSION_LIMIT)
+    yield
+    sys.setrecursionlimit(limit)
+
+@pytest.fixture(scope="module")
+def asts():
+    '''AST vsech pripadu pro lark i rd (parsuje se jednou)'''
+    return {}
+
+
+@pytest.mark.parametrize("backend", ["lark", "rd"])
+@pytest.mark.parametrize("case", CASES)
+def test_deep_nesting(backend, case, asts, low_recursion_limit):
+    make, sends, blocks, literals = CASES[case]
+    compiler = get_compiler(backend)
+    source = "class Main : Object { run [| " + make(DEPTH) + " ] }"
+
+    ast = compiler.parse(source)
+    compiler.check(ast)
+    out = io.StringIO()
+    compiler.write_xml(ast, out, indent=None)
+    xml = out.getvalue()
+
+    assert xml.count("<send ") == sends
+    assert xml.count("<block ") == blocks
+    assert xml.count("<literal ") == literals
+    assert xml.endswith("</program>")
+
+    asts.setdefault(case, []).append(ast)
+    if len(asts[case]) == 2:
+        assert asts[case][0] == asts[case][1] # Node.__eq__ bez rekurze
+
+# Konec souboru test_deep_nesting.py (EOF)
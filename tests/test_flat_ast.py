@@ -0,0 +1,125 @@
+"""
+    @file: test_flat_ast.py
+    @brief: Testy plocheho AST v polich (src/flat_ast.py, parse.py --flat-ast)
+    @details: Ploche AST se rovna objektovemu AST, kontrola hlasi stejne chyby
+              a XML je shodne. Retezce jsou v tabulce jen jednou, zaznamy jsou
+              v post-orderu s korenem na konci.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from bench.generator import generate_program
+from src.compiler import Sol25Compiler, get_compiler
+from src.errors import Sol25Error
+from src.flat_ast import (
+    PROGRAM, CLASS, METHOD, BLOCK, PARAM, ASSIGN, SEND, LITERAL, VAR,
+    FlatAst, FlatProgram, get_flat_parser,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCES = [
+    "class Main : Object {\n  run [| ]\n}\n",
+    '"popis" class Main : Object { run [| a := nil. b := true. c := false. d := Integer. e := \'x\'. ] }',
+    "class Main : Object {\n  run [|\n    g := [:x :y | z := x plus: y. ] value: 1 value: -2.\n"
+    "    h := (self foo: 'a' bar: 3) baz.\n  ]\n  foo: [:a | ]\n  foo:bar: [:a :b | ]\n  baz [| ]\n}\n",
+    generate_program(classes=5, methods=3, statements=6, nesting=4, seed=1),
+    generate_program(classes=3, methods=2, statements=4, keyword_parts=4, comments=2, seed=2),
+]
+
+BAD_SOURCES = [
+    "class Main : Object { run [| a := b. ] }",
+    "class A : Object { run [| ] }",
+    "class Main : Object { run [| a := 1 @ 2. ] }",
+    "class Main : Object { run [| a := . ] }",
+]
+
+
+def flat_compiler():
+    return Sol25Compiler(get_flat_parser())
+
+def error_of(compiler, source):
+    try:
+        compiler.compile(source)
+    except Sol25Error as e:
+        return e.code, str(e)
+    return None
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_same_ast(source):
+    flat = flat_compiler().parse(source)
+    assert isinstance(flat, FlatProgram)
+    assert flat == get_compiler().parse(source)
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_same_xml(source):
+    assert flat_compiler().compile(source).xml == get_compiler().compile(source).xml
+
+@pytest.mark.parametrize("source", BAD_SOURCES)
+def test_same_errors(source):
+    expected = error_of(get_compiler(), source)
+    assert expected is not None
+    assert error_of(flat_compiler(), source) == expected
+
+def test_records_in_post_order():
+    flat = flat_compiler().parse(SOURCES[2]).flat
+    kinds = list(flat.kinds)
+    assert kinds[-1] == PROGRAM and kinds.count(PROGRAM) == 1
+    for index in range(len(flat)):
+        for child in flat.children(index):
+            assert child < index
+    assert kinds.count(CLASS) == 1 and kinds.count(METHOD) == 4
+    assert kinds.count(PARAM) == 5 # x y, a, a b
+    assert {ASSIGN, SEND, LITERAL, VAR, BLOCK} <= set(kinds)
+
+def test_strings_are_interned():
+    flat = flat_compiler().parse(generate_program(classes=20, methods=4, statements=8, seed=3)).flat
+    assert len(flat.strings) == len(set(flat.strings))
+    assert len(flat.strings) < len(flat) // 4
+    assert flat.nbytes() == 17 * len(flat)
+
+def test_flat_ast_add_and_views():
+    ast = FlatAst()
+    var = ast.add(VAR, ast.intern("x"))
+    nil = ast.add(LITERAL, ast.intern("Nil"), -1)
+    send = ast.add(SEND, ast.intern("foo:"), children=[var, nil])
+    assert ast.children(send) == [var, nil]
+    view = ast.view(send)
+    assert view.selector == "foo:"
+    assert view.receiver.var == "x"
+    assert (view.arguments[0].type, view.arguments[0].value) == ("Nil", None)
+    assert ast.intern("x") == 0 and len(ast.strings) == 3
+
+def test_parallel_threads():
+    '''Stav stavby je pro kazde vlakno zvlast'''
+    compiler = flat_compiler()
+    expected = [get_compiler().parse(source) for source in SOURCES]
+    results = {}
+
+    def work(n):
+        results[n] = [compiler.parse(source) for source in SOURCES]
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == expected for result in results.values())
+
+def run_parse(*args, source=SOURCES[3]):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "parse.py"), *args], input=source,
+                          capture_output=True, text=True, cwd=ROOT)
+
+def test_cli():
+    flat = run_parse("--flat-ast")
+    assert flat.returncode == 0
+    assert flat.stdout == run_parse().stdout
+
+# Konec souboru test_flat_ast.py (EOF)
@@ -0,0 +1,53 @@
+"""
+    @file: test_lexer.py
+    @brief: Testy lexeru (src/lexer.py) - navratove kody hranicnich pripadu pro vsechny backendy
+    @details: Kody ":=" odpovidaji puvodnimu kontextovemu lexeru Larku. Klicova
+              slova jsou jen cela jmena, takze `nilx` je ID (puvodne NIL + ID,
+              tedy napr. `[:nilx | ]` bylo 22, nyni je to platny parametr).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import pytest
+
+from src.backends import BACKENDS
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+
+
+def exit_code(backend, body):
+    source = f"class Main : Object {{\n  run [|\n    {body}\n  ]\n}}\n"
+    try:
+        get_compiler(backend).compile(source)
+    except Sol25Error as e:
+        return e.code
+    return 0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("body, code", [
+    # ":=" tam, kde parser ceka jen COLON => ":" a nepasujici "="
+    ("a := x foo:= 1.", 21),
+    ("a := x foo: 1 bar:= 2.", 21),
+    ("a := x foo:=1 bar.", 21),
+    # ":=" tam, kde parser neceka ani COLON => neocekavany ASSIGN
+    ("a := x foo: y:= 1.", 22),
+    ("a := [:= ].", 22),
+    ("a := [:x :=1 | ].", 22),
+    ("a:=1.", 0),
+])
+def test_assign_after_selector(backend, body, code):
+    assert exit_code(backend, body) == code
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("body, code", [
+    ("a := [:nilx | ].", 0),
+    ("a := [:selfX :classx | ].", 0),
+    ("a := [:nil | ].", 22), # ":nil" je COLON a NIL
+    ("nilx := 1. a := nilx.", 0),
+    ("a := classify.", 32), # nedefinovana promenna, ne syntakticka chyba
+    ("a := 1nilbar.", 0), # INT a unarni zprava "nilbar"
+])
+def test_keyword_prefix_is_identifier(backend, body, code):
+    assert exit_code(backend, body) == code
+
+# Konec souboru test_lexer.py (EOF)
@@ -0,0 +1,107 @@
+"""
+    @file: test_optimizer.py
+    @brief: Testy skladani konstant (src/optimizer.py, parse.py --fold)
+    @details: Pro kazde pravidlo jeden slozeny pripad a pripady, kdy se skladat
+              nesmi (deleni nulou a zapornym cislem, preteceni 64 bitu,
+              vlastni tridy Integer a Block, promenna bloku prirazena vickrat).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import pytest
+
+from src.ast_nodes import LiteralNode, SendNode
+from src.compiler import get_compiler
+from src.optimizer import INT_MAX, INT_MIN, fold_constants
+
+
+def fold(body, extra=""):
+    '''Slozeni metody run, vraci (vyraz prvniho prirazeni, FoldReport)'''
+    source = f"class Main : Object {{\n  run [|\n    {body}\n  ]\n}}\n{extra}"
+    ast, _ = get_compiler().analyze(source)
+    optimized, report = fold_constants(ast)
+    return optimized.classes[0].methods[0].block.statements[0].expr, report
+
+def integer(value):
+    return LiteralNode("Integer", str(value))
+
+
+@pytest.mark.parametrize("body, expected", [
+    ("a := 2 plus: 3.", integer(5)),
+    ("a := 2 minus: 5.", integer(-3)),
+    ("a := -4 multiplyBy: 6.", integer(-24)),
+    ("a := 7 divBy: 2.", integer(3)),
+    ("a := 0 divBy: 5.", integer(0)),
+    ("a := 3 equalTo: 3.", LiteralNode("True", True)),
+    ("a := 3 greaterThan: 4.", LiteralNode("False", False)),
+    ("a := -12 asString.", LiteralNode("String", "-12")),
+    ("a := Integer from: 42.", integer(42)),
+    ("a := [ | ] value.", LiteralNode("Nil", None)),
+    ("a := [ | t := 'x'. ] value.", LiteralNode("String", "x")),
+    ("a := ((1 plus: 2) multiplyBy: (10 minus: 4)) asString.", LiteralNode("String", "18")),
+])
+def test_fold_rule(body, expected):
+    expr, report = fold(body)
+    assert expr == expected
+    assert report.folded >= 1
+
+def test_fold_report_counts_removed_nodes():
+    _, report = fold("a := (1 plus: 2) plus: 3.")
+    assert report.folded == 2
+    assert report.removed == 4 # dve zpravy a ctyri literaly => jeden literal
+
+@pytest.mark.parametrize("body", [
+    "a := 7 divBy: 0.",
+    "a := -7 divBy: 2.", # oriznuti k nule vs. zaokrouhleni dolu
+    "a := 7 divBy: -2.",
+    f"a := {INT_MAX} plus: 1.",
+    f"a := {INT_MIN} minus: 1.",
+    f"a := {2 ** 32} multiplyBy: {2 ** 32}.",
+    "a := 1 plus: 'x'.",
+    "a := 1 plus: self.",
+    "a := Integer from: 'x'.",
+    "a := [ :x | ] value: 1.",
+    "a := [ | t := 1. u := 2. ] value.",
+    "a := [ | t := Integer. ] value.",
+])
+def test_no_fold(body):
+    expr, report = fold(body)
+    assert expr.kind is SendNode
+    assert report.folded == 0
+
+def test_no_fold_user_integer():
+    extra = "class Integer : Object { foo [| ] }\n"
+    for body in ("a := 1 plus: 2.", "a := 1 asString.", "a := Integer from: 3."):
+        expr, report = fold(body, extra)
+        assert expr.kind is SendNode
+        assert report.folded == 0
+
+def test_no_fold_user_block():
+    expr, report = fold("a := [ | ] value.", "class Block : Object { foo [| ] }\n")
+    assert expr.kind is SendNode
+    assert report.folded == 0
+
+@pytest.mark.parametrize("body", [
+    "a := [ | t := 1. ] value. t := 2.",
+    "a := [ | t := 1. ] value. b := [ | t := 2. ] value.",
+    "a := [ | t := 1. ] value. b := [ :t | ].",
+])
+def test_no_fold_block_variable_assigned_twice(body):
+    expr, report = fold(body)
+    assert expr.kind is SendNode
+    assert report.folded == 0
+
+def test_no_fold_method_parameter():
+    source = "class Main : Object {\n  run [| ]\n  with: [:t | a := [ | t := 1. ] value. ]\n}\n"
+    ast, _ = get_compiler().analyze(source)
+    optimized, report = fold_constants(ast)
+    assert optimized.classes[0].methods[1].block.statements[0].expr.kind is SendNode
+    assert report.folded == 0
+
+def test_input_ast_unchanged():
+    source = "class Main : Object {\n  run [| a := 1 plus: 2. ]\n}\n"
+    ast, _ = get_compiler().analyze(source)
+    before = get_compiler().to_xml(ast)
+    fold_constants(ast)
+    assert get_compiler().to_xml(ast) == before
+
+# Konec souboru test_optimizer.py (EOF)
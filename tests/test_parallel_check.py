@@ -0,0 +1,58 @@
+"""
+    @file: test_parallel_check.py
+    @brief: Testy paralelni semanticke kontroly (SemChecker(jobs=N), src/parallel_check.py)
+    @details: Paralelni a seriova kontrola hlasi stejnou prvni chybu i stejny
+              seznam chyb (collect); bez metody fork se kontroluje v jednom procesu.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import pytest
+
+import src.parallel_check
+from bench.bench_parallel_check import with_errors
+from bench.generator import generate_program
+from src.compiler import get_compiler
+from src.errors import Sol25Error
+from src.sem_checker import SemChecker
+
+
+def diagnostics(ast, jobs, collect):
+    try:
+        errors = SemChecker(ast, collect=collect, jobs=jobs).check()
+    except Sol25Error as e:
+        errors = [e]
+    return [(e.code, e.location(), str(e)) for e in errors]
+
+@pytest.fixture(scope="module")
+def bad_ast():
+    '''Program s nedefinovanou promennou v kazde ctvrte tride'''
+    return get_compiler().parse(with_errors(generate_program(classes=40, methods=3, statements=5)))
+
+
+@pytest.mark.parametrize("collect", [False, True])
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_parallel_matches_serial(bad_ast, jobs, collect):
+    expected = diagnostics(bad_ast, None, collect)
+    assert expected
+    assert diagnostics(bad_ast, jobs, collect) == expected
+
+def test_first_error_is_first_in_class_order(bad_ast):
+    (code, location, message), = diagnostics(bad_ast, 4, False)
+    assert code == 32
+    assert location.startswith("C3>>")
+    assert "undefinedVariable" in message
+
+def test_deep_ast_is_not_pickled():
+    '''Hluboke AST se do procesu nepredava serializaci (fork)'''
+    depth = 20000
+    body = "x := " + "[| y := " * depth + "1" + ". ]" * depth + "."
+    source = generate_program(classes=8, methods=2, statements=2).replace(
+        "run [|", "run [| " + body, 1)
+    ast = get_compiler().parse(source)
+    assert diagnostics(ast, 2, True) == diagnostics(ast, None, True)
+
+def test_serial_fallback_without_fork(bad_ast, monkeypatch):
+    monkeypatch.setattr(src.parallel_check, "_fork_context", lambda: None)
+    assert diagnostics(bad_ast, 4, True) == diagnostics(bad_ast, None, True)
+
+# Konec souboru test_parallel_check.py (EOF)
@@ -0,0 +1,67 @@
+"""
+    @file: test_profiler.py
+    @brief: Testy profilovani prekladu (src/profiler.py, parse.py --profile)
+    @details: Profil se zapise i pri chybe prekladu. Kdyz zapis profilu selze,
+              vysledek prekladu (XML a navratovy kod) zustava beze zmeny.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.profiler import profile_compile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE = "class Main : Object {\n  run [| a := 1 plus: 2. ]\n}\n"
+BAD_SOURCE = "class Main : Object {\n  run [| a := b. ]\n}\n"
+
+
+def run_parse(*args, source=SOURCE):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "parse.py"), *args], input=source,
+                          capture_output=True, text=True, cwd=ROOT)
+
+@pytest.mark.parametrize("only", [None, "parse"])
+def test_writes_profile(tmp_path, only):
+    path = str(tmp_path / "out.prof")
+    out = io.StringIO()
+    assert profile_compile(SOURCE, out, path, only) == (0, "", None)
+    assert "<program" in out.getvalue()
+    assert os.path.getsize(path)
+    assert os.path.exists(path + ".collapsed")
+
+def test_profile_written_on_compile_error(tmp_path):
+    path = str(tmp_path / "out.prof")
+    code, message, dump_error = profile_compile(BAD_SOURCE, io.StringIO(), path)
+    assert code == 32 and message
+    assert dump_error is None
+    assert os.path.getsize(path)
+
+def test_unwritable_profile_keeps_compile_result(tmp_path):
+    path = str(tmp_path / "missing" / "out.prof")
+    out = io.StringIO()
+    code, message, dump_error = profile_compile(SOURCE, out, path)
+    assert (code, message) == (0, "")
+    assert isinstance(dump_error, OSError)
+    assert "<program" in out.getvalue()
+
+    code, _, dump_error = profile_compile(BAD_SOURCE, io.StringIO(), path)
+    assert code == 32
+    assert isinstance(dump_error, OSError)
+
+def test_cli_unwritable_profile_exits_zero(tmp_path):
+    result = run_parse("--profile", str(tmp_path / "missing" / "out.prof"))
+    assert result.returncode == 0
+    assert result.stdout == run_parse().stdout
+    assert "Cannot write profile" in result.stderr
+
+def test_cli_unwritable_profile_keeps_error_code(tmp_path):
+    result = run_parse("--profile", str(tmp_path / "missing" / "out.prof"), source=BAD_SOURCE)
+    assert result.returncode == 32
+    assert "Cannot write profile" in result.stderr
+
+# Konec souboru test_profiler.py (EOF)
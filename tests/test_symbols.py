@@ -0,0 +1,63 @@
+"""
+    @file: test_symbols.py
+    @brief: Testy tabulky symbolu (src/symbols.py) - internovani jmen v AST
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import pytest
+from lark import Lark
+
+from src.backends import BACKENDS
+from src.compiler import get_compiler
+from src.grammar import sol25_grammar
+from src.parse_to_ast import Sol25Transformer
+from src.symbols import SymbolTable, current_symbols, symbol_scope
+
+SOURCE = ("class Main : Object {\n  run [| counter := 1. counter := counter plus: 1. ]\n"
+          "  with: [:x | y := x with: 1 and: 2. z := x with: 3 and: 4. ]\n}\n")
+
+
+def names(ast):
+    '''(prvni counter, druhy counter, oba selektory with:and:)'''
+    run, with_ = ast.classes[0].methods
+    first, second = run.block.statements
+    sends = [st.expr.selector for st in with_.block.statements]
+    return first.var, second.var, sends[0], sends[1]
+
+def assert_interned(ast):
+    first, second, sel1, sel2 = names(ast)
+    assert first == second == "counter" and first is second
+    assert sel1 == sel2 == "with:and:" and sel1 is sel2
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_names_interned_within_ast(backend):
+    assert_interned(get_compiler(backend).parse(SOURCE))
+    assert current_symbols() is None # tabulka patri jen parsovani
+
+def test_separate_transform_interns():
+    '''Transform mimo parsovani (bez symbol_scope) pouzije tabulku transformeru'''
+    tree = Lark(sol25_grammar, start="start", parser="lalr").parse(SOURCE)
+    transformer = Sol25Transformer()
+    assert_interned(transformer.transform(tree))
+    assert transformer._symbols is transformer._symbols
+
+def test_scope_is_reused_when_nested():
+    with symbol_scope() as outer:
+        with symbol_scope() as inner:
+            assert inner is outer is current_symbols()
+        table = SymbolTable()
+        with symbol_scope(table):
+            assert current_symbols() is table
+        assert current_symbols() is outer
+    assert current_symbols() is None
+
+def test_join_and_keyword():
+    table = SymbolTable()
+    parts = (table.keyword("with"), table.keyword("and"))
+    assert table.join(parts) == "with:and:"
+    assert table.join(parts) is table.join((table.keyword("with"), table.keyword("and")))
+    assert table.join((parts[0],)) is parts[0]
+    assert len(table) == 3
+
+# Konec souboru test_symbols.py (EOF)
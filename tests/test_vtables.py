@@ -0,0 +1,92 @@
+"""
+    @file: test_vtables.py
+    @brief: Testy tabulek metod (parse.py --vtables, SemChecker.dispatch_tables)
+    @details: Kazda zprava literalu tridy, ktera projde kontrolou, ma atribut
+              target; strana "class" je presne mnozina selektoru kontroly.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from bench.generator import generate_program
+from src.compiler import get_compiler
+from src.errors import UndefinedError
+from src.sem_checker import SemChecker
+
+SOURCE = """class Main : Object {
+  run [|
+    a := Main new.
+    b := Foo baz.
+    c := Bar baz.
+    d := Bar qux: 1.
+    e := String read.
+    f := Bar read.
+  ]
+}
+class Foo : Object { baz [| ] }
+class Bar : Foo { qux: [:x | ] }
+class Baz : String { }
+"""
+
+
+def vtables_xml(source):
+    out = io.StringIO()
+    get_compiler().compile_to(source, out, vtables=True)
+    return ET.fromstring(out.getvalue())
+
+def class_sends(root):
+    '''(prijemce, selektor, target) pro zpravy literalu tridy'''
+    result = []
+    for send in root.iter("send"):
+        receiver = send.find("expr/literal")
+        if receiver is not None and receiver.get("class") == "class":
+            result.append((receiver.get("value"), send.get("selector"), send.get("target")))
+    return result
+
+
+def test_class_send_of_user_method_has_target():
+    sends = class_sends(vtables_xml(SOURCE.replace("    f := Bar read.\n", "")))
+    assert sends == [
+        ("Main", "new", "Object"),
+        ("Foo", "baz", "Foo"),
+        ("Bar", "baz", "Foo"),
+        ("Bar", "qux:", "Bar"),
+        ("String", "read", "String"),
+    ]
+
+def test_class_send_rejected_by_check_is_not_in_vtable():
+    with pytest.raises(UndefinedError):
+        get_compiler().compile(SOURCE)
+
+def test_class_side_matches_checked_selectors():
+    source = SOURCE.replace("    f := Bar read.\n", "")
+    ast = get_compiler().parse(source)
+    checker = SemChecker(ast)
+    checker.check()
+    tables = checker.dispatch_tables()
+    for name, table in tables["class"].items():
+        assert table.keys() == checker.method_table(name).keys()
+    assert tables["class"]["Baz"]["read"] == "String"
+    assert tables["instance"]["Bar"]["baz"] == "Foo"
+    assert tables["instance"]["Integer"]["plus:"] == "Integer"
+    assert "new" not in tables["instance"]["Bar"]
+
+def test_generated_class_sends_all_have_target():
+    source = generate_program(classes=6, methods=3, statements=4, chain=True, class_sends=3, seed=4)
+    sends = class_sends(vtables_xml(source))
+    assert sends
+    assert all(target for _, _, target in sends)
+
+def test_vtable_sides():
+    root = vtables_xml(SOURCE.replace("    f := Bar read.\n", ""))
+    sides = [(t.get("class"), t.get("side")) for t in root.find("vtables")]
+    assert sides[:4] == [("Main", "class"), ("Main", "instance"), ("Foo", "class"), ("Foo", "instance")]
+    entries = {(t.get("class"), t.get("side")): {e.get("selector"): e.get("class") for e in t}
+               for t in root.find("vtables")}
+    assert entries[("Bar", "class")] == {"baz": "Foo", "from:": "Object", "new": "Object", "qux:": "Bar"}
+    assert entries[("True", "instance")]["ifTrue:ifFalse:"] == "True"
+
+# Konec souboru test_vtables.py (EOF)
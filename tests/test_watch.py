@@ -0,0 +1,96 @@
+"""
+    @file: test_watch.py
+    @brief: Testy rezimu sledovani adresare (src/watch.py, parse.py --watch)
+    @details: Watcher.poll prelozi nove a zmenene soubory *.sol, XML zapise vedle
+              zdroje, pri chybe stare XML smaze a soubor beze zmeny obsahu
+              nepreklada znovu.
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import os
+
+from src.compiler import get_compiler
+from src.watch import Watcher, watch, xml_path
+
+SOURCE = "class Main : Object {\n  run [| a := 1 plus: 2. ]\n}\n"
+BAD_SOURCE = "class Main : Object {\n  run [| a := b. ]\n}\n"
+
+
+def make_watcher(directory):
+    out = io.StringIO()
+    err = io.StringIO()
+    return Watcher(str(directory), out=out, err=err), out, err
+
+def write(path, text, mtime_ns):
+    '''Zapis s explicitnim casem zmeny (rozliseni casu souboroveho systemu)'''
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def codes(out):
+    return [line.split("\t")[:2] for line in out.getvalue().splitlines()]
+
+
+def test_compiles_new_files(tmp_path):
+    write(tmp_path / "a.sol", SOURCE, 10 ** 9)
+    write(tmp_path / "b.sol", BAD_SOURCE, 10 ** 9)
+    (tmp_path / "notes.txt").write_text("x")
+    watcher, out, err = make_watcher(tmp_path)
+    assert watcher.poll() == 2
+    assert codes(out) == [["0", str(tmp_path / "a.sol")], ["32", str(tmp_path / "b.sol")]]
+    assert (tmp_path / "a.xml").read_text(encoding="utf-8") == get_compiler().compile(SOURCE).xml
+    assert not (tmp_path / "b.xml").exists()
+    assert "b.sol" in err.getvalue()
+
+def test_unchanged_files_are_skipped(tmp_path):
+    path = tmp_path / "a.sol"
+    write(path, SOURCE, 10 ** 9)
+    watcher, out, _ = make_watcher(tmp_path)
+    assert watcher.poll() == 1
+    assert watcher.poll() == 0
+    write(path, SOURCE, 2 * 10 ** 9) # touch => stejny obsah
+    assert watcher.poll() == 0
+    assert len(codes(out)) == 1
+
+def test_changed_file_is_recompiled(tmp_path):
+    path = tmp_path / "a.sol"
+    write(path, SOURCE, 10 ** 9)
+    watcher, out, _ = make_watcher(tmp_path)
+    watcher.poll()
+    write(path, BAD_SOURCE, 2 * 10 ** 9)
+    assert watcher.poll() == 1
+    assert not os.path.exists(xml_path(str(path))) # chyba => stare XML smazano
+    write(path, SOURCE, 3 * 10 ** 9)
+    assert watcher.poll() == 1
+    assert [code for code, _ in codes(out)] == ["0", "32", "0"]
+    assert (tmp_path / "a.xml").exists()
+
+def test_removed_and_recreated_file(tmp_path):
+    path = tmp_path / "a.sol"
+    write(path, SOURCE, 10 ** 9)
+    watcher, _, _ = make_watcher(tmp_path)
+    watcher.poll()
+    path.unlink()
+    assert watcher.poll() == 0
+    write(path, SOURCE, 10 ** 9)
+    assert watcher.poll() == 1 # smazany soubor se zapomene
+
+def test_indent(tmp_path):
+    write(tmp_path / "a.sol", SOURCE, 10 ** 9)
+    watcher = Watcher(str(tmp_path), indent=None, out=io.StringIO(), err=io.StringIO())
+    watcher.poll()
+    assert (tmp_path / "a.xml").read_text(encoding="utf-8") == get_compiler().compile(SOURCE, None).xml
+
+def test_unwritable_output_reports_12(tmp_path):
+    write(tmp_path / "a.sol", SOURCE, 10 ** 9)
+    (tmp_path / "a.xml").mkdir() # XML nelze zapsat
+    watcher, out, err = make_watcher(tmp_path)
+    watcher.poll()
+    assert codes(out) == [["12", str(tmp_path / "a.sol")]]
+    assert err.getvalue()
+
+def test_watch_missing_directory(tmp_path, capsys):
+    assert watch(str(tmp_path / "missing")) == 11
+    assert "not a directory" in capsys.readouterr().err
+
+# Konec souboru test_watch.py (EOF)
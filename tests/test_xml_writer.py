@@ -0,0 +1,114 @@
+"""
+    @file: test_xml_writer.py
+    @brief: Testy proudoveho zapisu XML (src/xml_writer.py)
+    @details: Vystup write_xml musi byt shodny s ast_to_xml + ET.indent + ET.tostring
+              (s indent=None s ast_to_xml + ET.tostring bez odsazeni).
+    @author: Jakub Fukala (xfukal01)
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from bench.generator import generate_program
+from src.ast_nodes import (
+    ProgramNode,
+    ClassNode,
+    MethodNode,
+    BlockNode,
+    AssignNode,
+    SendNode,
+    LiteralNode,
+    VarNode,
+)
+from src.ast_to_xml import ast_to_xml
+from src.compiler import get_compiler
+from src.xml_writer import XML_HEADER, write_xml
+
+
+def etree_xml(ast, desc=None, indent="    "):
+    root = ast_to_xml(ast, desc)
+    if indent is not None:
+        ET.indent(root, space=indent)
+    return XML_HEADER + ET.tostring(root, encoding="unicode")
+
+def stream_xml(ast, desc=None, indent="    "):
+    out = io.StringIO()
+    write_xml(ast, out, desc, indent)
+    return out.getvalue()
+
+def method(selector, params=(), statements=()):
+    return MethodNode(selector, BlockNode(list(params), list(statements)))
+
+def program(*statements):
+    return ProgramNode([ClassNode("Main", "Object", [method("run", (), statements)])])
+
+SPECIAL = "a & b < c > d \" e ' f \n g \t h \r i"
+
+ASTS = {
+    "empty program": ProgramNode([]),
+    "empty class": ProgramNode([ClassNode("Main", "Object", [])]),
+    "empty method": program(),
+    "block params only": ProgramNode([ClassNode("Main", "Object", [method("a:b:", ("x", "y"))])]),
+    "nested blocks": program(
+        AssignNode("a", BlockNode([], [])),
+        AssignNode("b", BlockNode(["x"], [AssignNode("c", BlockNode(["y"], [AssignNode("d", VarNode("y"))]))])),
+    ),
+    "literals": program(
+        AssignNode("a", LiteralNode("Integer", "-42")),
+        AssignNode("b", LiteralNode("Nil", None)),
+        AssignNode("c", LiteralNode("True", True)),
+        AssignNode("d", LiteralNode("False", False)),
+        AssignNode("e", LiteralNode("class", "Integer")),
+        AssignNode("f", LiteralNode("String", SPECIAL)),
+    ),
+    "sends": program(
+        AssignNode("a", SendNode(LiteralNode("class", "Main"), "new", [])),
+        AssignNode("b", SendNode(VarNode("a"), "foo:bar:", [
+            LiteralNode("Integer", "1"),
+            SendNode(VarNode("self"), "baz", []),
+        ])),
+    ),
+    "escaped names": ProgramNode([
+        ClassNode("A&<>\"", "B\n\t", [method("s&<>:", ("p\"",), [AssignNode("v<>", VarNode("w&"))])]),
+    ]),
+}
+
+
+@pytest.mark.parametrize("indent", ["    ", "  ", None])
+@pytest.mark.parametrize("name", ASTS)
+def test_same_as_etree(name, indent):
+    ast = ASTS[name]
+    assert stream_xml(ast, None, indent) == etree_xml(ast, None, indent)
+
+@pytest.mark.parametrize("indent", ["    ", None])
+@pytest.mark.parametrize("desc", ["popis", SPECIAL, "radek\nradek", "a&#10;b"])
+def test_description(desc, indent):
+    ast = ASTS["empty program"]
+    assert stream_xml(ast, desc, indent) == etree_xml(ast, desc, indent)
+    ast = ASTS["sends"]
+    assert stream_xml(ast, desc, indent) == etree_xml(ast, desc, indent)
+
+def test_empty_description_is_omitted():
+    xml = stream_xml(ASTS["empty class"], "")
+    assert "description" not in xml
+    assert xml == etree_xml(ASTS["empty class"], "")
+
+def test_escaping():
+    xml = stream_xml(ASTS["literals"])
+    assert 'value="a &amp; b &lt; c &gt; d &quot; e \' f &#10; g &#09; h &#13; i"' in xml
+
+def test_compact_has_no_whitespace_between_tags():
+    xml = stream_xml(ASTS["sends"], indent=None)
+    assert xml.startswith(XML_HEADER)
+    assert "\n" not in xml[len(XML_HEADER):]
+    assert "> <" not in xml
+
+@pytest.mark.parametrize("indent", ["    ", None])
+def test_generated_program(indent):
+    source = generate_program(classes=10, methods=4, statements=8, nesting=3, keyword_parts=3, seed=3)
+    ast, desc = get_compiler().analyze(source)
+    assert stream_xml(ast, desc, indent) == etree_xml(ast, desc, indent)
+
+# Konec souboru test_xml_writer.py (EOF)